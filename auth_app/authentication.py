@@ -0,0 +1,162 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication, get_authorization_header
+
+
+class TokenCache:
+    """
+    Thread-safe LRU cache mapping token keys to their (user, token) pair.
+
+    Entries expire after `ttl` seconds and the least recently used entry is
+    evicted once `max_size` entries are stored. The cache lives in the worker
+    process and the invalidation signals only reach the process that made the
+    change: other workers keep accepting a deleted token or a deactivated
+    user for up to `ttl` seconds. The short default keeps that window small
+    while a busy client still hits the cache for almost every request.
+    """
+
+    def __init__(self, max_size=10000, ttl=30):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        """
+        Returns the cached (user, token) pair for the key, or None.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        """
+        Stores a (user, token) pair and evicts the oldest entries if needed.
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate_key(self, key):
+        """
+        Removes the entry of a single token key.
+        """
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def invalidate_user(self, user_id):
+        """
+        Removes all entries belonging to the given user.
+        """
+        with self._lock:
+            keys = [key for key, (_, (user, _)) in self._entries.items() if user.pk == user_id]
+            for key in keys:
+                del self._entries[key]
+            self.invalidations += len(keys)
+
+    def clear(self):
+        """
+        Removes all entries and resets the statistics.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def stats(self):
+        """
+        Returns the cache statistics including the hit rate.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
+
+
+_cache_settings = getattr(settings, 'TOKEN_CACHE', {})
+token_cache = TokenCache(
+    max_size=_cache_settings.get('MAX_SIZE', 10000),
+    ttl=_cache_settings.get('TTL', 30),
+)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Token authentication that resolves tokens from `token_cache` and only
+    queries the database on a miss.
+
+    Entries are invalidated by the signal handlers in `auth_app.signals`
+    when a token is deleted or created, or when its user is saved or deleted.
+    """
+
+    def authenticate_credentials(self, key):
+        cached = token_cache.get(key)
+        if cached is not None:
+            user, token = cached
+            # Hand out a copy so per-request changes never leak into the cache
+            return (copy.copy(user), token)
+
+        user, token = super().authenticate_credentials(key)
+        token_cache.set(key, (copy.copy(user), token))
+        return (user, token)
+
+    async def aauthenticate(self, request):
+        """
+        Async variant of `authenticate` for native async views.
+        Uses the async ORM API on a cache miss.
+
+        Returns None if no token was sent, otherwise a (user, token) tuple.
+        Raises AuthenticationFailed for malformed or unknown tokens.
+        """
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) != 2:
+            raise exceptions.AuthenticationFailed('Invalid token header.')
+        try:
+            key = auth[1].decode()
+        except UnicodeError:
+            raise exceptions.AuthenticationFailed('Invalid token header.')
+
+        cached = token_cache.get(key)
+        if cached is not None:
+            user, token = cached
+            return (copy.copy(user), token)
+
+        model = self.get_model()
+        try:
+            token = await model.objects.select_related('user').aget(key=key)
+        except model.DoesNotExist:
+            raise exceptions.AuthenticationFailed('Invalid token.')
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed('User inactive or deleted.')
+
+        token_cache.set(key, (copy.copy(token.user), token))
+        return (token.user, token)
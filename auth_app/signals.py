@@ -0,0 +1,32 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from auth_app.authentication import token_cache
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    """
+    Drops a deleted token from the authentication cache.
+    """
+    token_cache.invalidate_key(instance.key)
+
+
+@receiver(post_save, sender=Token)
+def invalidate_regenerated_token(sender, instance, **kwargs):
+    """
+    Drops all cached tokens of a user when a (new) token is saved for them.
+    """
+    token_cache.invalidate_user(instance.user_id)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_tokens(sender, instance, **kwargs):
+    """
+    Drops the cached tokens of a user whenever the user changes,
+    e.g. when the account is deactivated.
+    """
+    token_cache.invalidate_user(instance.pk)
@@ -1,3 +1,57 @@
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
 
-# Create your tests here.
+from auth_app.authentication import token_cache
+
+
+class CachedTokenAuthenticationTests(APITestCase):
+    """
+    Tests for the cached token authentication and its invalidation.
+    """
+
+    def setUp(self):
+        token_cache.clear()
+        self.user = User.objects.create_user(username='user@test.de', email='user@test.de', password='pw')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def request_queries(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/boards/')
+        return response.status_code, [query['sql'] for query in context.captured_queries]
+
+    def test_second_request_skips_token_lookup(self):
+        _, first = self.request_queries()
+        status_code, second = self.request_queries()
+
+        self.assertEqual(status_code, 200)
+        self.assertTrue(any('authtoken_token' in sql for sql in first))
+        self.assertFalse(any('authtoken_token' in sql for sql in second))
+        self.assertEqual(token_cache.stats()['hits'], 1)
+
+    def test_deleted_token_is_rejected(self):
+        self.request_queries()
+        self.token.delete()
+        status_code, _ = self.request_queries()
+        self.assertEqual(status_code, 401)
+
+    def test_deactivated_user_is_rejected(self):
+        self.request_queries()
+        self.user.is_active = False
+        self.user.save()
+        status_code, _ = self.request_queries()
+        self.assertEqual(status_code, 401)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = type(token_cache)(max_size=2, ttl=60)
+        cache.set('a', (self.user, None))
+        cache.set('b', (self.user, None))
+        cache.get('a')
+        cache.set('c', (self.user, None))
+
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('a'))
+        self.assertEqual(cache.stats()['evictions'], 1)
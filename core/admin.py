@@ -1,7 +1,103 @@
 from django.contrib import admin
+
+from core import changelog, counters
+from core.api.serializers import BoardPatchSerializer, TaskSerializer
+from core.events import publish_board_event
+from core.writes import write_transaction
 from .models import Board, Task
 
 
-# Register your models here.
-admin.site.register(Board)
-admin.site.register(Task)
\ No newline at end of file
+class WriteTransactionAdmin(admin.ModelAdmin):
+    """
+    Runs the writing admin views in `write_transaction`, so admin changes
+    queue on the writer lock like the API writes (see core/writes.py).
+    """
+
+    def changeform_view(self, *args, **kwargs):
+        with write_transaction():
+            return super().changeform_view(*args, **kwargs)
+
+    def delete_view(self, *args, **kwargs):
+        with write_transaction():
+            return super().delete_view(*args, **kwargs)
+
+    def delete_queryset(self, request, queryset):
+        with write_transaction():
+            for obj in queryset:
+                self.delete_model(request, obj)
+
+
+@admin.register(Board)
+class BoardAdmin(WriteTransactionAdmin):
+    """
+    Board admin that keeps the counters, the version, the change log and
+    the board events in step, like the board endpoints. The denormalized
+    columns are maintained by `core.counters` and can not be edited.
+    """
+    readonly_fields = [
+        'member_count', 'ticket_count', 'tasks_to_do_count', 'tasks_high_prio_count',
+        'version', 'changes_pruned_through',
+    ]
+
+    def save_model(self, request, obj, form, change):
+        if change:
+            # Only the editable columns, so concurrent counter updates are kept
+            obj.save(update_fields=['title', 'owner'])
+            counters.board_changed(obj.id)
+            changelog.record(obj.id, 'board', obj.id)
+        else:
+            obj.save()
+
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        board = form.instance
+        counters.members_changed(board.id)
+        changelog.record(board.id, 'members', board.id)
+        publish_board_event(board.id, 'board_updated', BoardPatchSerializer(board, context={'request': request}).data)
+
+    def delete_model(self, request, obj):
+        board_id = obj.id
+        obj.delete()
+        publish_board_event(board_id, 'board_deleted', {'id': board_id})
+
+
+@admin.register(Task)
+class TaskAdmin(WriteTransactionAdmin):
+    """
+    Task admin that updates the board counters, the change log and the
+    board events like the task endpoints, including moves between boards.
+    """
+    readonly_fields = ['completed_at']
+
+    def save_model(self, request, obj, form, change):
+        if not change:
+            obj.save()
+            counters.task_created(obj)
+            return
+
+        # The committed state, the form instance already holds the new values
+        previous = Task.objects.select_for_update().values('board_id', 'status', 'priority').get(id=obj.id)
+        obj.save()
+        if previous['board_id'] == obj.board_id:
+            counters.task_changed(obj.board_id, previous['status'], previous['priority'], obj.status, obj.priority)
+        else:
+            counters.task_deleted(previous['board_id'], previous['status'], previous['priority'])
+            counters.task_created(obj)
+            changelog.record(previous['board_id'], 'task', obj.id, 'delete')
+            publish_board_event(previous['board_id'], 'task_deleted', {'id': obj.id})
+
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        task = form.instance
+        changelog.record(task.board_id, 'task', task.id)
+        publish_board_event(task.board_id, 'task_updated' if change else 'task_created', TaskSerializer(task).data)
+
+    def delete_model(self, request, obj):
+        task_id = obj.id
+        current = Task.objects.select_for_update().filter(id=task_id).values('board_id', 'status', 'priority').first()
+        if current is None:
+            return
+        obj.delete()
+        counters.task_deleted(current['board_id'], current['status'], current['priority'])
+        changelog.record(current['board_id'], 'task', task_id, 'delete')
+        publish_board_event(current['board_id'], 'task_deleted', {'id': task_id})
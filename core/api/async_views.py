@@ -0,0 +1,239 @@
+import asyncio
+
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from django.views import View
+from rest_framework import exceptions, status
+from rest_framework.renderers import JSONRenderer
+
+from auth_app.authentication import CachedTokenAuthentication
+from core.events import broker
+from core.models import Board, Comment, Task
+
+from . import detail_cache
+from .etags import aboard_list_etag
+from .fast_serializers import aserialize_board_detail, aserialize_tasks
+from .filters import filter_tasks, is_filter_requested
+from .pagination import apaginate_if_requested
+from .permissions import ahas_board_access
+from .serializers import BoardSerializer, CommentSerializer
+from .streaming import astream_task_list, is_stream_requested
+
+_renderer = JSONRenderer()
+
+
+def json_response(data, status_code=status.HTTP_200_OK):
+    """
+    Renders data exactly like DRF's JSONRenderer does for the sync views.
+    """
+    return HttpResponse(_renderer.render(data), status=status_code, content_type='application/json')
+
+
+class AsyncTokenView(View):
+    """
+    Base class for native async read endpoints.
+
+    DRF's APIView is sync only, so authentication is done here with
+    `CachedTokenAuthentication.aauthenticate`, which uses the async ORM API.
+    Handlers implement `aget` and receive the authenticated user as `request.user`.
+    A `ValidationError` raised by a handler is answered with 400 Bad Request,
+    a `NotFound` (e.g. an invalid cursor) with 404 Not Found.
+    """
+    http_method_names = ['get', 'options']
+
+    async def get(self, request, *args, **kwargs):
+        try:
+            result = await CachedTokenAuthentication().aauthenticate(request)
+        except exceptions.AuthenticationFailed as e:
+            return json_response({'detail': str(e.detail)}, status.HTTP_401_UNAUTHORIZED)
+        if result is None:
+            return json_response(
+                {'detail': 'Authentication credentials were not provided.'},
+                status.HTTP_401_UNAUTHORIZED
+            )
+        request.user, request.auth = result
+        try:
+            return await self.aget(request, *args, **kwargs)
+        except exceptions.ValidationError as e:
+            return json_response(e.detail, status.HTTP_400_BAD_REQUEST)
+        except exceptions.NotFound as e:
+            return json_response({'error': str(e.detail)}, status.HTTP_404_NOT_FOUND)
+
+    async def aget(self, request, *args, **kwargs):
+        raise NotImplementedError
+
+
+class AsyncBoardListView(AsyncTokenView):
+    """
+    Async variant of `GET /api/boards/`, with the same keyset pagination
+    (`?limit=`, `?cursor=`) and ETag handling as the sync endpoint.
+    """
+
+    async def aget(self, request):
+        etag = await aboard_list_etag(request)
+        not_modified = get_conditional_response(request, etag=quote_etag(etag))
+        if not_modified is not None:
+            not_modified['ETag'] = quote_etag(etag)
+            return not_modified
+
+        boards = Board.objects.for_user(request.user)
+        page, paginator = await apaginate_if_requested(request, boards, self)
+        if paginator is None:
+            response = json_response(BoardSerializer([board async for board in boards], many=True).data)
+        else:
+            response = json_response(paginator.get_paginated_data(BoardSerializer(page, many=True).data))
+        response['ETag'] = quote_etag(etag)
+        return response
+
+
+class AsyncBoardDetailsView(AsyncTokenView):
+    """
+    Async variant of `GET /api/boards/<board_id>/`, sharing the versioned detail cache.
+    Supports the task filter parameters of `core/api/filters.py`.
+    """
+
+    async def aget(self, request, board_id):
+        version = await Board.objects.filter(id=board_id).values_list('version', flat=True).afirst()
+        if version is None:
+            return json_response({'detail': 'No Board matches the given query.'}, status.HTTP_404_NOT_FOUND)
+
+        if not await ahas_board_access(request, board_id):
+            return json_response({'detail': 'Access denied'}, status.HTTP_403_FORBIDDEN)
+
+        if is_filter_requested(request.GET):
+            tasks = filter_tasks(Task.objects.filter(board_id=board_id), request.GET)
+            board = await Board.objects.filter(id=board_id).afirst()
+            if board is None:
+                return json_response({'detail': 'No Board matches the given query.'}, status.HTTP_404_NOT_FOUND)
+            return json_response(await aserialize_board_detail(board, tasks))
+
+        board_data = detail_cache.lookup(board_id, version)
+        if board_data is None:
+            board = await Board.objects.filter(id=board_id).afirst()
+            if board is None:
+                return json_response({'detail': 'No Board matches the given query.'}, status.HTTP_404_NOT_FOUND)
+            board_data = await aserialize_board_detail(board)
+            detail_cache.store(board_id, version, board_data)
+        return json_response(board_data)
+
+
+class AsyncTaskListView(AsyncTokenView):
+    """
+    Base class for the async task lists of the current user. Like the sync
+    endpoints it supports the task filter parameters of `core/api/filters.py`,
+    keyset pagination (`?limit=`, `?cursor=`) and `?stream=true`.
+    """
+
+    def get_tasks(self, user):
+        raise NotImplementedError
+
+    async def aget(self, request):
+        tasks = filter_tasks(self.get_tasks(request.user), request.GET)
+        if 'ordering' in request.GET and ('limit' in request.GET or 'cursor' in request.GET):
+            return json_response(
+                {'ordering': 'Cannot be combined with `limit` or `cursor`, pages are ordered by id.'},
+                status.HTTP_400_BAD_REQUEST
+            )
+        if is_stream_requested(request):
+            return astream_task_list(tasks if tasks.ordered else tasks.order_by('id'))
+
+        page, paginator = await apaginate_if_requested(request, tasks.only('id'), self)
+        if paginator is None:
+            return json_response(await aserialize_tasks(tasks))
+        page_tasks = Task.objects.filter(id__in=[task.id for task in page]).order_by('id')
+        return json_response(paginator.get_paginated_data(await aserialize_tasks(page_tasks)))
+
+
+class AsyncMyTasksAssignedView(AsyncTaskListView):
+    """
+    Async variant of `GET /api/tasks/assigned-to-me/`.
+    """
+
+    def get_tasks(self, user):
+        return Task.objects.filter(assignees=user).distinct()
+
+
+class AsyncMyTasksReviewsView(AsyncTaskListView):
+    """
+    Async variant of `GET /api/tasks/reviewing/`.
+    """
+
+    def get_tasks(self, user):
+        return Task.objects.filter(reviewers=user).distinct()
+
+
+class AsyncCommentView(AsyncTokenView):
+    """
+    Async variant of `GET /api/tasks/<task_id>/comments/`,
+    with the same keyset pagination (`?limit=`, `?cursor=`).
+    """
+
+    async def aget(self, request, task_id):
+        board_id = await Task.objects.filter(id=task_id).values_list('board_id', flat=True).afirst()
+        if board_id is None:
+            return json_response({'detail': 'No Task matches the given query.'}, status.HTTP_404_NOT_FOUND)
+
+        if not await ahas_board_access(request, board_id):
+            return json_response({'detail': 'Access denied'}, status.HTTP_403_FORBIDDEN)
+
+        comments = Comment.objects.filter(task_id=task_id).select_related('author')
+        page, paginator = await apaginate_if_requested(request, comments, self)
+        if paginator is None:
+            comments = [comment async for comment in comments]
+            return json_response(CommentSerializer(comments, many=True).data)
+        return json_response(paginator.get_paginated_data(CommentSerializer(page, many=True).data))
+
+
+class BoardEventsView(AsyncTokenView):
+    """
+    Server-Sent Events stream of the changes of one board
+    (`GET /api/boards/<board_id>/events/`).
+
+    Every event is sent as `event: <type>` with the JSON payload as `data`.
+    A comment line is sent as heartbeat when nothing happened for a while.
+    If the client cannot keep up, a `resync` event is sent and the stream
+    ends; the client should then refetch the board and reconnect.
+    """
+    heartbeat_interval = getattr(settings, 'BOARD_EVENTS_HEARTBEAT', 15)
+
+    async def aget(self, request, board_id):
+        if not await Board.objects.filter(id=board_id).aexists():
+            return json_response({'detail': 'No Board matches the given query.'}, status.HTTP_404_NOT_FOUND)
+
+        if not await ahas_board_access(request, board_id):
+            return json_response({'detail': 'Access denied'}, status.HTTP_403_FORBIDDEN)
+
+        subscription = broker.subscribe(board_id)
+        response = StreamingHttpResponse(self.stream(subscription), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    async def stream(self, subscription):
+        """
+        Yields SSE frames for the subscription until the client disconnects,
+        the board is deleted or the subscriber overflows.
+        """
+        try:
+            yield b'retry: 3000\n\n'
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.get(), timeout=self.heartbeat_interval)
+                except asyncio.TimeoutError:
+                    yield b': keep-alive\n\n'
+                    continue
+
+                yield self.format_event(event['id'], event['type'], event['data'])
+                if subscription.overflowed:
+                    yield self.format_event(event['id'], 'resync', {'board': subscription.board_id})
+                    return
+                if event['type'] == 'board_deleted':
+                    return
+        finally:
+            broker.unsubscribe(subscription)
+
+    @staticmethod
+    def format_event(event_id, event_type, data):
+        return b'id: %d\nevent: %s\ndata: %s\n\n' % (event_id, event_type.encode(), _renderer.render(data))
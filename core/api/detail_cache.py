@@ -0,0 +1,69 @@
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+
+CACHE_ALIAS = getattr(settings, 'BOARD_DETAIL_CACHE_ALIAS', 'default')
+CACHE_TIMEOUT = getattr(settings, 'BOARD_DETAIL_CACHE_TIMEOUT', 600)
+
+_stats_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+
+def _key(board_id):
+    return f'board-detail:{board_id}'
+
+
+def _count(name):
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def lookup(board_id, version):
+    """
+    Returns the cached serialized board detail for the given version, or None.
+
+    One entry is kept per board, storing the version it was rendered for.
+    An entry for an older version counts as a miss.
+    """
+    entry = caches[CACHE_ALIAS].get(_key(board_id))
+    if entry is not None and entry[0] == version:
+        _count('hits')
+        return entry[1]
+    _count('misses')
+    return None
+
+
+def store(board_id, version, data):
+    """
+    Stores the serialized board detail rendered for the given version.
+    """
+    caches[CACHE_ALIAS].set(_key(board_id), (version, data), CACHE_TIMEOUT)
+
+
+def invalidate(board_id):
+    """
+    Removes the cached board detail, e.g. after a write to the board.
+    """
+    caches[CACHE_ALIAS].delete(_key(board_id))
+    _count('invalidations')
+
+
+def stats():
+    """
+    Returns the hit/miss counters of this worker process and the hit rate.
+    """
+    with _stats_lock:
+        data = dict(_stats)
+    lookups = data['hits'] + data['misses']
+    data['hit_rate'] = data['hits'] / lookups if lookups else 0.0
+    return data
+
+
+def reset_stats():
+    """
+    Resets the hit/miss counters.
+    """
+    with _stats_lock:
+        for name in _stats:
+            _stats[name] = 0
@@ -0,0 +1,72 @@
+import hashlib
+
+from core.models import Board
+
+from .filters import is_filter_requested
+from .permissions import has_board_access
+from .streaming import is_stream_requested
+
+
+def board_version(request, board_id):
+    """
+    Returns the current version of a board, or None if it does not exist.
+    The value is cached on the request, so the ETag check and the view
+    share a single lookup.
+    """
+    cache = getattr(request, '_board_version_cache', None)
+    if cache is None:
+        cache = request._board_version_cache = {}
+    if board_id not in cache:
+        cache[board_id] = Board.objects.filter(id=board_id).values_list('version', flat=True).first()
+    return cache[board_id]
+
+
+def board_detail_etag(request, board_id):
+    """
+    Returns the strong ETag of a board detail response, derived from the
+    board version. Only one indexed lookup of the version column is needed.
+
+    Returns None if the board does not exist or the user has no access,
+    so the view answers with its regular 404/403 response.
+    """
+    version = board_version(request, board_id)
+    if version is None or not has_board_access(request, board_id):
+        return None
+    variant = 'stream' if is_stream_requested(request) else 'full'
+    if is_filter_requested(request.GET):
+        # Filtered responses differ per query string
+        variant += '-' + hashlib.sha1(request.META.get('QUERY_STRING', '').encode()).hexdigest()[:16]
+    return f'board-{board_id}-v{version}-{variant}'
+
+
+def board_list_etag(request):
+    """
+    Returns the strong ETag of the board list of the requesting user.
+
+    The tag hashes the IDs and versions of all visible boards, so it changes
+    when a board is added, removed or modified. The query string is part of
+    the tag because pagination parameters change the response.
+    """
+    user = request.user
+    if not user or not user.is_authenticated:
+        return None
+
+    return _board_list_tag(request, _board_versions(user))
+
+
+async def aboard_list_etag(request):
+    """
+    Async variant of `board_list_etag` for the native async views.
+    """
+    return _board_list_tag(request, [row async for row in _board_versions(request.user)])
+
+
+def _board_versions(user):
+    return Board.objects.for_user(user).order_by('id').values_list('id', 'version')
+
+
+def _board_list_tag(request, rows):
+    digest = hashlib.sha1(f'{request.user.id}|{request.META.get("QUERY_STRING", "")}'.encode())
+    for board_id, version in rows:
+        digest.update(f'|{board_id}:{version}'.encode())
+    return f'boards-{digest.hexdigest()}'
@@ -0,0 +1,129 @@
+"""
+Fast read-only serialization of task collections.
+
+Builds the same dicts as the DRF task serializers from `values_list()` rows
+and assignee/reviewer maps grouped in Python, skipping DRF's per-field
+overhead. Meant for large read-only lists; writes and validation still go
+through the serializers in `serializers.py`. The output is checked to render
+to byte-identical JSON in `FastTaskSerializerParityTests`.
+"""
+from django.db.models import Count
+
+from core.models import Task
+
+from .serializers import BoardMemberSerializer
+
+_COLUMNS = ('id', 'board_id', 'title', 'description', 'status', 'priority', 'due_date', 'row_comments_count')
+
+
+def _people_rows(relation, task_ids):
+    return (
+        getattr(Task, relation).through.objects
+        .filter(task_id__in=task_ids)
+        .order_by('user_id')
+        .values_list('task_id', 'user_id', 'user__email', 'user__first_name')
+    )
+
+
+def _group_people(rows):
+    people = {}
+    for task_id, user_id, email, first_name in rows:
+        people.setdefault(task_id, []).append({'id': user_id, 'email': email, 'fullname': first_name})
+    return people
+
+
+def _people_by_task(relation, task_ids):
+    """
+    Returns {task id: [person dicts ordered by user id]} for the assignees or
+    reviewers of the given tasks, loaded with one query.
+    """
+    return _group_people(_people_rows(relation, task_ids))
+
+
+async def _apeople_by_task(relation, task_ids):
+    return _group_people([row async for row in _people_rows(relation, task_ids)])
+
+
+def _task_rows(queryset):
+    return queryset.annotate(row_comments_count=Count('comments')).values_list(*_COLUMNS)
+
+
+def serialize_tasks(queryset):
+    """
+    Serializes a queryset of tasks in three queries, whatever its size,
+    producing the output of `TaskSerializer` and `TaskAssignedToMeSerializer`.
+
+    `queryset` must be a plain task queryset (filters, distinct and ordering
+    are fine, `for_listing()` prefetches are not).
+    """
+    rows = list(_task_rows(queryset))
+    if not rows:
+        return []
+
+    task_ids = queryset.values('id')
+    return _build_tasks(rows, _people_by_task('assignees', task_ids), _people_by_task('reviewers', task_ids))
+
+
+async def aserialize_tasks(queryset):
+    """
+    Async variant of `serialize_tasks` for the native async views. The rows
+    are read with async ORM iteration and serialized in the event loop.
+    """
+    rows = [row async for row in _task_rows(queryset)]
+    if not rows:
+        return []
+
+    task_ids = queryset.values('id')
+    assignees = await _apeople_by_task('assignees', task_ids)
+    reviewers = await _apeople_by_task('reviewers', task_ids)
+    return _build_tasks(rows, assignees, reviewers)
+
+
+def _build_tasks(rows, assignees, reviewers):
+    data = []
+    for task_id, board_id, title, description, status, priority, due_date, comments_count in rows:
+        task_assignees = assignees.get(task_id)
+        task_reviewers = reviewers.get(task_id)
+        data.append({
+            'id': task_id,
+            'board': board_id,
+            'title': title,
+            'description': description,
+            'status': status,
+            'priority': priority,
+            'assignee': task_assignees[0] if task_assignees else None,
+            'reviewer': task_reviewers[0] if task_reviewers else None,
+            'due_date': due_date.isoformat() if due_date is not None else None,
+            'comments_count': comments_count,
+        })
+    return data
+
+
+def serialize_board_detail(board, tasks=None):
+    """
+    Returns the same document as `BoardDetailSerializer`, with the tasks
+    serialized by `serialize_tasks`. Members should be prefetched.
+    `tasks` replaces all tasks of the board, e.g. with a filtered queryset.
+    """
+    return {
+        'id': board.id,
+        'title': board.title,
+        'owner_id': board.owner_id,
+        'members': BoardMemberSerializer(board.members.all(), many=True).data,
+        'tasks': serialize_tasks(board.tasks.all() if tasks is None else tasks),
+    }
+
+
+async def aserialize_board_detail(board, tasks=None):
+    """
+    Async variant of `serialize_board_detail`, reading the members and
+    tasks with async ORM iteration.
+    """
+    members = [member async for member in board.members.all()]
+    return {
+        'id': board.id,
+        'title': board.title,
+        'owner_id': board.owner_id,
+        'members': BoardMemberSerializer(members, many=True).data,
+        'tasks': await aserialize_tasks(board.tasks.all() if tasks is None else tasks),
+    }
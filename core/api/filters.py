@@ -0,0 +1,93 @@
+from datetime import date
+
+from django.db.models import Case, F, IntegerField, Value, When
+from rest_framework.exceptions import ValidationError
+
+from core.models import Task
+
+TASK_FILTER_PARAMS = ('status', 'priority', 'due_after', 'due_before', 'assignee', 'reviewer', 'ordering')
+
+# Priorities from lowest to highest, for `ordering=priority`
+PRIORITY_RANK = Case(
+    *(When(priority=value, then=Value(rank)) for rank, (value, _) in enumerate(Task.PRIORITY_CHOICES)),
+    output_field=IntegerField(),
+)
+
+ORDERINGS = {
+    'due_date': (F('due_date').asc(nulls_last=True), 'id'),
+    '-due_date': (F('due_date').desc(nulls_last=True), 'id'),
+    'priority': (PRIORITY_RANK.asc(), 'id'),
+    '-priority': (PRIORITY_RANK.desc(), 'id'),
+}
+
+
+def is_filter_requested(params):
+    """
+    Returns True if any task filter or ordering parameter is given.
+    """
+    return any(name in params for name in TASK_FILTER_PARAMS)
+
+
+def _choices(params, name, choices):
+    """
+    Returns the values of a parameter given as comma separated list
+    and/or repeated parameter, checked against the model choices.
+    """
+    values = [value.strip() for raw in params.getlist(name) for value in raw.split(',') if value.strip()]
+    allowed = [value for value, _ in choices]
+    unknown = [value for value in values if value not in allowed]
+    if unknown:
+        raise ValidationError({name: f'Unknown value(s) {unknown}, expected any of {allowed}.'})
+    return values
+
+
+def _date(params, name):
+    try:
+        return date.fromisoformat(params[name])
+    except ValueError:
+        raise ValidationError({name: 'Expected a date as YYYY-MM-DD.'})
+
+
+def _user_id(params, name):
+    try:
+        return int(params[name])
+    except ValueError:
+        raise ValidationError({name: 'Expected a user id.'})
+
+
+def filter_tasks(queryset, params):
+    """
+    Applies the task filter and ordering query parameters to a task queryset,
+    so only the matching rows are loaded from the database.
+
+    Query parameters:
+        - status, priority: One or more values, comma separated or repeated.
+        - due_after, due_before: Inclusive due date range (YYYY-MM-DD).
+        - assignee, reviewer: User id.
+        - ordering: due_date, -due_date, priority or -priority. Tasks without
+          due date come last; ties are ordered by id. Defaults to id.
+
+    Raises:
+        ValidationError: If a parameter has an invalid value.
+    """
+    statuses = _choices(params, 'status', Task.STATUS_CHOICES)
+    if statuses:
+        queryset = queryset.filter(status__in=statuses)
+    priorities = _choices(params, 'priority', Task.PRIORITY_CHOICES)
+    if priorities:
+        queryset = queryset.filter(priority__in=priorities)
+    if 'due_after' in params:
+        queryset = queryset.filter(due_date__gte=_date(params, 'due_after'))
+    if 'due_before' in params:
+        queryset = queryset.filter(due_date__lte=_date(params, 'due_before'))
+    if 'assignee' in params:
+        queryset = queryset.filter(assignees=_user_id(params, 'assignee'))
+    if 'reviewer' in params:
+        queryset = queryset.filter(reviewers=_user_id(params, 'reviewer'))
+
+    ordering = ('id',)
+    if 'ordering' in params:
+        ordering = ORDERINGS.get(params['ordering'])
+        if ordering is None:
+            raise ValidationError({'ordering': f'Expected any of {list(ORDERINGS)}.'})
+    return queryset.order_by(*ordering)
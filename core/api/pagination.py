@@ -0,0 +1,114 @@
+from rest_framework import status
+from rest_framework.pagination import CursorPagination, _reverse_ordering
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Opt-in keyset (cursor) pagination for the list endpoints.
+
+    Pages are fetched with `WHERE id > <last id> ORDER BY id LIMIT n`,
+    so the cost of a page stays the same however deep the client goes.
+
+    Query parameters:
+        - limit: Number of rows per page (max. 500).
+        - cursor: Opaque cursor taken from the `next`/`previous` links.
+    """
+    ordering = 'id'
+    page_size = 50
+    max_page_size = 500
+    page_size_query_param = 'limit'
+    cursor_query_param = 'cursor'
+
+    def is_requested(self, request):
+        """
+        Returns True if the client asked for a paginated response.
+        Clients that send neither `limit` nor `cursor` get the full list.
+        """
+        params = request.query_params
+        return self.page_size_query_param in params or self.cursor_query_param in params
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Async variant of `paginate_queryset` for the native async views.
+        Produces the same pages and cursors, reading the page with async
+        ORM iteration instead of `list(queryset[...])`.
+
+        Raises:
+            NotFound: If the cursor is invalid.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        offset, reverse, current_position = self.cursor or (0, False, None)
+
+        queryset = queryset.order_by(*(_reverse_ordering(self.ordering) if reverse else self.ordering))
+        if current_position is not None:
+            order = self.ordering[0]
+            lookup = 'lt' if self.cursor.reverse != order.startswith('-') else 'gt'
+            queryset = queryset.filter(**{f'{order.lstrip("-")}__{lookup}': current_position})
+
+        results = [row async for row in queryset[offset:offset + self.page_size + 1]]
+        self.page = results[:self.page_size]
+        following_position = None
+        if len(results) > len(self.page):
+            following_position = self._get_position_from_instance(results[-1], self.ordering)
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = current_position is not None or offset > 0
+            self.has_previous = following_position is not None
+            self.next_position, self.previous_position = current_position, following_position
+        else:
+            self.has_next = following_position is not None
+            self.has_previous = current_position is not None or offset > 0
+            self.next_position, self.previous_position = following_position, current_position
+        return self.page
+
+    def get_paginated_data(self, data):
+        """
+        Returns the body of `get_paginated_response` as a plain dict.
+        """
+        return {'next': self.get_next_link(), 'previous': self.get_previous_link(), 'results': data}
+
+
+def paginate_if_requested(request, queryset, view):
+    """
+    Applies keyset pagination if the client requested it.
+
+    Returns:
+        - (rows, paginator) where rows is the current page, or
+        - (queryset, None) if no pagination was requested.
+    """
+    paginator = KeysetPagination()
+    if not paginator.is_requested(request):
+        return queryset, None
+    return paginator.paginate_queryset(queryset, request, view=view), paginator
+
+
+async def apaginate_if_requested(request, queryset, view=None):
+    """
+    Async variant of `paginate_if_requested` for plain Django requests.
+
+    Returns:
+        - (rows, paginator) where rows is the current page, or
+        - (None, None) if no pagination was requested.
+    """
+    request = Request(request)
+    paginator = KeysetPagination()
+    if not paginator.is_requested(request):
+        return None, None
+    return await paginator.apaginate_queryset(queryset, request, view=view), paginator
+
+
+def list_response(data, paginator):
+    """
+    Wraps serialized rows into a paginated response (`next`, `previous`,
+    `results`) or returns them as a plain list when not paginating.
+    """
+    if paginator is None:
+        return Response(data, status=status.HTTP_200_OK)
+    return paginator.get_paginated_response(data)
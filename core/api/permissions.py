@@ -1,5 +1,9 @@
+from django.db.models import Q
 from rest_framework import permissions
 
+from core.models import Board
+
+
 class IsStaffOrReadOnly(permissions.BasePermission):
     
 
@@ -10,3 +14,48 @@ class IsStaffOrReadOnly(permissions.BasePermission):
 
         # Schreibzugriffe nur für Staff
         return request.user and request.user.is_authenticated and request.user.is_staff
+
+
+def has_board_access(request, board_id):
+    """
+    Returns True if the requesting user is the owner or a member of the board.
+
+    The check is a single indexed EXISTS query. The result is cached on the
+    request, so repeated checks for the same board hit the database once.
+    """
+    user = request.user
+    if not user or not user.is_authenticated:
+        return False
+
+    cache = getattr(request, '_board_access_cache', None)
+    if cache is None:
+        cache = request._board_access_cache = {}
+
+    if board_id not in cache:
+        cache[board_id] = Board.objects.filter(
+            Q(owner_id=user.id) | Q(members__id=user.id),
+            id=board_id
+        ).exists()
+    return cache[board_id]
+
+
+async def ahas_board_access(request, board_id):
+    """
+    Async variant of `has_board_access` for native async views,
+    sharing the same per-request cache.
+    """
+    user = request.user
+    if not user or not user.is_authenticated:
+        return False
+
+    cache = getattr(request, '_board_access_cache', None)
+    if cache is None:
+        cache = request._board_access_cache = {}
+
+    if board_id not in cache:
+        cache[board_id] = await Board.objects.filter(
+            Q(owner_id=user.id) | Q(members__id=user.id),
+            id=board_id
+        ).aexists()
+    return cache[board_id]
+
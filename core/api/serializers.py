@@ -1,15 +1,23 @@
 from rest_framework import serializers
-from core.models import Board, Task, Comment
+from core.models import ArchivedTask, Board, Task, Comment
 from django.contrib.auth.models import User
 
+def first_related_user(obj, relation):
+    """
+    Returns the first user (by id) of the given M2M relation of a task.
+    Uses the list prefetched by `TaskQuerySet.for_listing()` when available.
+    """
+    prefetched = getattr(obj, f'prefetched_{relation}', None)
+    if prefetched is not None:
+        return prefetched[0] if prefetched else None
+    return getattr(obj, relation).first()
+
+
 class BoardSerializer(serializers.ModelSerializer):
     """
-    Serializer for the Board model. Includes dynamic fields for counts related to board members and tasks.
+    Serializer for the Board model. The member and task counters are read from
+    the denormalized board columns, which are kept up to date by `core.counters`.
     """
-    member_count = serializers.SerializerMethodField()
-    ticket_count = serializers.SerializerMethodField()
-    tasks_to_do_count = serializers.SerializerMethodField()
-    tasks_high_prio_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Board
@@ -22,6 +30,12 @@ class BoardSerializer(serializers.ModelSerializer):
             'tasks_high_prio_count',
             'owner_id',
         ]
+        read_only_fields = [
+            'member_count',
+            'ticket_count',
+            'tasks_to_do_count',
+            'tasks_high_prio_count',
+        ]
         extra_kwargs = {
             'owner_id': {'read_only': True}
         }
@@ -32,30 +46,6 @@ class BoardSerializer(serializers.ModelSerializer):
         """
         return Board.objects.create(**validated_data)
 
-    def get_member_count(self, obj):
-        """
-        Return the number of members in the board.
-        """
-        return obj.members.count()
-
-    def get_ticket_count(self, obj):
-        """
-        Return the number of tasks (tickets) associated with the board.
-        """
-        return obj.tasks.count()
-
-    def get_tasks_to_do_count(self, obj):
-        """
-        Return the number of tasks in 'to-do' status.
-        """
-        return obj.tasks.filter(status='to-do').count()
-
-    def get_tasks_high_prio_count(self, obj):
-        """
-        Return the number of high priority tasks.
-        """
-        return obj.tasks.filter(priority='high').count()
-
 class BoardMemberSerializer(serializers.ModelSerializer):
     """
     Serializer for representing a board member.
@@ -108,13 +98,15 @@ class TaskSerializer(serializers.ModelSerializer):
         """
         Returns the number of comments related to the task.
         """
+        if hasattr(obj, 'annotated_comments_count'):
+            return obj.annotated_comments_count
         return obj.comments.count() if hasattr(obj, 'comments') else 0
     
     def get_assignee(self, obj):
         """
         Returns the first user from the assignees list as a dictionary.
         """
-        user = obj.assignees.first()
+        user = first_related_user(obj, 'assignees')
         if user:
             return {
             "id": user.id,
@@ -127,7 +119,7 @@ class TaskSerializer(serializers.ModelSerializer):
         """
         Returns the first user from the reviewers list as a dictionary.
         """
-        user = obj.reviewers.first()
+        user = first_related_user(obj, 'reviewers')
         if user:
             return {
             "id": user.id,
@@ -174,6 +166,10 @@ class BoardDetailSerializer(serializers.ModelSerializer):
     """
     Detailed serializer for a single board.
     Includes board members, tasks, and owner ID.
+
+    The board detail endpoint renders this document with
+    `fast_serializers.serialize_board_detail`; this serializer is kept as its
+    reference and checked against it by `FastTaskSerializerParityTests`.
     """
     members = BoardMemberSerializer(many=True)
     tasks = TaskSerializer(many=True)
@@ -245,7 +241,7 @@ class TaskPatchSerializer(serializers.ModelSerializer):
         """
         Returns the first user from the assignees list as a dictionary.
         """
-        user = obj.assignees.first()
+        user = first_related_user(obj, 'assignees')
         if user:
             return {
             "id": user.id,
@@ -258,7 +254,7 @@ class TaskPatchSerializer(serializers.ModelSerializer):
         """
         Returns the first user from the reviewers list as a dictionary.
         """
-        user = obj.reviewers.first()
+        user = first_related_user(obj, 'reviewers')
         if user:
             return {
             "id": user.id,
@@ -279,7 +275,7 @@ class TaskAssignedToMeSerializer(serializers.ModelSerializer):
     """
     assignee = serializers.SerializerMethodField(source='assignees', read_only=True)
     reviewer = serializers.SerializerMethodField(source='reviewers', read_only=True)
-    board = serializers.IntegerField(source='board.id', read_only=True)
+    board = serializers.IntegerField(source='board_id', read_only=True)
     comments_count = serializers.SerializerMethodField()
 
     class Meta:
@@ -301,7 +297,7 @@ class TaskAssignedToMeSerializer(serializers.ModelSerializer):
         """
         Returns the first user from the assignees list as a dictionary.
         """
-        user = obj.assignees.first()
+        user = first_related_user(obj, 'assignees')
         if user:
             return {
             "id": user.id,
@@ -314,7 +310,7 @@ class TaskAssignedToMeSerializer(serializers.ModelSerializer):
         """
         Returns the first user from the reviewers list as a dictionary.
         """
-        user = obj.reviewers.first()
+        user = first_related_user(obj, 'reviewers')
         if user:
             return {
             "id": user.id,
@@ -328,4 +324,83 @@ class TaskAssignedToMeSerializer(serializers.ModelSerializer):
         """
         Returns the number of comments associated with the task.
         """
+        if hasattr(obj, 'annotated_comments_count'):
+            return obj.annotated_comments_count
         return obj.comments.count()
+
+
+class TaskBatchItemSerializer(TaskPatchSerializer):
+    """
+    Validates a single item of a batch update. Accepts the fields of
+    `TaskPatchSerializer` plus the assignee and reviewer input of the single
+    task endpoint: a list of user IDs or a single `assignee_id`/`reviewer_id`.
+    Both are normalized into `assignees`/`reviewers` ID lists, which are only
+    present in the validated data if the client sent one of them.
+    """
+    assignees = serializers.ListField(child=serializers.IntegerField(), required=False, allow_null=True,
+                                      write_only=True)
+    reviewers = serializers.ListField(child=serializers.IntegerField(), required=False, allow_null=True,
+                                      write_only=True)
+    assignee_id = serializers.IntegerField(required=False, allow_null=True, write_only=True)
+    reviewer_id = serializers.IntegerField(required=False, allow_null=True, write_only=True)
+
+    class Meta(TaskPatchSerializer.Meta):
+        fields = TaskPatchSerializer.Meta.fields + ['assignees', 'reviewers', 'assignee_id', 'reviewer_id']
+
+    def validate(self, attrs):
+        for relation, single in (('assignees', 'assignee_id'), ('reviewers', 'reviewer_id')):
+            has_single = single in attrs
+            single_id = attrs.pop(single, None)
+            if relation in attrs:
+                attrs[relation] = attrs[relation] or []
+            elif has_single:
+                attrs[relation] = [single_id] if single_id is not None else []
+        return attrs
+
+
+class TaskBulkItemSerializer(serializers.ModelSerializer):
+    """
+    Validates a single task of a bulk create request.
+    The board is given once for the whole batch, so it is not part of the item.
+    Assignees and reviewers accept either a list of user IDs or a single
+    `assignee_id`/`reviewer_id`, like the single task endpoint.
+    """
+    assignees = serializers.ListField(child=serializers.IntegerField(), required=False)
+    reviewers = serializers.ListField(child=serializers.IntegerField(), required=False)
+    assignee_id = serializers.IntegerField(required=False, allow_null=True)
+    reviewer_id = serializers.IntegerField(required=False, allow_null=True)
+
+    class Meta:
+        model = Task
+        fields = [
+            'title', 'description', 'status', 'priority', 'due_date',
+            'assignees', 'reviewers', 'assignee_id', 'reviewer_id'
+        ]
+        extra_kwargs = {
+            'description': {'allow_blank': True, 'default': ''}
+        }
+
+    def validate(self, attrs):
+        """
+        Normalizes assignee and reviewer input into ID lists. The view checks
+        the board membership of the users for the whole batch at once.
+        """
+        for relation, single in (('assignees', 'assignee_id'), ('reviewers', 'reviewer_id')):
+            single_id = attrs.pop(single, None)
+            if relation not in attrs:
+                attrs[relation] = [single_id] if single_id is not None else []
+        return attrs
+
+
+class ArchivedTaskSerializer(serializers.ModelSerializer):
+    """
+    Serializer for tasks moved to the archive by `core.archive`.
+    Assignees and reviewers are listed by user id, comments as stored.
+    """
+
+    class Meta:
+        model = ArchivedTask
+        fields = [
+            'id', 'board', 'title', 'description', 'status', 'priority', 'due_date',
+            'completed_at', 'archived_at', 'assignee_ids', 'reviewer_ids', 'comments',
+        ]
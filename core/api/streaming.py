@@ -0,0 +1,112 @@
+from itertools import islice
+
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import JSONRenderer
+
+from core.models import Task
+
+from .fast_serializers import aserialize_tasks
+from .serializers import BoardMemberSerializer, TaskSerializer
+
+STREAM_CHUNK_SIZE = 500
+
+_renderer = JSONRenderer()
+
+
+def is_stream_requested(request):
+    """
+    Returns True if the client asked for a streamed response via `?stream=true`.
+    """
+    return request.GET.get('stream', '').lower() in ('1', 'true', 'yes')
+
+
+def _chunks(queryset, chunk_size):
+    """
+    Iterates the queryset in chunks of `chunk_size` objects.
+    Prefetches are executed once per chunk, so memory stays bounded.
+    """
+    iterator = queryset.iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _json_array(queryset, serializer_class, context=None, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Yields a JSON array of serialized objects piece by piece.
+    """
+    yield b'['
+    first = True
+    for chunk in _chunks(queryset, chunk_size):
+        for item in serializer_class(chunk, many=True, context=context).data:
+            if not first:
+                yield b','
+            first = False
+            yield _renderer.render(item)
+    yield b']'
+
+
+def streaming_json_response(content):
+    """
+    Wraps a generator of JSON bytes into a streaming HTTP response.
+    """
+    return StreamingHttpResponse(content, content_type='application/json')
+
+
+def stream_task_list(queryset, serializer_class, context=None):
+    """
+    Streams a list of tasks as a JSON array.
+    """
+    return streaming_json_response(_json_array(queryset, serializer_class, context))
+
+
+async def _ajson_tasks(queryset, chunk_size):
+    """
+    Async variant of `_json_array` for tasks. The ordered task ids are read
+    first, then each chunk is serialized with `aserialize_tasks`.
+    """
+    task_ids = [task_id async for task_id in queryset.values_list('id', flat=True)]
+    yield b'['
+    for start in range(0, len(task_ids), chunk_size):
+        chunk = task_ids[start:start + chunk_size]
+        rows = {row['id']: row for row in await aserialize_tasks(Task.objects.filter(id__in=chunk))}
+        for position, task_id in enumerate(chunk):
+            if start or position:
+                yield b','
+            yield _renderer.render(rows[task_id])
+    yield b']'
+
+
+def astream_task_list(queryset, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Streams a list of tasks as a JSON array from a native async view.
+    """
+    return streaming_json_response(_ajson_tasks(queryset, chunk_size))
+
+
+def stream_board_detail(board, tasks=None):
+    """
+    Streams the same document as `BoardDetailSerializer`, writing the
+    board header and members first and then the tasks chunk by chunk.
+    `tasks` replaces all tasks of the board, e.g. with a filtered queryset.
+    """
+    if tasks is None:
+        tasks = board.tasks.all()
+    if not tasks.ordered:
+        tasks = tasks.order_by('id')
+
+    def content():
+        header = _renderer.render({
+            'id': board.id,
+            'title': board.title,
+            'owner_id': board.owner_id,
+            'members': BoardMemberSerializer(board.members.all(), many=True).data,
+        })
+        # Re-open the rendered object to append the task array
+        yield header[:-1] + b',"tasks":'
+        yield from _json_array(tasks.for_listing(), TaskSerializer)
+        yield b'}'
+
+    return streaming_json_response(content())
@@ -2,7 +2,13 @@ from django.urls import path
 from .views import (
     BoardListView, EmailCheckView, MyTasksAssignedView, TaskCreateView,
     BoardDetailsView, MyTasksReviewsView, MyTaskDetailsView,
-    CommentView, CommentDetailView
+    CommentView, CommentDetailView, TaskBulkCreateView, TaskBatchUpdateView,
+    BoardChangesView, ProfileDownloadView, MetricsView, TaskSearchView,
+    BoardArchiveView, ArchivedTaskRestoreView
+)
+from .async_views import (
+    AsyncBoardListView, AsyncBoardDetailsView, AsyncMyTasksAssignedView,
+    AsyncMyTasksReviewsView, AsyncCommentView, BoardEventsView
 )
 from auth_app.api.views import RegistrationView, LoginView
 
@@ -11,11 +17,28 @@ urlpatterns = [
     path('login/', LoginView.as_view(), name='login'),
     path('boards/', BoardListView.as_view(), name='board_list'),
     path('boards/<int:board_id>/', BoardDetailsView.as_view()), 
+    path('boards/<int:board_id>/changes/', BoardChangesView.as_view(), name='board_changes'),
+    path('boards/<int:board_id>/archive/', BoardArchiveView.as_view(), name='board_archive'),
+    path('boards/<int:board_id>/archive/<int:task_id>/restore/', ArchivedTaskRestoreView.as_view(),
+         name='archived_task_restore'),
+    path('boards/<int:board_id>/events/', BoardEventsView.as_view(), name='board_events'),
     path('email-check/', EmailCheckView.as_view(), name='email_check'),
     path('tasks/', TaskCreateView.as_view(), name="task_create"),
+    path('tasks/bulk/', TaskBulkCreateView.as_view(), name='task_bulk_create'),
+    path('tasks/batch/', TaskBatchUpdateView.as_view(), name='task_batch_update'),
+    path('tasks/search/', TaskSearchView.as_view(), name='task_search'),
     path('tasks/assigned-to-me/', MyTasksAssignedView.as_view(), name='assigned_to_me'),
     path('tasks/reviewing/', MyTasksReviewsView.as_view(), name='assigned_to_me'),
     path('tasks/<int:task_id>/', MyTaskDetailsView.as_view(), name='details-task'),
     path('tasks/<int:task_id>/comments/', CommentView.as_view(), name='comment'),
     path('tasks/<int:task_id>/comments/<int:comments_id>/', CommentDetailView.as_view(), name='comment-detail'),
+    path('profiles/<str:profile_id>/', ProfileDownloadView.as_view(), name='profile_download'),
+    path('metrics/', MetricsView.as_view(), name='metrics'),
+
+    # Native async read endpoints, intended to be served through kanban/asgi.py
+    path('async/boards/', AsyncBoardListView.as_view(), name='async_board_list'),
+    path('async/boards/<int:board_id>/', AsyncBoardDetailsView.as_view(), name='async_board_detail'),
+    path('async/tasks/assigned-to-me/', AsyncMyTasksAssignedView.as_view(), name='async_assigned_to_me'),
+    path('async/tasks/reviewing/', AsyncMyTasksReviewsView.as_view(), name='async_reviewing'),
+    path('async/tasks/<int:task_id>/comments/', AsyncCommentView.as_view(), name='async_comment'),
 ]
@@ -2,22 +2,36 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from .serializers import BoardSerializer, TaskSerializer, TaskReviewSerializer, CommentSerializer
-from .serializers import BoardDetailSerializer, BoardPatchSerializer, TaskPatchSerializer, TaskAssignedToMeSerializer
-from core.models import Board, Task, Comment
-from rest_framework.permissions import IsAuthenticated
-from django.db.models import Q
+from . import detail_cache
+from .fast_serializers import serialize_board_detail, serialize_tasks
+from .etags import board_detail_etag, board_list_etag, board_version
+from .permissions import has_board_access
+from .filters import filter_tasks, is_filter_requested
+from .pagination import KeysetPagination, paginate_if_requested, list_response
+from .streaming import is_stream_requested, stream_board_detail, stream_task_list
+from .serializers import BoardPatchSerializer, TaskPatchSerializer, TaskAssignedToMeSerializer, TaskBatchItemSerializer
+from .serializers import TaskBulkItemSerializer, BoardMemberSerializer, ArchivedTaskSerializer
+from core.models import ArchivedTask, Board, Task, Comment
+from core import archive, changelog, counters, metrics, profiling, replicas, search
+from core.events import publish_board_event
+from core.writes import write_transaction
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from django.contrib.auth.models import User
-from rest_framework.authentication import TokenAuthentication
+from auth_app.authentication import CachedTokenAuthentication, token_cache
+from django.http import FileResponse, Http404, HttpResponse
 from django.shortcuts import get_object_or_404
-from rest_framework.exceptions import ValidationError
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+from rest_framework.exceptions import NotFound, ValidationError
 
 
 class BoardListView(APIView):
     """
     API endpoint to create a new board or list all boards where the user is an owner or a member.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    read_from_replica = True
 
     def post(self, request):
         """
@@ -32,17 +46,20 @@ class BoardListView(APIView):
 
         serializer = BoardSerializer(data=data)
         if serializer.is_valid():
-            board = serializer.save(owner=user)
+            with write_transaction():
+                board = serializer.save(owner=user)
 
-            # Handle board members if provided
-            member_ids = request.data.get('members', [])
-            valid_users = User.objects.filter(id__in=member_ids)
-            board.members.set(valid_users)
+                # Handle board members if provided
+                member_ids = request.data.get('members', [])
+                valid_users = User.objects.filter(id__in=member_ids)
+                board.members.set(valid_users)
+                counters.members_changed(board.id)
 
+            board.refresh_from_db()
             response_data = {
                 'id': board.id,
                 'title': board.title,
-                'member_count': board.members.count(),
+                'member_count': board.member_count,
                 'ticket_count': board.ticket_count,
                 'tasks_to_do_count': board.tasks_to_do_count,
                 'tasks_high_prio_count': board.tasks_high_prio_count,
@@ -52,14 +69,23 @@ class BoardListView(APIView):
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    @method_decorator(condition(etag_func=board_list_etag))
     def get(self, request):
         """
         Returns all boards where the authenticated user is either the owner or a member.
+        The counters are read from the stored board columns, so the list costs a single query.
+
+        Supports opt-in keyset pagination via `?limit=` and `?cursor=`.
+        Sends an ETag and answers `If-None-Match` with 304 Not Modified.
         """
         user = request.user
-        boards = Board.objects.filter(Q(owner=user) | Q(members=user)).distinct()
+        boards = Board.objects.for_user(user)
+        try:
+            boards, paginator = paginate_if_requested(request, boards, self)
+        except NotFound as e:
+            return Response({'error': str(e.detail)}, status=status.HTTP_404_NOT_FOUND)
         serializer = BoardSerializer(boards, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return list_response(serializer.data, paginator)
     
 class BoardDetailsView(APIView):
     """
@@ -69,21 +95,57 @@ class BoardDetailsView(APIView):
         - Only the board owner or members can view or edit.
         - Only the owner can delete the board.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    read_from_replica = True
 
+    @method_decorator(condition(etag_func=board_detail_etag))
     def get(self, request, board_id):
         """
         Returns detailed board information including all associated tasks.
+
+        Sends an ETag based on the board version. A matching `If-None-Match`
+        is answered with 304 Not Modified without serializing the board.
+        Otherwise the serialized board is served from the versioned detail
+        cache when possible (see `X-Cache` response header).
+        Members, tasks, assignees, reviewers and comment counts are prefetched,
+        so the number of queries does not depend on the number of tasks.
+
+        With `?stream=true` the tasks are loaded in chunks and the JSON is
+        streamed, keeping memory flat for very large boards.
+
+        The task filter and ordering parameters of `core/api/filters.py`
+        (e.g. `?status=to-do&ordering=due_date`) limit the returned tasks.
+        Filtered responses bypass the detail cache.
         """
-        board = get_object_or_404(Board, id=board_id)
-        user = request.user
+        version = board_version(request, board_id)
+        if version is None:
+            raise Http404('No Board matches the given query.')
 
-        if board.owner != user and user not in board.members.all():
+        if not has_board_access(request, board_id):
             return Response({'detail': 'Access denied'}, status=status.HTTP_403_FORBIDDEN)
 
-        board_data = BoardDetailSerializer(board).data
-        return Response(board_data, status=status.HTTP_200_OK)
+        tasks = None
+        if is_filter_requested(request.query_params):
+            tasks = filter_tasks(Task.objects.filter(board_id=board_id), request.query_params)
+
+        if is_stream_requested(request):
+            board = get_object_or_404(Board.objects.prefetch_related('members'), id=board_id)
+            return stream_board_detail(board, tasks)
+
+        if tasks is not None:
+            board = get_object_or_404(Board.objects.prefetch_related('members'), id=board_id)
+            return Response(serialize_board_detail(board, tasks), status=status.HTTP_200_OK)
+
+        board_data = detail_cache.lookup(board_id, version)
+        cache_state = 'HIT'
+        if board_data is None:
+            board = get_object_or_404(Board.objects.prefetch_related('members'), id=board_id)
+            board_data = serialize_board_detail(board)
+            detail_cache.store(board_id, version, board_data)
+            cache_state = 'MISS'
+
+        return Response(board_data, status=status.HTTP_200_OK, headers={'X-Cache': cache_state})
 
     def patch(self, request, board_id):
         """
@@ -91,23 +153,29 @@ class BoardDetailsView(APIView):
         Only accessible to the board owner or members.
         """
         board = get_object_or_404(Board, id=board_id)
-        user = request.user
 
-        if user != board.owner and user not in board.members.all():
+        if not has_board_access(request, board.id):
             return Response({'detail': 'Access denied'}, status=status.HTTP_403_FORBIDDEN)
 
         data = request.data.copy()
         serializer = BoardPatchSerializer(board, data=data, partial=True, context={'request': request})
 
         if serializer.is_valid():
-            updated_board = serializer.save()
-
-            if 'members' in data:
-                member_ids = data.get('members', [])
-                valid_members = User.objects.filter(id__in=member_ids)
-                updated_board.members.set(valid_members)
+            with write_transaction():
+                updated_board = serializer.save()
+
+                if 'members' in data:
+                    member_ids = data.get('members', [])
+                    valid_members = User.objects.filter(id__in=member_ids)
+                    updated_board.members.set(valid_members)
+                    counters.members_changed(updated_board.id)
+                    changelog.record(updated_board.id, 'members', updated_board.id)
+                else:
+                    counters.board_changed(updated_board.id)
+                changelog.record(updated_board.id, 'board', updated_board.id)
 
             board_data = BoardPatchSerializer(updated_board, context={'request': request}).data
+            publish_board_event(updated_board.id, 'board_updated', board_data)
 
             return Response(board_data, status=status.HTTP_200_OK)
 
@@ -120,12 +188,168 @@ class BoardDetailsView(APIView):
         """
         board = get_object_or_404(Board, id=board_id)
 
-        if board.owner != request.user:
+        if board.owner_id != request.user.id:
             return Response({'detail': 'Access denied'}, status=status.HTTP_403_FORBIDDEN)
 
-        board.delete()
+        with write_transaction():
+            board.delete()
+        publish_board_event(board_id, 'board_deleted', {'id': board_id})
         return Response(status=status.HTTP_204_NO_CONTENT)
-      
+
+class BoardArchiveView(APIView):
+    """
+    Lists the archived tasks of a board (see core/archive.py).
+
+    Example:
+        GET /api/boards/1/archive/?limit=50
+
+    Permissions:
+        - Only the board owner or members can list the archive.
+    """
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, board_id):
+        """
+        Returns:
+            - 200 OK with the archived tasks ordered by id
+              (paginated when `limit` or `cursor` is given)
+            - 403 Forbidden if user not allowed
+            - 404 Not Found if board not found or the cursor is invalid
+        """
+        board = get_object_or_404(Board, id=board_id)
+
+        if not has_board_access(request, board.id):
+            return Response({'detail': 'Access denied'}, status=status.HTTP_403_FORBIDDEN)
+
+        tasks = ArchivedTask.objects.filter(board=board).order_by('id')
+        try:
+            page, paginator = paginate_if_requested(request, tasks, self)
+        except NotFound as e:
+            return Response({'error': str(e.detail)}, status=status.HTTP_404_NOT_FOUND)
+        return list_response(ArchivedTaskSerializer(page, many=True).data, paginator)
+
+
+class ArchivedTaskRestoreView(APIView):
+    """
+    Moves an archived task back into its board.
+
+    Example:
+        POST /api/boards/1/archive/42/restore/
+
+    Permissions:
+        - Only the board owner or members can restore tasks.
+    """
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, board_id, task_id):
+        """
+        Returns:
+            - 200 OK with the restored task
+            - 403 Forbidden if user not allowed
+            - 404 Not Found if the board has no such archived task
+        """
+        board = get_object_or_404(Board, id=board_id)
+
+        if not has_board_access(request, board.id):
+            return Response({'detail': 'Access denied'}, status=status.HTTP_403_FORBIDDEN)
+
+        task = archive.restore_task(board.id, task_id)
+        if task is None:
+            raise Http404('No archived task matches the given query.')
+
+        task_data = TaskSerializer(Task.objects.for_listing().get(id=task.id), context={'request': request}).data
+        publish_board_event(board.id, 'task_created', task_data)
+        return Response(task_data, status=status.HTTP_200_OK)
+
+
+class BoardChangesView(APIView):
+    """
+    Delta sync endpoint: returns what changed on a board after a sequence number.
+
+    Example:
+        GET /api/boards/1/changes/?since=42
+
+    Permissions:
+        - Only the board owner or members can read the changes.
+    """
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, board_id):
+        """
+        Returns the current state of every object changed after `since`
+        (default 0), coalesced to one entry per object and ordered by sequence
+        number. Deleted objects are returned as tombstones without data.
+
+        Clients store `latest` and pass it as `since` on the next call. If the
+        requested range is no longer available (see `compact_board_changes`)
+        or too large, `resync` is true and the client should reload the board.
+
+        Returns:
+            - 200 OK with {"board", "since", "latest", "resync", "changes"}
+            - 400 Bad Request if `since` is not a non-negative integer
+            - 403 Forbidden if user not allowed
+            - 404 Not Found if board not found
+        """
+        board = get_object_or_404(Board, id=board_id)
+
+        if not has_board_access(request, board.id):
+            return Response({'detail': 'Access denied'}, status=status.HTTP_403_FORBIDDEN)
+
+        try:
+            since = int(request.query_params.get('since', 0))
+        except ValueError:
+            since = -1
+        if since < 0:
+            return Response({'error': '`since` must be a non-negative integer.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        latest = changelog.latest_sequence(board)
+        rows = changelog.changes_since(board, since)
+        body = {'board': board.id, 'since': since, 'latest': latest, 'resync': rows is None, 'changes': []}
+        if rows is not None:
+            body['changes'] = self.build_changes(board, rows)
+        return Response(body, status=status.HTTP_200_OK)
+
+    def build_changes(self, board, rows):
+        """
+        Attaches the current data to every upsert entry, loading each entity
+        kind with one query. Objects that no longer exist, e.g. comments
+        removed together with their task, are reported as deletes.
+        """
+        wanted = {}
+        for row in rows:
+            if row['operation'] == 'upsert':
+                wanted.setdefault(row['entity'], []).append(row['entity_id'])
+
+        data = {'task': {}, 'comment': {}, 'board': {}, 'members': {}}
+        if 'task' in wanted:
+            tasks = Task.objects.filter(board=board, id__in=wanted['task']).for_listing()
+            data['task'] = {task.id: TaskSerializer(task).data for task in tasks}
+        if 'comment' in wanted:
+            comments = Comment.objects.filter(task__board=board, id__in=wanted['comment']).select_related('author')
+            data['comment'] = {
+                comment.id: {'task': comment.task_id, **CommentSerializer(comment).data}
+                for comment in comments
+            }
+        if 'board' in wanted:
+            data['board'] = {board.id: {'id': board.id, 'title': board.title, 'owner_id': board.owner_id}}
+        if 'members' in wanted:
+            data['members'] = {board.id: BoardMemberSerializer(board.members.all(), many=True).data}
+
+        changes = []
+        for row in rows:
+            entry = {'seq': row['id'], 'entity': row['entity'], 'id': row['entity_id'], 'op': row['operation']}
+            if row['operation'] == 'upsert':
+                current = data[row['entity']].get(row['entity_id'])
+                if current is None:
+                    entry['op'] = 'delete'
+                else:
+                    entry['data'] = current
+            changes.append(entry)
+        return changes
+
 class EmailCheckView(APIView):
     """
     API view to check if a given email is registered in the system.
@@ -181,7 +405,6 @@ class TaskCreateView(APIView):
         """
         try:
             data = request.data
-            user = request.user
 
             board_id = data.get("board")
             if not board_id:
@@ -192,7 +415,7 @@ class TaskCreateView(APIView):
             except Board.DoesNotExist:
                 return Response({"error": "Board not found."}, status=status.HTTP_404_NOT_FOUND)
 
-            if user != board.owner and user not in board.members.all():
+            if not has_board_access(request, board.id):
                 return Response({"error": "Access denied. You are not a member of this board."}, status=status.HTTP_403_FORBIDDEN)
 
             assignee_ids = []
@@ -207,24 +430,307 @@ class TaskCreateView(APIView):
             elif 'reviewer_id' in data:
                 reviewer_ids = [data.get('reviewer_id')]
 
-            task = Task.objects.create(
-                board=board,
-                title=data.get("title"),
-                description=data.get("description"),
-                status=data.get("status"),
-                priority=data.get("priority"),
-                due_date=data.get("due_date")
-            )
-
-            task.assignees.set(assignee_ids)
-            task.reviewers.set(reviewer_ids)
+            with write_transaction():
+                task = Task.objects.create(
+                    board=board,
+                    title=data.get("title"),
+                    description=data.get("description"),
+                    status=data.get("status"),
+                    priority=data.get("priority"),
+                    due_date=data.get("due_date")
+                )
+
+                task.assignees.set(assignee_ids)
+                task.reviewers.set(reviewer_ids)
+                counters.task_created(task)
+                changelog.record(board.id, 'task', task.id)
 
             serializer = TaskSerializer(task, context={"request": request})
+            publish_board_event(board.id, 'task_created', serializer.data)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
 
         except ValidationError as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
         
+class TaskBulkCreateView(APIView):
+    """
+    API view to create many tasks within one board in a single request.
+
+    Expects a body like `{"board": 1, "tasks": [{...}, {...}]}` where every
+    item accepts the same fields as the single task endpoint.
+
+    Permissions:
+        - User must be authenticated and must be the owner or a member of the board.
+    """
+    permission_classes = [IsAuthenticated]
+    max_batch_size = 5000
+
+    def post(self, request):
+        """
+        Validates all items, then inserts the valid tasks and their assignee
+        and reviewer rows with `bulk_create` inside one transaction.
+
+        Returns a list with one result per submitted item, in request order:
+            - {"index": i, "status": 201, "task": {...}} for created tasks
+            - {"index": i, "status": 400, "errors": {...}} for invalid items
+
+        Status codes:
+            - 201 Created if all tasks were created
+            - 207 Multi-Status if only some tasks were created
+            - 400 Bad Request if the body is invalid or no task could be created
+            - 403 Forbidden if user not allowed
+            - 404 Not Found if board not found
+        """
+        if not isinstance(request.data, dict):
+            return Response({"error": "Expected a JSON object with 'board' and 'tasks'."}, status=status.HTTP_400_BAD_REQUEST)
+        board_id = request.data.get('board')
+        items = request.data.get('tasks')
+
+        if not board_id:
+            return Response({"error": "Board ID is required."}, status=status.HTTP_400_BAD_REQUEST)
+        if not isinstance(items, list) or not items:
+            return Response({"error": "A non-empty list of tasks is required."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > self.max_batch_size:
+            return Response(
+                {"error": f"At most {self.max_batch_size} tasks can be created at once."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        board = get_object_or_404(Board, id=board_id)
+        if not has_board_access(request, board.id):
+            return Response({"error": "Access denied. You are not a member of this board."}, status=status.HTTP_403_FORBIDDEN)
+
+        results = [None] * len(items)
+        valid = []
+        for index, item in enumerate(items):
+            serializer = TaskBulkItemSerializer(data=item)
+            if serializer.is_valid():
+                valid.append((index, serializer.validated_data))
+            else:
+                results[index] = {'index': index, 'status': status.HTTP_400_BAD_REQUEST, 'errors': serializer.errors}
+        valid = self.check_members(board, valid, results)
+
+        if valid:
+            tasks = [
+                Task(
+                    board=board,
+                    title=data['title'],
+                    description=data.get('description', ''),
+                    status=data.get('status', 'to-do'),
+                    priority=data['priority'],
+                    due_date=data.get('due_date')
+                )
+                for _, data in valid
+            ]
+            for task in tasks:
+                task.sync_completed_at()
+            with write_transaction():
+                tasks = Task.objects.bulk_create(tasks)
+                Task.assignees.through.objects.bulk_create([
+                    Task.assignees.through(task_id=task.id, user_id=user_id)
+                    for task, (_, data) in zip(tasks, valid)
+                    for user_id in dict.fromkeys(data['assignees'])
+                ])
+                Task.reviewers.through.objects.bulk_create([
+                    Task.reviewers.through(task_id=task.id, user_id=user_id)
+                    for task, (_, data) in zip(tasks, valid)
+                    for user_id in dict.fromkeys(data['reviewers'])
+                ])
+                counters.tasks_created(board.id, tasks)
+                changelog.record_many((board.id, 'task', task.id, 'upsert') for task in tasks)
+
+            created = Task.objects.filter(id__in=[task.id for task in tasks]).for_listing().in_bulk()
+            for task, (index, _) in zip(tasks, valid):
+                results[index] = {
+                    'index': index,
+                    'status': status.HTTP_201_CREATED,
+                    'task': TaskSerializer(created[task.id]).data
+                }
+                publish_board_event(board.id, 'task_created', results[index]['task'])
+
+        if len(valid) == len(items):
+            response_status = status.HTTP_201_CREATED
+        elif valid:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response(results, status=response_status)
+
+    @staticmethod
+    def check_members(board, valid, results):
+        """
+        Rejects the items whose assignees or reviewers are neither members
+        nor the owner of the board. Only the referenced users are looked up.
+
+        Returns the items that passed; the results of the others are set to 400.
+        """
+        relations = ('assignees', 'reviewers')
+        wanted = {user_id for _, data in valid for relation in relations for user_id in data[relation]}
+        wanted.discard(board.owner_id)
+        allowed = set(board.members.filter(id__in=wanted).values_list('id', flat=True)) if wanted else set()
+        allowed.add(board.owner_id)
+
+        passed = []
+        for index, data in valid:
+            errors = {}
+            for relation in relations:
+                unknown = [user_id for user_id in data[relation] if user_id not in allowed]
+                if unknown:
+                    errors[relation] = [f'Users {unknown} are not members of this board.']
+            if errors:
+                results[index] = {'index': index, 'status': status.HTTP_400_BAD_REQUEST, 'errors': errors}
+            else:
+                passed.append((index, data))
+        return passed
+
+class TaskBatchUpdateView(APIView):
+    """
+    API view to apply many partial task updates in one request,
+    e.g. after reorganising a board via drag and drop.
+
+    Expects a body like `{"tasks": [{"id": 1, "status": "done"}, ...]}`
+    where every item accepts the same fields as `PATCH /api/tasks/<id>/`.
+
+    Permissions:
+        - User must be authenticated.
+        - For every task the user must be the board owner, an assignee or a reviewer.
+    """
+    permission_classes = [IsAuthenticated]
+    max_batch_size = 5000
+    relations = ('assignees', 'reviewers')
+
+    def patch(self, request):
+        """
+        Validates every item, then writes all valid changes in one transaction.
+        Scalar fields are saved with `bulk_update`; assignee and reviewer rows
+        are only rewritten for items that actually contain those fields.
+
+        Returns a list with one result per submitted item, in request order:
+            - {"index": i, "id": id, "status": 200, "task": {...}} for updated tasks
+            - {"index": i, "id": id, "status": 400/403/404, "errors": ...} otherwise
+
+        Status codes:
+            - 200 OK if all tasks were updated
+            - 207 Multi-Status if only some tasks were updated
+            - 400 Bad Request if the body is invalid or no task could be updated
+        """
+        if not isinstance(request.data, dict):
+            return Response({"error": "Expected a JSON object with 'tasks'."}, status=status.HTTP_400_BAD_REQUEST)
+        items = request.data.get('tasks')
+        if not isinstance(items, list) or not items:
+            return Response({"error": "A non-empty list of tasks is required."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > self.max_batch_size:
+            return Response(
+                {"error": f"At most {self.max_batch_size} tasks can be updated at once."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        user = request.user
+        results = [None] * len(items)
+        task_ids = [item.get('id') for item in items if isinstance(item, dict)]
+
+        with write_transaction():
+            tasks = (
+                Task.objects.select_for_update()
+                .filter(id__in=[task_id for task_id in task_ids if isinstance(task_id, int)])
+                .select_related('board')
+                .prefetch_related('assignees', 'reviewers')
+                .in_bulk()
+            )
+
+            updates = []
+            for index, item in enumerate(items):
+                task_id = item.get('id') if isinstance(item, dict) else None
+                task = tasks.get(task_id)
+                if task is None:
+                    results[index] = {'index': index, 'id': task_id, 'status': status.HTTP_404_NOT_FOUND,
+                                      'errors': {'detail': 'Task not found.'}}
+                    continue
+
+                people = {person.id for person in task.assignees.all()}
+                people.update(person.id for person in task.reviewers.all())
+                if user.id != task.board.owner_id and user.id not in people:
+                    results[index] = {'index': index, 'id': task_id, 'status': status.HTTP_403_FORBIDDEN,
+                                      'errors': {'detail': 'You do not have permission to update this task.'}}
+                    continue
+
+                serializer = TaskBatchItemSerializer(task, data=item, partial=True)
+                if not serializer.is_valid():
+                    results[index] = {'index': index, 'id': task_id, 'status': status.HTTP_400_BAD_REQUEST,
+                                      'errors': serializer.errors}
+                    continue
+                validated = dict(serializer.validated_data)
+                relations = {relation: validated.pop(relation) for relation in self.relations if relation in validated}
+                updates.append((index, task, relations, validated))
+
+            self.apply_updates(updates)
+
+        updated = Task.objects.filter(id__in=[task.id for _, task, _, _ in updates]).for_listing().in_bulk()
+        for index, task, _, _ in updates:
+            results[index] = {'index': index, 'id': task.id, 'status': status.HTTP_200_OK,
+                              'task': TaskPatchSerializer(updated[task.id]).data}
+            publish_board_event(task.board_id, 'task_updated', results[index]['task'])
+
+        if len(updates) == len(items):
+            response_status = status.HTTP_200_OK
+        elif updates:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response(results, status=response_status)
+
+    def apply_updates(self, updates):
+        """
+        Writes the validated changes of all items.
+
+        Tasks are grouped by the set of fields they change, so `bulk_update`
+        only writes the columns a client actually sent.
+        """
+        by_fields = {}
+        counter_changes = []
+        for _, task, _, validated in updates:
+            old_status, old_priority = task.status, task.priority
+            for field, value in validated.items():
+                setattr(task, field, value)
+            fields = set(validated)
+            if 'status' in fields:
+                task.sync_completed_at()
+                fields.add('completed_at')
+            if fields:
+                by_fields.setdefault(tuple(sorted(fields)), []).append(task)
+            counter_changes.append((task.board_id, old_status, old_priority, task.status, task.priority))
+
+        for fields, tasks in by_fields.items():
+            Task.objects.bulk_update(tasks, fields)
+        counters.tasks_changed(counter_changes)
+        changelog.record_many((task.board_id, 'task', task.id, 'upsert') for _, task, _, _ in updates)
+
+        for relation in self.relations:
+            requested = {task.id: relations[relation] for _, task, relations, _ in updates if relation in relations}
+            if requested:
+                self.replace_relation(relation, requested)
+
+    def replace_relation(self, relation, requested):
+        """
+        Replaces the assignee or reviewer rows of the given tasks.
+        Unknown user IDs are ignored, like in the single task endpoint.
+
+        Args:
+            relation (str): 'assignees' or 'reviewers'.
+            requested (dict): Task ID to list of requested user IDs.
+        """
+        through = getattr(Task, relation).through
+        wanted_ids = {user_id for user_ids in requested.values() for user_id in user_ids}
+        existing = set(User.objects.filter(id__in=wanted_ids).values_list('id', flat=True))
+
+        through.objects.filter(task_id__in=requested.keys()).delete()
+        through.objects.bulk_create([
+            through(task_id=task_id, user_id=user_id)
+            for task_id, user_ids in requested.items()
+            for user_id in dict.fromkeys(user_ids)
+            if user_id in existing
+        ])
+
 class MyTasksReviewsView(APIView):
     """
     API view to retrieve all tasks where the authenticated user is a reviewer.
@@ -234,21 +740,42 @@ class MyTasksReviewsView(APIView):
     """
 
     permission_classes = [IsAuthenticated]
+    read_from_replica = True
 
     def get(self, request):
         """
         Returns a list of tasks where the authenticated user is assigned as a reviewer.
 
         Response:
-            - 200 OK with list of tasks
+            - 200 OK with list of tasks (paginated when `limit` or `cursor` is given,
+              streamed when `stream=true` is given, filtered and ordered by the
+              parameters of `core/api/filters.py`)
+            - 400 Bad Request if a filter or ordering parameter is invalid
+            - 404 Not Found if the cursor is invalid
             - 500 Internal Server Error if an exception occurs
         """
         try:
             user = request.user
-            tasks = Task.objects.filter(reviewers=user).distinct()
-            serializer = TaskAssignedToMeSerializer(tasks, many=True, context={'request': request})
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            tasks = filter_tasks(Task.objects.filter(reviewers=user).distinct(), request.query_params)
+            if 'ordering' in request.query_params and KeysetPagination().is_requested(request):
+                return Response(
+                    {'ordering': 'Cannot be combined with `limit` or `cursor`, pages are ordered by id.'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            if is_stream_requested(request):
+                ordered = tasks if tasks.ordered else tasks.order_by('id')
+                return stream_task_list(ordered.for_listing(), TaskAssignedToMeSerializer, {'request': request})
+
+            page, paginator = paginate_if_requested(request, tasks.for_listing(), self)
+            if paginator is None:
+                return list_response(serialize_tasks(tasks), None)
+            serializer = TaskAssignedToMeSerializer(page, many=True, context={'request': request})
+            return list_response(serializer.data, paginator)
 
+        except ValidationError as e:
+            return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
+        except NotFound as e:
+            return Response({'error': str(e.detail)}, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
             return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         
@@ -261,24 +788,88 @@ class MyTasksAssignedView(APIView):
     """
 
     permission_classes = [IsAuthenticated]
+    read_from_replica = True
 
     def get(self, request):
         """
         Returns a list of tasks where the authenticated user is an assignee.
 
         Response:
-            - 200 OK with list of tasks
+            - 200 OK with list of tasks (paginated when `limit` or `cursor` is given,
+              streamed when `stream=true` is given, filtered and ordered by the
+              parameters of `core/api/filters.py`)
+            - 400 Bad Request if a filter or ordering parameter is invalid
+            - 404 Not Found if the cursor is invalid
             - 500 Internal Server Error if something goes wrong
         """
         try:
             user = request.user
-            tasks = Task.objects.filter(assignees=user).distinct()
-            serializer = TaskAssignedToMeSerializer(tasks, many=True, context={'request': request})
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            tasks = filter_tasks(Task.objects.filter(assignees=user).distinct(), request.query_params)
+            if 'ordering' in request.query_params and KeysetPagination().is_requested(request):
+                return Response(
+                    {'ordering': 'Cannot be combined with `limit` or `cursor`, pages are ordered by id.'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            if is_stream_requested(request):
+                ordered = tasks if tasks.ordered else tasks.order_by('id')
+                return stream_task_list(ordered.for_listing(), TaskAssignedToMeSerializer, {'request': request})
+
+            page, paginator = paginate_if_requested(request, tasks.for_listing(), self)
+            if paginator is None:
+                return list_response(serialize_tasks(tasks), None)
+            serializer = TaskAssignedToMeSerializer(page, many=True, context={'request': request})
+            return list_response(serializer.data, paginator)
 
+        except ValidationError as e:
+            return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
+        except NotFound as e:
+            return Response({'error': str(e.detail)}, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
             return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+class TaskSearchView(APIView):
+    """
+    API view for full-text search over task titles, descriptions and comments.
+
+    Example:
+        GET /api/tasks/search/?q=login bug&board=1&limit=20
+
+    Permissions:
+        - User must be authenticated.
+        - Only tasks of boards the user owns or is a member of are returned.
+    """
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        """
+        Returns matching tasks, best match first (see core/search.py). Every
+        word of `q` has to match, the last one as a prefix. `highlights`
+        holds HTML escaped snippets with the matches wrapped in <mark>.
+
+        Returns:
+            - 200 OK with {"query", "count", "results"}
+            - 400 Bad Request if `q` is missing or `board`/`limit` are invalid
+        """
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({'error': '`q` is required.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            board_id = request.query_params.get('board')
+            board_id = int(board_id) if board_id is not None else None
+            limit = int(request.query_params.get('limit', search.MAX_RESULTS))
+        except ValueError:
+            return Response({'error': '`board` and `limit` must be integers.'}, status=status.HTTP_400_BAD_REQUEST)
+        if not 1 <= limit <= search.MAX_RESULTS:
+            return Response(
+                {'error': f'`limit` must be between 1 and {search.MAX_RESULTS}.'}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        results = search.search_tasks(request.user, query, board_id=board_id, limit=limit)
+        return Response({'query': query, 'count': len(results), 'results': results}, status=status.HTTP_200_OK)
+
+
 class MyTaskDetailsView(APIView):
     """
     API view to handle updating or deleting a specific task
@@ -318,26 +909,36 @@ class MyTaskDetailsView(APIView):
             )
 
         if serializer.is_valid():
-            updated_task = serializer.save()
-            
-            assignee_ids = []
-            if 'assignees' in data:
-                assignee_ids = data.get('assignees', [])
-            elif 'assignee_id' in data:
-                assignee_ids = [data.get('assignee_id')]
-            valid_assignees = User.objects.filter(id__in=assignee_ids)
-            updated_task.assignees.set(valid_assignees)
-
-            reviewer_ids = []
-            if 'reviewers' in data:
-                reviewer_ids = data.get('reviewers', [])
-            elif 'reviewer_id' in data:
-                reviewer_ids = [data.get('reviewer_id')]
-            valid_reviewers = User.objects.filter(id__in=reviewer_ids)
-            updated_task.reviewers.set(valid_reviewers)
-
+            with write_transaction():
+                # Lock the row so the counter delta is based on the committed state
+                previous = Task.objects.select_for_update().values('status', 'priority').get(id=task.id)
+                updated_task = serializer.save()
+
+                assignee_ids = []
+                if 'assignees' in data:
+                    assignee_ids = data.get('assignees', [])
+                elif 'assignee_id' in data:
+                    assignee_ids = [data.get('assignee_id')]
+                valid_assignees = User.objects.filter(id__in=assignee_ids)
+                updated_task.assignees.set(valid_assignees)
+
+                reviewer_ids = []
+                if 'reviewers' in data:
+                    reviewer_ids = data.get('reviewers', [])
+                elif 'reviewer_id' in data:
+                    reviewer_ids = [data.get('reviewer_id')]
+                valid_reviewers = User.objects.filter(id__in=reviewer_ids)
+                updated_task.reviewers.set(valid_reviewers)
+
+                counters.task_changed(
+                    updated_task.board_id,
+                    previous['status'], previous['priority'],
+                    updated_task.status, updated_task.priority
+                )
+                changelog.record(updated_task.board_id, 'task', updated_task.id)
 
             task_data = TaskPatchSerializer(updated_task, context={'request': request}).data
+            publish_board_event(updated_task.board_id, 'task_updated', task_data)
 
             return Response(task_data, status=status.HTTP_200_OK)
 
@@ -357,7 +958,15 @@ class MyTaskDetailsView(APIView):
         if request.user not in task.assignees.all() and request.user not in task.reviewers.all():
             return Response({'detail': 'Access denied'}, status=status.HTTP_403_FORBIDDEN)
 
-        task.delete()
+        with write_transaction():
+            # Lock the row so the counters are decremented for the committed state
+            current = Task.objects.select_for_update().filter(id=task.id).values('status', 'priority').first()
+            # A concurrent request may have deleted the task already
+            if current is not None:
+                Task.objects.filter(id=task.id).delete()
+                counters.task_deleted(task.board_id, current['status'], current['priority'])
+                changelog.record(task.board_id, 'task', task.id, 'delete')
+                publish_board_event(task.board_id, 'task_deleted', {'id': task.id})
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 class CommentView(APIView):
@@ -386,7 +995,7 @@ class CommentView(APIView):
         """
         task = get_object_or_404(Task, id=task_id)
 
-        if request.user != task.board.owner and request.user not in task.board.members.all():
+        if not has_board_access(request, task.board_id):
             return Response({'detail': 'Access denied'}, status=status.HTTP_403_FORBIDDEN)
 
         data = request.data.copy()
@@ -395,7 +1004,11 @@ class CommentView(APIView):
 
         serializer = CommentSerializer(data=data)
         if serializer.is_valid():
-            serializer.save(author=request.user, task=task)
+            with write_transaction():
+                comment = serializer.save(author=request.user, task=task)
+                counters.board_changed(task.board_id)
+                changelog.record(task.board_id, 'comment', comment.id)
+            publish_board_event(task.board_id, 'comment_created', {'task': task.id, 'comment': serializer.data})
             return Response(serializer.data, status=status.HTTP_201_CREATED)
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -408,6 +1021,8 @@ class CommentView(APIView):
             request: The HTTP request object.
             task_id (int): ID of the task whose comments to retrieve.
 
+        Supports opt-in keyset pagination via `?limit=` and `?cursor=`.
+
         Returns:
             HTTP 200 with serialized list of comments,
             HTTP 403 if access is denied,
@@ -415,12 +1030,16 @@ class CommentView(APIView):
         """
         task = get_object_or_404(Task, id=task_id)
 
-        if request.user != task.board.owner and request.user not in task.board.members.all():
+        if not has_board_access(request, task.board_id):
             return Response({'detail': 'Access denied'}, status=status.HTTP_403_FORBIDDEN)
 
-        comments = task.comments.all()
+        comments = task.comments.select_related('author')
+        try:
+            comments, paginator = paginate_if_requested(request, comments, self)
+        except NotFound as e:
+            return Response({'error': str(e.detail)}, status=status.HTTP_404_NOT_FOUND)
         serializer = CommentSerializer(comments, many=True, context={'request': request})
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return list_response(serializer.data, paginator)
 
 class CommentDetailView(APIView):
     """
@@ -448,11 +1067,63 @@ class CommentDetailView(APIView):
             HTTP 403 if access is denied,
             HTTP 404 if comment not found.
         """
-        comments = get_object_or_404(Comment, id=comments_id, task__id=task_id)
+        comments = get_object_or_404(Comment.objects.select_related('task'), id=comments_id, task__id=task_id)
 
-        board = comments.task.board
-        if request.user != board.owner and request.user not in board.members.all():
+        if not has_board_access(request, comments.task.board_id):
             return Response({'detail': 'Access denied'}, status=status.HTTP_403_FORBIDDEN)
 
-        comments.delete()
+        with write_transaction():
+            comments.delete()
+            counters.board_changed(comments.task.board_id)
+            changelog.record(comments.task.board_id, 'comment', comments_id, 'delete')
+            publish_board_event(comments.task.board_id, 'comment_deleted', {'task': task_id, 'id': comments_id})
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ProfileDownloadView(APIView):
+    """
+    API view to download a request profile created by `ProfilingMiddleware`.
+
+    Example:
+        GET /api/profiles/<profile_id>/
+
+    Permissions:
+        - Only staff users can download profiles.
+    """
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, profile_id):
+        """
+        Returns:
+            HTTP 200 with the zip artifact as attachment,
+            HTTP 403 if the user is not staff,
+            HTTP 404 if no profile with this id exists.
+        """
+        path = profiling.artifact_path(profile_id)
+        if path is None:
+            raise Http404('No profile matches the given id.')
+        return FileResponse(path.open('rb'), as_attachment=True, filename=f'profile-{profile_id}.zip')
+
+
+class MetricsView(APIView):
+    """
+    API view exposing the request metrics of all worker processes
+    in the Prometheus text format.
+
+    Example:
+        GET /api/metrics/
+
+    Permissions:
+        - Only staff users can read the metrics.
+    """
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        body = (
+            metrics.render_prometheus()
+            + metrics.render_cache_stats({'token': token_cache.stats(), 'board_detail': detail_cache.stats()})
+            + replicas.render_prometheus()
+        )
+        return HttpResponse(body, content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,156 @@
+"""
+Cold storage of done tasks.
+
+Tasks that have been done for longer than `TASK_ARCHIVE['AFTER_DAYS']` are
+moved, with their assignees, reviewers and comments, from the task tables
+into `ArchivedTask` rows. The board detail, the task lists, the counters
+and the search index then only contain live tasks. Archived tasks can be
+listed per board and restored with their original ids.
+
+Archiving and restoring update the board counters and record the change in
+the board change log, so delta sync clients drop or reload the task.
+"""
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+from core import changelog, counters
+from core.events import publish_board_event
+from core.models import ArchivedTask, Comment, Task
+from core.writes import write_transaction
+
+OPTIONS = {
+    'AFTER_DAYS': 30,
+    'BATCH_SIZE': 500,
+    **getattr(settings, 'TASK_ARCHIVE', {}),
+}
+
+_TASK_COLUMNS = ('id', 'board_id', 'title', 'description', 'priority', 'status', 'due_date', 'completed_at')
+
+
+def archivable(days=None, board_ids=None):
+    """
+    Returns the tasks that have been done for more than `days` days
+    (default `AFTER_DAYS`), found through the partial index on done tasks.
+    """
+    days = OPTIONS['AFTER_DAYS'] if days is None else days
+    tasks = Task.objects.filter(status='done', completed_at__lt=timezone.now() - timedelta(days=days))
+    if board_ids:
+        tasks = tasks.filter(board_id__in=board_ids)
+    return tasks
+
+
+def _user_ids_by_task(relation, task_ids):
+    user_ids = {}
+    rows = (
+        getattr(Task, relation).through.objects
+        .filter(task_id__in=task_ids)
+        .order_by('user_id')
+        .values_list('task_id', 'user_id')
+    )
+    for task_id, user_id in rows:
+        user_ids.setdefault(task_id, []).append(user_id)
+    return user_ids
+
+
+def archive_tasks(task_ids):
+    """
+    Moves the given done tasks into the archive in one transaction.
+    Tasks that no longer exist or are not done are skipped.
+    Returns the number of archived tasks.
+    """
+    with write_transaction():
+        rows = list(Task.objects.filter(id__in=task_ids, status='done').values(*_TASK_COLUMNS))
+        if not rows:
+            return 0
+        ids = [row['id'] for row in rows]
+        assignees = _user_ids_by_task('assignees', ids)
+        reviewers = _user_ids_by_task('reviewers', ids)
+        comments = {}
+        for comment in Comment.objects.filter(task_id__in=ids).order_by('id').values(
+                'id', 'task_id', 'author_id', 'content', 'created_at'):
+            comments.setdefault(comment.pop('task_id'), []).append(
+                {**comment, 'created_at': comment['created_at'].isoformat()}
+            )
+
+        ArchivedTask.objects.bulk_create([
+            ArchivedTask(
+                assignee_ids=assignees.get(row['id'], []),
+                reviewer_ids=reviewers.get(row['id'], []),
+                comments=comments.get(row['id'], []),
+                **row,
+            )
+            for row in rows
+        ])
+        # Comments, assignee and reviewer rows and the search entry cascade
+        Task.objects.filter(id__in=ids).delete()
+        counters.tasks_deleted((row['board_id'], row['status'], row['priority']) for row in rows)
+        changelog.record_many((row['board_id'], 'task', row['id'], 'delete') for row in rows)
+        for row in rows:
+            publish_board_event(row['board_id'], 'task_archived', {'id': row['id']})
+    return len(rows)
+
+
+def archive_old_tasks(days=None, board_ids=None, batch_size=None):
+    """
+    Archives all tasks returned by `archivable`, `batch_size` tasks
+    (default `BATCH_SIZE`) per transaction so writers are never blocked
+    for long. Returns the number of archived tasks.
+    """
+    batch_size = batch_size or OPTIONS['BATCH_SIZE']
+    archived = 0
+    while True:
+        task_ids = list(archivable(days, board_ids).order_by('completed_at').values_list('id', flat=True)[:batch_size])
+        if not task_ids:
+            return archived
+        archived += archive_tasks(task_ids)
+
+
+def restore_task(board_id, task_id):
+    """
+    Moves an archived task back into the board, with its original id,
+    assignees, reviewers and comments. Users that were deleted in the
+    meantime are left out. The task counts as completed now, so it is not
+    archived again right away.
+
+    Returns the restored task, or None if the board has no such archived task.
+    """
+    with write_transaction():
+        archived = ArchivedTask.objects.filter(board_id=board_id, id=task_id).first()
+        if archived is None:
+            return None
+
+        task = Task(
+            id=archived.id, board_id=archived.board_id, title=archived.title, description=archived.description,
+            priority=archived.priority, status=archived.status, due_date=archived.due_date,
+        )
+        task.save(force_insert=True)
+
+        wanted = set(archived.assignee_ids) | set(archived.reviewer_ids)
+        wanted.update(comment['author_id'] for comment in archived.comments)
+        existing = set(User.objects.filter(id__in=wanted).values_list('id', flat=True))
+        for relation, user_ids in (('assignees', archived.assignee_ids), ('reviewers', archived.reviewer_ids)):
+            through = getattr(Task, relation).through
+            through.objects.bulk_create([
+                through(task_id=task.id, user_id=user_id) for user_id in user_ids if user_id in existing
+            ])
+
+        kept = [comment for comment in archived.comments if comment['author_id'] in existing]
+        comments = Comment.objects.bulk_create([
+            Comment(id=comment['id'], task_id=task.id, author_id=comment['author_id'], content=comment['content'])
+            for comment in kept
+        ])
+        # created_at is overwritten on insert (auto_now_add), put the original back
+        for comment, data in zip(comments, kept):
+            comment.created_at = datetime.fromisoformat(data['created_at'])
+        Comment.objects.bulk_update(comments, ['created_at'])
+
+        archived.delete()
+        counters.task_created(task)
+        changelog.record_many(
+            [(task.board_id, 'task', task.id, 'upsert')]
+            + [(task.board_id, 'comment', comment.id, 'upsert') for comment in comments]
+        )
+    return task
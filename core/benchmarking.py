@@ -0,0 +1,152 @@
+"""
+Helpers shared by the benchmark and seed management commands.
+"""
+import random
+from datetime import date, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from core.models import Board, Comment, Task
+
+SEED_PASSWORD = 'benchmark'
+
+
+def percentile(sorted_values, fraction):
+    """
+    Returns the value at the given fraction (0..1) of an already sorted list.
+    """
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * fraction))
+    return sorted_values[index]
+
+
+def create_benchmark_user(username):
+    """
+    Creates a user with an API token for benchmark requests.
+    """
+    user = User.objects.create_user(username=username, email=username)
+    token = Token.objects.create(user=user)
+    return user, token
+
+
+def create_benchmark_board(owner, size, title=None):
+    """
+    Creates a board with `size` tasks, each with the owner as assignee and
+    reviewer and one comment, using bulk inserts. The board counters are
+    rebuilt afterwards.
+    """
+    board = Board.objects.create(title=title or f'Benchmark {size}', owner=owner)
+    board.members.add(owner)
+
+    tasks = [
+        Task(board=board, title=f'Task {index}', description='Benchmark task',
+             status='to-do', priority='medium')
+        for index in range(size)
+    ]
+    for task in tasks:
+        task.sync_completed_at()
+    tasks = Task.objects.bulk_create(tasks)
+    Task.assignees.through.objects.bulk_create(
+        Task.assignees.through(task_id=task.id, user_id=owner.id) for task in tasks
+    )
+    Task.reviewers.through.objects.bulk_create(
+        Task.reviewers.through(task_id=task.id, user_id=owner.id) for task in tasks
+    )
+    Comment.objects.bulk_create(
+        Comment(task=task, author=owner, content='Benchmark comment') for task in tasks
+    )
+    Board.objects.filter(id=board.id).rebuild_counters()
+    return board
+
+
+def seed_dataset(prefix, users, boards, members, tasks, comments, seed=0, batch_size=1000):
+    """
+    Creates a synthetic dataset with bulk inserts and returns the number of
+    created rows per kind.
+
+    Args:
+        prefix (str): Prefix of the generated usernames ("<prefix>-<n>@kanban.local").
+        users (int): Number of users, each with an API token and `SEED_PASSWORD`.
+        boards (int): Number of boards. Board n is owned by user n % users.
+        members (int): Members per board, including the owner.
+        tasks (int): Tasks per board, each with one assignee and one reviewer.
+        comments (int): Comments per task.
+        seed (int): Seed of the random generator, so runs are reproducible.
+        batch_size (int): Rows per INSERT statement.
+
+    Done tasks get a completion time within the last 90 days. Board counters
+    are rebuilt once at the end instead of per row.
+    """
+    rng = random.Random(seed)
+    # Hashing is deliberately slow, so all users share one hash
+    password = make_password(SEED_PASSWORD)
+    created_users = User.objects.bulk_create([
+        User(username=f'{prefix}-{index}@kanban.local', email=f'{prefix}-{index}@kanban.local',
+             first_name=f'{prefix.title()} {index}', password=password)
+        for index in range(users)
+    ], batch_size=batch_size)
+    Token.objects.bulk_create(
+        [Token(user=user, key=Token.generate_key()) for user in created_users], batch_size=batch_size
+    )
+
+    created_boards = Board.objects.bulk_create([
+        Board(title=f'{prefix.title()} board {index}', owner=created_users[index % users])
+        for index in range(boards)
+    ], batch_size=batch_size)
+
+    board_members = {}
+    for board in created_boards:
+        others = [user.id for user in created_users if user.id != board.owner_id]
+        board_members[board.id] = [board.owner_id] + rng.sample(others, min(members - 1, len(others)))
+    Board.members.through.objects.bulk_create([
+        Board.members.through(board_id=board_id, user_id=user_id)
+        for board_id, user_ids in board_members.items()
+        for user_id in user_ids
+    ], batch_size=batch_size)
+
+    now = timezone.now()
+    statuses = [value for value, _ in Task.STATUS_CHOICES]
+    priorities = [value for value, _ in Task.PRIORITY_CHOICES]
+    totals = {
+        'users': users,
+        'boards': boards,
+        'members': sum(len(user_ids) for user_ids in board_members.values()),
+        'tasks': 0,
+        'comments': 0,
+    }
+
+    # Tasks are inserted board by board to keep memory bounded for large volumes
+    for board in created_boards:
+        people = board_members[board.id]
+        board_tasks = [
+            Task(board=board, title=f'Task {index}', description=f'Seeded task {index} of {board.title}',
+                 status=rng.choice(statuses), priority=rng.choice(priorities),
+                 due_date=date.today() + timedelta(days=rng.randint(-30, 60)) if rng.random() < 0.8 else None)
+            for index in range(tasks)
+        ]
+        for task in board_tasks:
+            if task.status == 'done':
+                # Completed over the last 90 days, so part of them is old enough to be archived
+                task.completed_at = now - timedelta(days=rng.randint(0, 90))
+            task.sync_completed_at()
+        board_tasks = Task.objects.bulk_create(board_tasks, batch_size=batch_size)
+        Task.assignees.through.objects.bulk_create([
+            Task.assignees.through(task_id=task.id, user_id=rng.choice(people)) for task in board_tasks
+        ], batch_size=batch_size)
+        Task.reviewers.through.objects.bulk_create([
+            Task.reviewers.through(task_id=task.id, user_id=rng.choice(people)) for task in board_tasks
+        ], batch_size=batch_size)
+        Comment.objects.bulk_create([
+            Comment(task=task, author_id=rng.choice(people), content=f'Seeded comment {index}')
+            for task in board_tasks
+            for index in range(comments)
+        ], batch_size=batch_size)
+        totals['tasks'] += len(board_tasks)
+        totals['comments'] += len(board_tasks) * comments
+
+    Board.objects.filter(id__in=[board.id for board in created_boards]).rebuild_counters()
+    return totals
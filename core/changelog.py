@@ -0,0 +1,112 @@
+"""
+Per-board change log used by the delta sync endpoint.
+
+Write paths record which objects changed (upsert) or were removed (delete)
+in the same transaction as the change. Readers ask for everything after a
+sequence number and get the latest state of each changed object plus
+tombstones for deleted ones.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Exists, Max, OuterRef
+from django.utils import timezone
+
+from core.models import Board, BoardChange
+from core.writes import write_transaction
+
+RETENTION_DAYS = getattr(settings, 'BOARD_CHANGES_RETENTION_DAYS', 7)
+MAX_CHANGES = getattr(settings, 'BOARD_CHANGES_MAX_BATCH', 1000)
+
+
+def record(board_id, entity, entity_id, operation='upsert'):
+    """
+    Records a single change of a board.
+    """
+    BoardChange.objects.create(board_id=board_id, entity=entity, entity_id=entity_id, operation=operation)
+
+
+def record_many(entries):
+    """
+    Records several changes with one bulk INSERT.
+
+    Args:
+        entries: Iterable of (board_id, entity, entity_id, operation) tuples.
+    """
+    BoardChange.objects.bulk_create([
+        BoardChange(board_id=board_id, entity=entity, entity_id=entity_id, operation=operation)
+        for board_id, entity, entity_id, operation in entries
+    ])
+
+
+def latest_sequence(board):
+    """
+    Returns the newest sequence number known for the board.
+    """
+    latest = board.changes.aggregate(latest=Max('id'))['latest'] or 0
+    return max(latest, board.changes_pruned_through)
+
+
+def changes_since(board, since):
+    """
+    Returns the latest change per object after the given sequence number,
+    ordered by sequence number.
+
+    Returns None if the client has to resync, because entries it has not
+    seen were already removed by retention or there are too many changes.
+    """
+    if since < board.changes_pruned_through:
+        return None
+
+    newest_per_object = (
+        board.changes.filter(id__gt=since)
+        .values('entity', 'entity_id')
+        .annotate(seq=Max('id'))
+        .values('seq')
+    )
+    rows = list(
+        BoardChange.objects.filter(id__in=newest_per_object)
+        .order_by('id')
+        .values('id', 'entity', 'entity_id', 'operation')[:MAX_CHANGES + 1]
+    )
+    if len(rows) > MAX_CHANGES:
+        return None
+    return rows
+
+
+def compact(retention_days=RETENTION_DAYS, board_ids=None):
+    """
+    Shrinks the change log.
+
+    1. Removes entries superseded by a newer entry for the same object.
+       Clients always receive the newest entry, so these are never needed.
+    2. Removes entries older than the retention period and remembers the
+       highest removed sequence number per board, so clients that are
+       further behind are told to resync.
+
+    Returns a tuple (superseded, expired) with the number of removed entries.
+    """
+    changes = BoardChange.objects.all()
+    if board_ids is not None:
+        changes = changes.filter(board_id__in=board_ids)
+
+    newer = BoardChange.objects.filter(
+        board=OuterRef('board'),
+        entity=OuterRef('entity'),
+        entity_id=OuterRef('entity_id'),
+        id__gt=OuterRef('id'),
+    )
+    cutoff = timezone.now() - timedelta(days=retention_days)
+
+    with write_transaction():
+        superseded, _ = changes.filter(Exists(newer)).delete()
+
+        expired = changes.filter(created_at__lt=cutoff)
+        watermarks = expired.values('board').annotate(max_seq=Max('id')).values_list('board', 'max_seq')
+        for board_id, max_seq in watermarks:
+            Board.objects.filter(id=board_id, changes_pruned_through__lt=max_seq).update(
+                changes_pruned_through=max_seq
+            )
+        expired_count, _ = expired.delete()
+
+    return superseded, expired_count
@@ -0,0 +1,129 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models import F
+
+from core.api import detail_cache
+from core.models import Board
+
+
+def task_counter_deltas(status, priority, sign=1):
+    """
+    Returns the counter changes caused by adding (sign=1) or
+    removing (sign=-1) a task with the given status and priority.
+    """
+    return {
+        'ticket_count': sign,
+        'tasks_to_do_count': sign if status == 'to-do' else 0,
+        'tasks_high_prio_count': sign if priority == 'high' else 0,
+    }
+
+
+def apply_counter_deltas(board_id, deltas):
+    """
+    Applies counter changes to a board and increases its version
+    with a single UPDATE.
+
+    The new values are computed by the database using F-expressions,
+    so concurrent writers never overwrite each other's increments.
+    """
+    changes = {
+        field: F(field) + delta
+        for field, delta in deltas.items()
+        if delta
+    }
+    Board.objects.filter(id=board_id).update(version=F('version') + 1, **changes)
+    transaction.on_commit(partial(detail_cache.invalidate, board_id))
+
+
+def board_changed(board_id):
+    """
+    Increases the board version after a change that does not affect
+    the counters, e.g. a new comment or a renamed board.
+    """
+    apply_counter_deltas(board_id, {})
+
+
+def task_created(task):
+    """
+    Updates the board counters after a task was created.
+    """
+    apply_counter_deltas(task.board_id, task_counter_deltas(task.status, task.priority))
+
+
+def tasks_created(board_id, tasks):
+    """
+    Updates the board counters after several tasks were created at once,
+    using a single UPDATE for the whole batch.
+    """
+    totals = task_counter_deltas(None, None, sign=0)
+    for task in tasks:
+        for field, delta in task_counter_deltas(task.status, task.priority).items():
+            totals[field] += delta
+    apply_counter_deltas(board_id, totals)
+
+
+def task_deleted(board_id, status, priority):
+    """
+    Updates the board counters after a task was deleted.
+    """
+    apply_counter_deltas(board_id, task_counter_deltas(status, priority, sign=-1))
+
+
+def tasks_deleted(tasks):
+    """
+    Updates the board counters after several tasks were deleted at once.
+
+    Expects an iterable of (board_id, status, priority) tuples and issues
+    one UPDATE per affected board.
+    """
+    per_board = {}
+    for board_id, status, priority in tasks:
+        totals = per_board.setdefault(board_id, task_counter_deltas(None, None, sign=0))
+        for field, delta in task_counter_deltas(status, priority, sign=-1).items():
+            totals[field] += delta
+    for board_id, totals in per_board.items():
+        apply_counter_deltas(board_id, totals)
+
+
+def _change_deltas(old_status, old_priority, new_status, new_priority):
+    """
+    Returns the counter changes caused by changing the status or priority of a task.
+    """
+    removed = task_counter_deltas(old_status, old_priority, sign=-1)
+    added = task_counter_deltas(new_status, new_priority)
+    return {field: removed[field] + added[field] for field in removed}
+
+
+def task_changed(board_id, old_status, old_priority, new_status, new_priority):
+    """
+    Updates the board counters after the status or priority of a task changed.
+    """
+    apply_counter_deltas(board_id, _change_deltas(old_status, old_priority, new_status, new_priority))
+
+
+def tasks_changed(changes):
+    """
+    Updates the board counters after several tasks changed at once.
+
+    Expects an iterable of (board_id, old_status, old_priority, new_status, new_priority)
+    tuples and issues one UPDATE per affected board.
+    """
+    per_board = {}
+    for board_id, *states in changes:
+        totals = per_board.setdefault(board_id, task_counter_deltas(None, None, sign=0))
+        for field, delta in _change_deltas(*states).items():
+            totals[field] += delta
+    for board_id, totals in per_board.items():
+        apply_counter_deltas(board_id, totals)
+
+
+def members_changed(board_id):
+    """
+    Recounts the members of a board after its member set changed.
+
+    The count is computed inside the UPDATE statement itself, so the stored
+    value always matches the membership rows visible to that statement.
+    """
+    Board.objects.filter(id=board_id).rebuild_counters(fields=['member_count'])
+    transaction.on_commit(partial(detail_cache.invalidate, board_id))
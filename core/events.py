@@ -0,0 +1,119 @@
+"""
+Publish/subscribe fan-out of board change events.
+
+Write paths call `publish_board_event`, which hands the event to the
+configured broker once the surrounding transaction has committed. The
+default `InProcessBroker` delivers events to subscribers in the same
+process (e.g. the SSE streams of an ASGI worker). A broker backed by a
+shared service can be configured via `BOARD_EVENTS_BROKER` as long as it
+implements `subscribe`, `unsubscribe` and `publish`.
+"""
+import asyncio
+import itertools
+import threading
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+
+class Subscription:
+    """
+    A single subscriber of one board, wrapping a bounded asyncio queue that
+    belongs to the event loop the subscription was created in.
+    """
+
+    def __init__(self, board_id, max_queue_size):
+        self.board_id = board_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=max_queue_size)
+        self.overflowed = False
+
+    def deliver(self, event):
+        """
+        Adds an event to the queue. Must run inside the subscriber's loop.
+        A subscriber that falls too far behind is flagged as overflowed.
+        """
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self):
+        """
+        Waits for the next event.
+        """
+        return await self.queue.get()
+
+
+class InProcessBroker:
+    """
+    Fans out events to the subscribers of a board within this process.
+    Publishing is thread-safe, so sync views running in worker threads can
+    publish to subscribers waiting in the ASGI event loop.
+    """
+
+    def __init__(self, max_queue_size=1000):
+        self.max_queue_size = max_queue_size
+        self._subscriptions = {}
+        self._lock = threading.Lock()
+        self._sequence = itertools.count(1)
+
+    def subscribe(self, board_id):
+        """
+        Registers a new subscriber for a board. Must be called from a running event loop.
+        """
+        subscription = Subscription(board_id, self.max_queue_size)
+        with self._lock:
+            self._subscriptions.setdefault(board_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """
+        Removes a subscriber, e.g. when its client disconnected.
+        """
+        with self._lock:
+            subscribers = self._subscriptions.get(subscription.board_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscriptions[subscription.board_id]
+
+    def subscriber_count(self, board_id):
+        """
+        Returns the number of open subscriptions of a board.
+        """
+        with self._lock:
+            return len(self._subscriptions.get(board_id, ()))
+
+    def publish(self, board_id, event):
+        """
+        Delivers an event to all current subscribers of the board.
+        """
+        event = dict(event, id=next(self._sequence))
+        with self._lock:
+            subscribers = list(self._subscriptions.get(board_id, ()))
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+            except RuntimeError:
+                # The subscriber's event loop is closed
+                self.unsubscribe(subscription)
+
+
+broker = import_string(getattr(settings, 'BOARD_EVENTS_BROKER', 'core.events.InProcessBroker'))()
+
+
+def publish_board_event(board_id, event_type, data):
+    """
+    Publishes a board event after the current transaction commits,
+    so subscribers never see changes that were rolled back.
+
+    Args:
+        board_id (int): The board the change belongs to.
+        event_type (str): e.g. 'task_created', 'task_updated', 'comment_created'.
+        data (dict): JSON serializable payload.
+    """
+    event = {'type': event_type, 'board': board_id, 'data': data}
+    transaction.on_commit(partial(broker.publish, board_id, event))
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from core import archive
+
+
+class Command(BaseCommand):
+    """
+    Moves tasks that have been done for longer than `--days` days into the
+    archive (see `core/archive.py`), in batches of `--batch-size` tasks.
+    Meant to be run periodically, e.g. nightly from cron.
+
+    Usage:
+        python manage.py archive_tasks
+        python manage.py archive_tasks --days 90 --board 3 --board 7
+        python manage.py archive_tasks --dry-run
+    """
+    help = 'Archives tasks that have been done for longer than the configured number of days.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=archive.OPTIONS['AFTER_DAYS'],
+                            help='Archive tasks done for more than this many days.')
+        parser.add_argument('--board', action='append', type=int, dest='board_ids',
+                            help='ID of a board to archive. Can be passed multiple times. Defaults to all boards.')
+        parser.add_argument('--batch-size', type=int, default=archive.OPTIONS['BATCH_SIZE'],
+                            help='Tasks archived per transaction.')
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many tasks would be archived.')
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            count = archive.archivable(options['days'], options['board_ids']).count()
+            self.stdout.write(f'{count} task(s) would be archived.')
+            return
+
+        archived = archive.archive_old_tasks(options['days'], options['board_ids'], options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Archived {archived} task(s).'))
@@ -0,0 +1,108 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test import AsyncClient, Client, override_settings
+
+from core.api import detail_cache
+from core.benchmarking import create_benchmark_board, create_benchmark_user
+
+READ_PATHS = [
+    'boards/',
+    'boards/{board_id}/',
+    'tasks/assigned-to-me/',
+    'tasks/reviewing/',
+    'tasks/{task_id}/comments/',
+]
+
+
+class Command(BaseCommand):
+    """
+    Compares the concurrent throughput of the read endpoints when served
+    through the WSGI handler (sync views, one thread per concurrent client)
+    and through the ASGI handler (sync views and the native async views).
+
+    The load generator runs in-process: `Client` drives the WSGI handler from
+    a thread pool and `AsyncClient` drives the ASGI handler from an event loop.
+    The benchmark user and board are deleted afterwards.
+
+    Usage:
+        python manage.py benchmark_asgi --requests 500 --concurrency 20
+    """
+    help = 'Benchmarks concurrent read throughput under WSGI and ASGI.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500, help='Requests per scenario.')
+        parser.add_argument('--concurrency', type=int, default=20, help='Concurrent clients.')
+        parser.add_argument('--tasks', type=int, default=100, help='Tasks on the benchmark board.')
+
+    def handle(self, *args, **options):
+        owner, token = create_benchmark_user('benchmark-asgi@kanban.local')
+        try:
+            board = create_benchmark_board(owner, options['tasks'])
+            task_id = board.tasks.values_list('id', flat=True).first()
+            paths = [path.format(board_id=board.id, task_id=task_id) for path in READ_PATHS]
+            headers = {'Authorization': f'Token {token.key}'}
+
+            scenarios = [
+                ('WSGI  sync views', lambda: self.run_wsgi(['/api/' + p for p in paths], headers, options)),
+                ('ASGI  sync views', lambda: asyncio.run(self.run_asgi(['/api/' + p for p in paths], headers, options))),
+                ('ASGI async views', lambda: asyncio.run(self.run_asgi(['/api/async/' + p for p in paths], headers, options))),
+            ]
+
+            self.stdout.write(f'{"scenario":<18} {"req/s":>10} {"errors":>8}')
+            for name, run in scenarios:
+                detail_cache.invalidate(board.id)
+                # The test clients send requests for the host "testserver"
+                with override_settings(ALLOWED_HOSTS=['testserver']):
+                    start = time.perf_counter()
+                    errors = run()
+                    elapsed = time.perf_counter() - start
+                self.stdout.write(f'{name:<18} {options["requests"] / elapsed:>10.1f} {errors:>8}')
+        finally:
+            owner.delete()
+
+    def run_wsgi(self, paths, headers, options):
+        """
+        Sends the requests from a thread pool through the WSGI handler.
+        Returns the number of non-200 responses.
+        """
+        per_worker = self.split(options['requests'], options['concurrency'])
+
+        def worker(count):
+            client = Client()
+            errors = 0
+            for index in range(count):
+                response = client.get(paths[index % len(paths)], headers=headers)
+                errors += response.status_code != 200
+            connections.close_all()
+            return errors
+
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            return sum(pool.map(worker, per_worker))
+
+    async def run_asgi(self, paths, headers, options):
+        """
+        Sends the requests from concurrent coroutines through the ASGI handler.
+        Returns the number of non-200 responses.
+        """
+        client = AsyncClient()
+
+        async def worker(count):
+            errors = 0
+            for index in range(count):
+                response = await client.get(paths[index % len(paths)], headers=headers)
+                errors += response.status_code != 200
+            return errors
+
+        per_worker = self.split(options['requests'], options['concurrency'])
+        return sum(await asyncio.gather(*(worker(count) for count in per_worker)))
+
+    @staticmethod
+    def split(total, parts):
+        """
+        Splits `total` requests as evenly as possible across `parts` workers.
+        """
+        return [total // parts + (1 if index < total % parts else 0) for index in range(parts)]
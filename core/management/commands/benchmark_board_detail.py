@@ -0,0 +1,64 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, reset_queries, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from core.api import detail_cache
+from core.benchmarking import create_benchmark_board, create_benchmark_user, percentile
+
+
+class Command(BaseCommand):
+    """
+    Measures the latency of GET /api/boards/<id>/ as a function of the
+    number of tasks on the board.
+
+    All benchmark data is created inside a transaction that is rolled back
+    at the end, so the command can be run against any database.
+
+    Usage:
+        python manage.py benchmark_board_detail --sizes 10 100 500 --repeat 20
+    """
+    help = 'Benchmarks the board detail endpoint for growing numbers of tasks.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='+', type=int, default=[10, 100, 500, 1000],
+                            help='Task counts to benchmark.')
+        parser.add_argument('--repeat', type=int, default=10,
+                            help='Number of requests per task count.')
+        parser.add_argument('--cached', action='store_true',
+                            help='Serve repeated requests from the board detail cache.')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'{"tasks":>8} {"queries":>8} {"median ms":>10} {"p95 ms":>10}')
+
+        with transaction.atomic():
+            owner, token = create_benchmark_user('benchmark@kanban.local')
+            client = Client(HTTP_HOST='localhost', HTTP_AUTHORIZATION=f'Token {token.key}')
+
+            for size in options['sizes']:
+                board = create_benchmark_board(owner, size)
+                url = f'/api/boards/{board.id}/'
+
+                # The query log is a bounded deque, clear it so the capture below is accurate
+                reset_queries()
+                with CaptureQueriesContext(connection) as queries:
+                    client.get(url)
+
+                timings = []
+                for _ in range(options['repeat']):
+                    if not options['cached']:
+                        detail_cache.invalidate(board.id)
+                    start = time.perf_counter()
+                    client.get(url)
+                    timings.append((time.perf_counter() - start) * 1000)
+
+                timings.sort()
+                self.stdout.write(
+                    f'{size:>8} {len(queries):>8} {statistics.median(timings):>10.2f} '
+                    f'{percentile(timings, 0.95):>10.2f}'
+                )
+
+            transaction.set_rollback(True)
@@ -0,0 +1,270 @@
+import json
+import subprocess
+import time
+from collections import Counter, namedtuple
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, reset_queries, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from core import archive, counters
+from core.api import urls as api_urls
+from core.benchmarking import SEED_PASSWORD, percentile, seed_dataset
+from core.models import Board, Comment, Task
+
+# `build(index)` returns the path and body of the index-th request. It may
+# create the object a request works on; that happens before the clock starts.
+Endpoint = namedtuple('Endpoint', 'name method route expected build')
+
+# Routes that are not request/response endpoints and can not be timed this way
+SKIPPED_ROUTES = {
+    'boards/<int:board_id>/events/': 'Server-Sent Events stream without a response end',
+    'profiles/<str:profile_id>/': 'Staff download of profiling artifacts, not a client endpoint',
+    'metrics/': 'Staff-only Prometheus scrape endpoint, not a client endpoint',
+}
+
+
+class Command(BaseCommand):
+    """
+    End-to-end benchmark of every route in `core/api/urls.py`.
+
+    Seeds a synthetic dataset, then sends `--requests` requests per endpoint
+    through the Django test client (full middleware, authentication and
+    serialization, no network) and reports p50/p95/p99 latency, throughput
+    and SQL queries per request as JSON. Everything runs in a transaction
+    that is rolled back, so the command can be run against any database.
+
+    Save a run with `--output` and pass it as `--baseline` to a later run
+    (e.g. on another commit) to print the differences.
+
+    Usage:
+        python manage.py benchmark_endpoints --requests 100 --output before.json
+        python manage.py benchmark_endpoints --requests 100 --baseline before.json
+    """
+    help = 'Benchmarks all API endpoints and reports latency percentiles and query counts as JSON.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=50, help='Timed requests per endpoint.')
+        parser.add_argument('--users', type=int, default=20, help='Seeded users.')
+        parser.add_argument('--boards', type=int, default=5, help='Seeded boards.')
+        parser.add_argument('--members', type=int, default=5, help='Members per seeded board.')
+        parser.add_argument('--tasks', type=int, default=200, help='Tasks per seeded board.')
+        parser.add_argument('--comments', type=int, default=2, help='Comments per seeded task.')
+        parser.add_argument('--only', nargs='+', help='Only benchmark endpoints whose name starts with one of these.')
+        parser.add_argument('--output', help='Write the JSON report to this file instead of stdout.')
+        parser.add_argument('--baseline', help='JSON report of an earlier run to compare against.')
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1:
+            raise CommandError('At least one request per endpoint is required.')
+        baseline = None
+        if options['baseline']:
+            with open(options['baseline']) as file:
+                baseline = json.load(file)
+
+        dataset = {kind: options[kind] for kind in ('users', 'boards', 'members', 'tasks', 'comments')}
+        with transaction.atomic():
+            seed_dataset('benchmark-e2e', **dataset)
+            endpoints = self.endpoints()
+            uncovered = self.uncovered_routes(endpoints)
+            if options['only']:
+                endpoints = [e for e in endpoints if e.name.startswith(tuple(options['only']))]
+
+            results = {}
+            # The test client sends requests for the host "testserver"
+            with override_settings(ALLOWED_HOSTS=['testserver']):
+                for endpoint in endpoints:
+                    results[endpoint.name] = self.measure(endpoint, options['requests'])
+            transaction.set_rollback(True)
+
+        report = {
+            'commit': self.current_commit(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'dataset': dataset,
+            'requests_per_endpoint': options['requests'],
+            'endpoints': results,
+            'skipped': SKIPPED_ROUTES,
+            'uncovered': uncovered,
+        }
+
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                file.write(output + '\n')
+            self.write_table(results, baseline)
+        else:
+            self.stdout.write(output)
+            if baseline:
+                self.write_table(results, baseline)
+
+    def endpoints(self):
+        """
+        Returns the benchmarked endpoints, acting as the owner of the first seeded board.
+        """
+        board = Board.objects.order_by('id').first()
+        user = board.owner
+        self.client = Client(HTTP_AUTHORIZATION=f'Token {user.auth_token.key}')
+        member_ids = list(board.members.values_list('id', flat=True))
+        task_ids = list(board.tasks.order_by('id').values_list('id', flat=True)[:20])
+        task_id = task_ids[0]
+
+        def new_task():
+            task = Task.objects.create(board=board, title='Benchmark', description='', status='to-do', priority='low')
+            task.assignees.add(user)
+            counters.task_created(task)
+            return task.id
+
+        def new_comment():
+            return Comment.objects.create(task_id=task_id, author=user, content='Benchmark').id
+
+        def new_board():
+            return Board.objects.create(title='Benchmark', owner=user).id
+
+        def archived_task():
+            task = Task.objects.create(board=board, title='Benchmark', description='', status='done', priority='low')
+            counters.task_created(task)
+            archive.archive_tasks([task.id])
+            return task.id
+
+        task_body = {
+            'board': board.id, 'title': 'Benchmark', 'description': '', 'status': 'to-do',
+            'priority': 'medium', 'assignees': [user.id], 'reviewers': [user.id],
+        }
+        statuses = [value for value, _ in Task.STATUS_CHOICES]
+
+        return [
+            Endpoint('auth.registration', 'post', 'registration/', 201, lambda i: ('registration/', {
+                'fullname': 'Benchmark', 'email': f'benchmark-registration-{i}@kanban.local',
+                'password': SEED_PASSWORD, 'repeated_password': SEED_PASSWORD,
+            })),
+            Endpoint('auth.login', 'post', 'login/', 200,
+                     lambda i: ('login/', {'email': user.email, 'password': SEED_PASSWORD})),
+            Endpoint('boards.list', 'get', 'boards/', 200, lambda i: ('boards/', None)),
+            Endpoint('boards.create', 'post', 'boards/', 201,
+                     lambda i: ('boards/', {'title': f'Benchmark {i}', 'members': member_ids})),
+            Endpoint('boards.detail', 'get', 'boards/<int:board_id>/', 200,
+                     lambda i: (f'boards/{board.id}/', None)),
+            Endpoint('boards.update', 'patch', 'boards/<int:board_id>/', 200,
+                     lambda i: (f'boards/{board.id}/', {'title': f'Renamed {i}'})),
+            Endpoint('boards.delete', 'delete', 'boards/<int:board_id>/', 204,
+                     lambda i: (f'boards/{new_board()}/', None)),
+            Endpoint('boards.archive', 'get', 'boards/<int:board_id>/archive/', 200,
+                     lambda i: (f'boards/{board.id}/archive/', None)),
+            Endpoint('boards.archive.restore', 'post', 'boards/<int:board_id>/archive/<int:task_id>/restore/', 200,
+                     lambda i: (f'boards/{board.id}/archive/{archived_task()}/restore/', {})),
+            Endpoint('boards.changes', 'get', 'boards/<int:board_id>/changes/', 200,
+                     lambda i: (f'boards/{board.id}/changes/?since=0', None)),
+            Endpoint('email-check', 'get', 'email-check/', 200,
+                     lambda i: (f'email-check/?email={user.email}', None)),
+            Endpoint('tasks.create', 'post', 'tasks/', 201, lambda i: ('tasks/', task_body)),
+            Endpoint('tasks.bulk', 'post', 'tasks/bulk/', 201,
+                     lambda i: ('tasks/bulk/', {'board': board.id, 'tasks': [task_body] * 20})),
+            Endpoint('tasks.batch', 'patch', 'tasks/batch/', 200, lambda i: ('tasks/batch/', {
+                'tasks': [{'id': pk, 'status': statuses[i % len(statuses)]} for pk in task_ids],
+            })),
+            Endpoint('tasks.search', 'get', 'tasks/search/', 200,
+                     lambda i: ('tasks/search/?q=seeded task', None)),
+            Endpoint('tasks.assigned', 'get', 'tasks/assigned-to-me/', 200,
+                     lambda i: ('tasks/assigned-to-me/', None)),
+            Endpoint('tasks.reviewing', 'get', 'tasks/reviewing/', 200, lambda i: ('tasks/reviewing/', None)),
+            Endpoint('tasks.update', 'patch', 'tasks/<int:task_id>/', 200, lambda i: (f'tasks/{task_id}/', {
+                'title': f'Updated {i}', 'assignees': [user.id], 'reviewers': [user.id],
+            })),
+            Endpoint('tasks.delete', 'delete', 'tasks/<int:task_id>/', 204,
+                     lambda i: (f'tasks/{new_task()}/', None)),
+            Endpoint('comments.list', 'get', 'tasks/<int:task_id>/comments/', 200,
+                     lambda i: (f'tasks/{task_id}/comments/', None)),
+            Endpoint('comments.create', 'post', 'tasks/<int:task_id>/comments/', 201,
+                     lambda i: (f'tasks/{task_id}/comments/', {'content': f'Comment {i}'})),
+            Endpoint('comments.delete', 'delete', 'tasks/<int:task_id>/comments/<int:comments_id>/', 204,
+                     lambda i: (f'tasks/{task_id}/comments/{new_comment()}/', None)),
+            Endpoint('async.boards.list', 'get', 'async/boards/', 200, lambda i: ('async/boards/', None)),
+            Endpoint('async.boards.detail', 'get', 'async/boards/<int:board_id>/', 200,
+                     lambda i: (f'async/boards/{board.id}/', None)),
+            Endpoint('async.tasks.assigned', 'get', 'async/tasks/assigned-to-me/', 200,
+                     lambda i: ('async/tasks/assigned-to-me/', None)),
+            Endpoint('async.tasks.reviewing', 'get', 'async/tasks/reviewing/', 200,
+                     lambda i: ('async/tasks/reviewing/', None)),
+            Endpoint('async.comments.list', 'get', 'async/tasks/<int:task_id>/comments/', 200,
+                     lambda i: (f'async/tasks/{task_id}/comments/', None)),
+        ]
+
+    def measure(self, endpoint, requests):
+        """
+        Sends one warm-up request and `requests` timed requests to the endpoint.
+        """
+        send = getattr(self.client, endpoint.method)
+        self.send(send, *endpoint.build(0))
+
+        timings, queries, statuses = [], [], Counter()
+        for index in range(1, requests + 1):
+            path, body = endpoint.build(index)
+            # The query log is a bounded deque, clear it so the capture below is accurate
+            reset_queries()
+            with CaptureQueriesContext(connection) as captured:
+                start = time.perf_counter()
+                response = self.send(send, path, body)
+                timings.append((time.perf_counter() - start) * 1000)
+            queries.append(len(captured))
+            statuses[response.status_code] += 1
+
+        timings_sorted = sorted(timings)
+        return {
+            'method': endpoint.method.upper(),
+            'route': endpoint.route,
+            'requests': requests,
+            'errors': requests - statuses[endpoint.expected],
+            'status_codes': {str(code): count for code, count in sorted(statuses.items())},
+            'p50_ms': round(percentile(timings_sorted, 0.50), 3),
+            'p95_ms': round(percentile(timings_sorted, 0.95), 3),
+            'p99_ms': round(percentile(timings_sorted, 0.99), 3),
+            'mean_ms': round(sum(timings) / requests, 3),
+            'throughput_rps': round(requests / (sum(timings) / 1000), 1),
+            'queries_avg': round(sum(queries) / requests, 2),
+            'queries_max': max(queries),
+        }
+
+    @staticmethod
+    def send(send, path, body):
+        if body is None:
+            return send('/api/' + path)
+        return send('/api/' + path, body, content_type='application/json')
+
+    @staticmethod
+    def uncovered_routes(endpoints):
+        """
+        Returns the routes of `core/api/urls.py` that no endpoint covers,
+        so new routes do not silently drop out of the benchmark.
+        """
+        covered = {endpoint.route for endpoint in endpoints} | set(SKIPPED_ROUTES)
+        return sorted(str(pattern.pattern) for pattern in api_urls.urlpatterns
+                      if str(pattern.pattern) not in covered)
+
+    @staticmethod
+    def current_commit():
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+                capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def write_table(self, results, baseline):
+        """
+        Prints a human-readable summary, with the baseline values if given.
+        """
+        previous = (baseline or {}).get('endpoints', {})
+        self.stdout.write(f'{"endpoint":<24} {"p50 ms":>9} {"p95 ms":>9} {"p99 ms":>9} {"queries":>8} {"errors":>7}'
+                          + (f' {"base p95":>9} {"base q":>7}' if baseline else ''))
+        for name, result in results.items():
+            line = (f'{name:<24} {result["p50_ms"]:>9.2f} {result["p95_ms"]:>9.2f} {result["p99_ms"]:>9.2f} '
+                    f'{result["queries_avg"]:>8.1f} {result["errors"]:>7}')
+            if baseline:
+                old = previous.get(name)
+                line += f' {old["p95_ms"]:>9.2f} {old["queries_avg"]:>7.1f}' if old else f' {"-":>9} {"-":>7}'
+            self.stdout.write(line)
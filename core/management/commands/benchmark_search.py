@@ -0,0 +1,68 @@
+import statistics
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core import search
+from core.benchmarking import percentile, seed_dataset
+
+DEFAULT_QUERIES = ['4217', 'task 42', 'seeded comment', 'seed']
+
+
+class Command(BaseCommand):
+    """
+    Compares the FTS5 task search (`core.search.search_tasks`) with the
+    naive `icontains` search on a seeded dataset, by default 100k tasks
+    with one comment each, searching as a member of several boards.
+
+    All benchmark data is created inside a transaction that is rolled back
+    at the end, so the command can be run against any SQLite database.
+
+    Usage:
+        python manage.py benchmark_search --tasks 100000 --repeat 10
+        python manage.py benchmark_search --queries "login bug" deploy
+    """
+    help = 'Benchmarks the FTS5 task search against naive icontains filtering.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=100_000, help='Total number of seeded tasks.')
+        parser.add_argument('--boards', type=int, default=20, help='Number of boards the tasks are spread over.')
+        parser.add_argument('--repeat', type=int, default=10, help='Number of runs per query and path.')
+        parser.add_argument('--limit', type=int, default=search.MAX_RESULTS, help='Results per search.')
+        parser.add_argument('--queries', nargs='+', default=DEFAULT_QUERIES, help='Search queries to run.')
+
+    def handle(self, *args, **options):
+        if not search.is_available():
+            raise CommandError('The FTS5 search index requires SQLite.')
+
+        paths = {'icontains': search.naive_search, 'fts5': search.search_tasks}
+
+        with transaction.atomic():
+            start = time.perf_counter()
+            totals = seed_dataset('benchmark-search', users=max(options['boards'], 5), boards=options['boards'],
+                                  members=5, tasks=max(options['tasks'] // options['boards'], 1), comments=1)
+            self.stdout.write(f'Seeded {totals["tasks"]} tasks in {time.perf_counter() - start:.1f}s.')
+            user = User.objects.get(username='benchmark-search-0@kanban.local')
+            self.stdout.write(
+                f'{"query":>16} {"path":>10} {"results":>8} {"median ms":>10} {"p95 ms":>10} {"speedup":>8}'
+            )
+
+            for query in options['queries']:
+                medians = {}
+                for name, run in paths.items():
+                    timings = []
+                    for _ in range(options['repeat']):
+                        start = time.perf_counter()
+                        results = run(user, query, limit=options['limit'])
+                        timings.append((time.perf_counter() - start) * 1000)
+                    timings.sort()
+                    medians[name] = statistics.median(timings)
+                    speedup = medians['icontains'] / medians[name] if medians[name] else 0.0
+                    self.stdout.write(
+                        f'{query[:16]:>16} {name:>10} {len(results):>8} {medians[name]:>10.2f} '
+                        f'{percentile(timings, 0.95):>10.2f} {speedup:>7.1f}x'
+                    )
+
+            transaction.set_rollback(True)
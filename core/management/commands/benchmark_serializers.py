@@ -0,0 +1,63 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from core.api.fast_serializers import serialize_tasks
+from core.api.serializers import TaskSerializer
+from core.benchmarking import create_benchmark_board, create_benchmark_user, percentile
+from core.models import Task
+
+
+class Command(BaseCommand):
+    """
+    Compares `TaskSerializer` on `for_listing()` querysets with the fast
+    `serialize_tasks` path for growing task lists, including the queries
+    and the JSON rendering.
+
+    All benchmark data is created inside a transaction that is rolled back
+    at the end, so the command can be run against any database.
+
+    Usage:
+        python manage.py benchmark_serializers --sizes 100 1000 5000 --repeat 10
+    """
+    help = 'Benchmarks DRF task serialization against the fast serialization path.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='+', type=int, default=[100, 1000, 5000],
+                            help='Task counts to benchmark.')
+        parser.add_argument('--repeat', type=int, default=10,
+                            help='Number of runs per task count and path.')
+
+    def handle(self, *args, **options):
+        renderer = JSONRenderer()
+        paths = {
+            'drf': lambda tasks: renderer.render(TaskSerializer(tasks.for_listing(), many=True).data),
+            'fast': lambda tasks: renderer.render(serialize_tasks(tasks)),
+        }
+        self.stdout.write(f'{"tasks":>8} {"path":>6} {"median ms":>10} {"p95 ms":>10} {"speedup":>8}')
+
+        with transaction.atomic():
+            owner, _ = create_benchmark_user('benchmark@kanban.local')
+
+            for size in options['sizes']:
+                board = create_benchmark_board(owner, size)
+                tasks = Task.objects.filter(board=board)
+                medians = {}
+                for name, render in paths.items():
+                    timings = []
+                    for _ in range(options['repeat']):
+                        start = time.perf_counter()
+                        render(tasks)
+                        timings.append((time.perf_counter() - start) * 1000)
+                    timings.sort()
+                    medians[name] = statistics.median(timings)
+                    speedup = medians['drf'] / medians[name] if medians[name] else 0.0
+                    self.stdout.write(
+                        f'{size:>8} {name:>6} {medians[name]:>10.2f} '
+                        f'{percentile(timings, 0.95):>10.2f} {speedup:>7.1f}x'
+                    )
+
+            transaction.set_rollback(True)
@@ -0,0 +1,124 @@
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections
+from django.db.models import F
+
+from core.benchmarking import percentile
+from core.models import Board, Task
+from core.writes import write_transaction
+
+# Database configurations compared by the benchmark
+PROFILES = {
+    # Django's SQLite defaults: rollback journal, deferred transactions, 5 s timeout
+    'default': {'options': {}, 'serialize': False},
+    # The OPTIONS of DATABASES['default']: WAL, pragmas, IMMEDIATE transactions
+    'tuned': {'options': settings.DATABASES['default'].get('OPTIONS', {}), 'serialize': False},
+    # As above, with write transactions funneled through core.writes
+    'tuned+writer': {'options': settings.DATABASES['default'].get('OPTIONS', {}), 'serialize': True},
+}
+
+
+class Command(BaseCommand):
+    """
+    Measures SQLite write throughput and read latency under concurrent
+    writer and reader threads, for Django's default SQLite configuration
+    and the tuned profile from `kanban/settings.py`.
+
+    Each profile runs against a fresh temporary database file, so the
+    configured database is never touched. Writers run the typical read,
+    insert and counter update sequence of the task endpoints.
+
+    Usage:
+        python manage.py benchmark_writes --writers 8 --readers 4 --duration 5
+    """
+    help = 'Benchmarks concurrent SQLite writes with and without the tuned database profile.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, default=8, help='Number of writer threads.')
+        parser.add_argument('--readers', type=int, default=4, help='Number of reader threads.')
+        parser.add_argument('--duration', type=float, default=5.0, help='Seconds per profile.')
+        parser.add_argument('--profiles', nargs='+', choices=list(PROFILES), default=list(PROFILES),
+                            help='Profiles to benchmark.')
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f'{"profile":>14} {"writes/s":>10} {"errors":>8} {"reads/s":>10} {"read p99 ms":>12}'
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            for name in options['profiles']:
+                result = self.run_profile(name, Path(directory) / f'{name}.sqlite3', options)
+                self.stdout.write(
+                    f'{name:>14} {result["writes"] / options["duration"]:>10.1f} {result["errors"]:>8} '
+                    f'{result["reads"] / options["duration"]:>10.1f} {result["read_p99_ms"]:>12.2f}'
+                )
+
+    def run_profile(self, name, path, options):
+        alias = f'benchmark_{name.replace("+", "_")}'
+        database = {'ENGINE': 'django.db.backends.sqlite3', 'NAME': str(path), 'OPTIONS': dict(PROFILES[name]['options'])}
+        connections.settings[alias] = connections.configure_settings({'default': database})['default']
+        try:
+            call_command('migrate', database=alias, verbosity=0)
+            board = Board.objects.using(alias).create(title='Benchmark', owner_id=self.create_owner(alias))
+            connections[alias].close()
+            return self.run_threads(alias, board.id, PROFILES[name]['serialize'], options)
+        finally:
+            connections[alias].close()
+            del connections.settings[alias]
+
+    @staticmethod
+    def create_owner(alias):
+        return User.objects.db_manager(alias).create_user(username='benchmark@kanban.local').id
+
+    def run_threads(self, alias, board_id, serialize, options):
+        deadline = time.perf_counter() + options['duration']
+        counts = {'writes': 0, 'errors': 0}
+        read_timings = []
+        lock = threading.Lock()
+
+        def writer():
+            writes = errors = 0
+            while time.perf_counter() < deadline:
+                try:
+                    with write_transaction(using=alias, serialize=serialize):
+                        board = Board.objects.using(alias).get(id=board_id)
+                        Task.objects.using(alias).create(
+                            board_id=board.id, title='Task', description='', status='to-do', priority='low'
+                        )
+                        Board.objects.using(alias).filter(id=board.id).update(ticket_count=F('ticket_count') + 1)
+                    writes += 1
+                except OperationalError:
+                    errors += 1
+            connections[alias].close()
+            with lock:
+                counts['writes'] += writes
+                counts['errors'] += errors
+
+        def reader():
+            timings = []
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    Task.objects.using(alias).filter(board_id=board_id).count()
+                except OperationalError:
+                    continue
+                timings.append((time.perf_counter() - start) * 1000)
+            connections[alias].close()
+            with lock:
+                read_timings.extend(timings)
+
+        threads = [threading.Thread(target=writer) for _ in range(options['writers'])]
+        threads += [threading.Thread(target=reader) for _ in range(options['readers'])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        read_timings.sort()
+        return {**counts, 'reads': len(read_timings), 'read_p99_ms': percentile(read_timings, 0.99)}
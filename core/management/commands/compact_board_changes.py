@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from core import changelog
+
+
+class Command(BaseCommand):
+    """
+    Compacts the board change log: removes superseded entries and entries
+    older than the retention period. Meant to run periodically (e.g. cron).
+
+    Usage:
+        python manage.py compact_board_changes
+        python manage.py compact_board_changes --days 3 --board 7
+    """
+    help = 'Removes superseded and expired entries from the board change log.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=changelog.RETENTION_DAYS,
+                            help='Retention period in days.')
+        parser.add_argument('--board', action='append', type=int, dest='board_ids',
+                            help='ID of a board to compact. Can be passed multiple times. Defaults to all boards.')
+
+    def handle(self, *args, **options):
+        superseded, expired = changelog.compact(options['days'], options['board_ids'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Removed {superseded} superseded and {expired} expired change(s).'
+        ))
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from core.models import Board
+
+
+class Command(BaseCommand):
+    """
+    Recomputes the denormalized counter columns of boards
+    (member_count, ticket_count, tasks_to_do_count, tasks_high_prio_count).
+
+    Usage:
+        python manage.py rebuild_board_counters
+        python manage.py rebuild_board_counters --board 3 --board 7
+    """
+    help = 'Rebuilds the stored member and task counters of all or selected boards.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--board',
+            action='append',
+            type=int,
+            dest='board_ids',
+            help='ID of a board to rebuild. Can be passed multiple times. Defaults to all boards.'
+        )
+
+    def handle(self, *args, **options):
+        boards = Board.objects.all()
+        if options['board_ids']:
+            boards = boards.filter(id__in=options['board_ids'])
+
+        updated = boards.rebuild_counters()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt counters for {updated} board(s).'))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core import search
+from core.writes import write_transaction
+
+
+class Command(BaseCommand):
+    """
+    Refills the FTS5 task search index from the task and comment tables.
+
+    The index is kept in sync by database triggers, so this is only needed
+    after changes that bypass them, e.g. restoring tables from a dump or
+    after changing the tokenizer.
+
+    Usage:
+        python manage.py rebuild_search_index
+    """
+    help = 'Rebuilds the full-text search index of tasks and comments.'
+
+    def handle(self, *args, **options):
+        if not search.is_available():
+            raise CommandError('The FTS5 search index requires SQLite.')
+
+        with write_transaction():
+            indexed = search.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Indexed {indexed} task(s).'))
@@ -0,0 +1,60 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core.benchmarking import SEED_PASSWORD, seed_dataset
+
+
+class Command(BaseCommand):
+    """
+    Seeds the database with synthetic users, boards, members, tasks
+    (with assignees and reviewers) and comments using bulk inserts,
+    e.g. to reproduce production volumes locally.
+
+    All seeded users share the password "benchmark" and get an API token.
+    `--clear` removes the users of a previous run with the same prefix,
+    together with their boards, tasks and comments.
+
+    Usage:
+        python manage.py seed_data --users 1000 --boards 200 --members 8 --tasks 500 --comments 3
+        python manage.py seed_data --clear
+    """
+    help = 'Seeds the database with synthetic boards, tasks and comments.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50, help='Number of users.')
+        parser.add_argument('--boards', type=int, default=10, help='Number of boards.')
+        parser.add_argument('--members', type=int, default=5, help='Members per board, including the owner.')
+        parser.add_argument('--tasks', type=int, default=100, help='Tasks per board.')
+        parser.add_argument('--comments', type=int, default=2, help='Comments per task.')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed, for reproducible datasets.')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per INSERT statement.')
+        parser.add_argument('--prefix', default='seed', help='Prefix of the generated usernames.')
+        parser.add_argument('--clear', action='store_true', help='Remove previously seeded data and exit.')
+
+    def handle(self, *args, **options):
+        seeded_users = User.objects.filter(username__startswith=f'{options["prefix"]}-',
+                                           username__endswith='@kanban.local')
+        if options['clear']:
+            deleted, _ = seeded_users.delete()
+            self.stdout.write(self.style.SUCCESS(f'Removed {deleted} seeded row(s).'))
+            return
+
+        if options['users'] < 1:
+            raise CommandError('At least one user is required.')
+        if seeded_users.exists():
+            raise CommandError(f'Seeded data with prefix "{options["prefix"]}" exists already, use --clear first.')
+
+        start = time.perf_counter()
+        with transaction.atomic():
+            totals = seed_dataset(
+                options['prefix'], options['users'], options['boards'], options['members'],
+                options['tasks'], options['comments'], options['seed'], options['batch_size']
+            )
+        elapsed = time.perf_counter() - start
+
+        summary = ', '.join(f'{count} {kind}' for kind, count in totals.items())
+        self.stdout.write(self.style.SUCCESS(f'Seeded {summary} in {elapsed:.1f}s.'))
+        self.stdout.write(f'All seeded users use the password "{SEED_PASSWORD}".')
@@ -0,0 +1,75 @@
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils import timezone
+
+from core import replicas
+from core.models import ReplicationHeartbeat
+
+
+class Command(BaseCommand):
+    """
+    Refreshes the SQLite read replica from the primary database.
+
+    Each run writes a heartbeat to the primary, copies the primary with
+    SQLite's online backup API into a temporary file and atomically replaces
+    the replica file with it. The heartbeat's age on the replica is the
+    replication lag used by `core.replicas`.
+
+    Usage:
+        python manage.py sync_replica              # sync once
+        python manage.py sync_replica --interval 2 # keep syncing every 2 seconds
+    """
+    help = 'Copies the primary SQLite database to the read replica.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=0,
+                            help='Seconds between syncs. Syncs once if not given.')
+
+    def handle(self, *args, **options):
+        alias = replicas.OPTIONS['ALIAS']
+        primary = connections[DEFAULT_DB_ALIAS]
+        if alias not in connections.settings:
+            raise CommandError(f'No database "{alias}" is configured.')
+        if primary.vendor != 'sqlite' or connections[alias].vendor != 'sqlite':
+            raise CommandError('sync_replica only supports SQLite primaries and replicas.')
+        target = self.replica_path(connections[alias].settings_dict['NAME'])
+
+        while True:
+            start = time.perf_counter()
+            self.sync(primary, target)
+            self.stdout.write(f'Replica {target} synced in {(time.perf_counter() - start) * 1000:.1f} ms')
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
+
+    @staticmethod
+    def replica_path(name):
+        """
+        Returns the file path of a database NAME, which may be a `file:` URI.
+        """
+        name = str(name)
+        if name.startswith('file:'):
+            name = name[len('file:'):].split('?', 1)[0]
+        return Path(name)
+
+    @staticmethod
+    def sync(primary, target):
+        ReplicationHeartbeat.objects.using(DEFAULT_DB_ALIAS).update_or_create(
+            id=1, defaults={'updated_at': timezone.now()}
+        )
+
+        primary.ensure_connection()
+        temporary = target.with_name(f'{target.name}.tmp')
+        copy = sqlite3.connect(temporary)
+        try:
+            primary.connection.backup(copy)
+            # Readers open the replica read-only, which needs a rollback journal instead of WAL
+            copy.execute('PRAGMA journal_mode=DELETE')
+        finally:
+            copy.close()
+        os.replace(temporary, target)
@@ -0,0 +1,312 @@
+"""
+In-process request metrics shared between worker processes.
+
+Every process writes its values to its own memory-mapped file in
+`METRICS['DIRECTORY']`. Updates are a dictionary lookup plus an in-place
+write of one double, so recording stays cheap. `render_prometheus` reads
+the files of all processes and sums them, so scraping any worker shows the
+whole server. Files of processes that are no longer running are removed
+when the metrics are collected, so their counts drop out of the totals
+(Prometheus treats this like a counter reset).
+
+Recorded per view class:
+
+    kanban_requests_total{view, method, status}
+    kanban_request_duration_seconds{view, method}   histogram
+    kanban_request_queries{view, method}            histogram
+    kanban_response_size_bytes{view, method}        histogram
+
+`render_cache_stats` adds the hit/miss statistics of the in-process caches.
+Those are kept by each worker in memory, so they describe the worker that
+serves the scrape and carry its `pid` as label.
+"""
+import json
+import mmap
+import os
+import struct
+import threading
+from pathlib import Path
+
+from django.conf import settings
+
+OPTIONS = {
+    'DIRECTORY': Path(settings.BASE_DIR) / 'metrics',
+    **getattr(settings, 'METRICS', {}),
+}
+
+HISTOGRAMS = {
+    'kanban_request_duration_seconds': (
+        'Request latency in seconds.',
+        (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+    ),
+    'kanban_request_queries': (
+        'SQL queries per request.',
+        (1, 2, 5, 10, 20, 50, 100),
+    ),
+    'kanban_response_size_bytes': (
+        'Response body size in bytes.',
+        (256, 1024, 4096, 16384, 65536, 262144, 1048576),
+    ),
+}
+COUNTERS = {
+    'kanban_requests_total': 'Requests by view, method and status code.',
+}
+
+# Cache statistic -> (metric type, metric name, help text)
+CACHE_STATS = {
+    'hits': ('counter', 'kanban_cache_hits_total', 'Cache lookups that found an entry.'),
+    'misses': ('counter', 'kanban_cache_misses_total', 'Cache lookups that found no (current) entry.'),
+    'evictions': ('counter', 'kanban_cache_evictions_total', 'Entries evicted to make room.'),
+    'invalidations': ('counter', 'kanban_cache_invalidations_total', 'Entries removed after a write.'),
+    'size': ('gauge', 'kanban_cache_entries', 'Entries stored in the cache.'),
+    'max_size': ('gauge', 'kanban_cache_max_entries', 'Maximum number of entries.'),
+    'hit_rate': ('gauge', 'kanban_cache_hit_ratio', 'Share of lookups that were hits.'),
+}
+
+_INITIAL_SIZE = 64 * 1024
+_HEADER = struct.Struct('i')
+_VALUE = struct.Struct('d')
+
+
+class MmapStore:
+    """
+    Float values keyed by strings in a memory-mapped file, written by one process.
+
+    Layout: the number of used bytes, followed by entries of key length,
+    key (padded to 8 bytes) and value. The used size is updated after an
+    entry is complete, so concurrent readers never see partial entries.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, 'a+b')
+        if os.fstat(self._file.fileno()).st_size == 0:
+            self._file.truncate(_INITIAL_SIZE)
+        self._capacity = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), self._capacity)
+        self._positions = {}
+        self._used = _HEADER.unpack_from(self._map, 0)[0] or 8
+        for key, value, position in _entries(self._map, self._used):
+            self._positions[key] = position
+
+    def increment(self, key, amount=1.0):
+        with self._lock:
+            position = self._positions.get(key)
+            if position is None:
+                position = self._add(key)
+            value = _VALUE.unpack_from(self._map, position)[0]
+            _VALUE.pack_into(self._map, position, value + amount)
+
+    def _add(self, key):
+        encoded = key.encode()
+        padded = len(encoded) + (-(len(encoded) + _HEADER.size) % 8)
+        size = _HEADER.size + padded + _VALUE.size
+        while self._used + size > self._capacity:
+            self._grow()
+
+        start = self._used
+        _HEADER.pack_into(self._map, start, len(encoded))
+        self._map[start + _HEADER.size:start + _HEADER.size + len(encoded)] = encoded
+        position = start + _HEADER.size + padded
+        _VALUE.pack_into(self._map, position, 0.0)
+        self._used += size
+        _HEADER.pack_into(self._map, 0, self._used)
+        self._positions[key] = position
+        return position
+
+    def _grow(self):
+        self._map.close()
+        self._capacity *= 2
+        self._file.truncate(self._capacity)
+        self._map = mmap.mmap(self._file.fileno(), self._capacity)
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+
+def _entries(data, used):
+    """
+    Yields (key, value, value position) for every entry below `used`.
+    """
+    position = 8
+    while position < used:
+        length = _HEADER.unpack_from(data, position)[0]
+        key = bytes(data[position + _HEADER.size:position + _HEADER.size + length]).decode()
+        value_position = position + _HEADER.size + length + (-(length + _HEADER.size) % 8)
+        yield key, _VALUE.unpack_from(data, value_position)[0], value_position
+        position = value_position + _VALUE.size
+
+
+def read_file(path):
+    """
+    Returns the values stored in one process file.
+    """
+    data = Path(path).read_bytes()
+    if len(data) < 8:
+        return {}
+    used = _HEADER.unpack_from(data, 0)[0]
+    return {key: value for key, value, _ in _entries(data, used)}
+
+
+class Registry:
+    """
+    Records request metrics into the store of the current process. The store
+    is (re)opened lazily, so forked workers get a file of their own.
+    """
+
+    def __init__(self):
+        self._store = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def store(self):
+        pid = os.getpid()
+        if self._pid != pid:
+            with self._lock:
+                if self._pid != pid:
+                    directory = Path(OPTIONS['DIRECTORY'])
+                    directory.mkdir(parents=True, exist_ok=True)
+                    self._store = MmapStore(directory / f'{pid}.db')
+                    self._pid = pid
+        return self._store
+
+    def observe_request(self, view, method, status, seconds, queries, size):
+        store = self.store()
+        store.increment(_key('kanban_requests_total', view=view, method=method, status=str(status)))
+        self._observe(store, 'kanban_request_duration_seconds', seconds, view, method)
+        self._observe(store, 'kanban_request_queries', queries, view, method)
+        if size is not None:
+            self._observe(store, 'kanban_response_size_bytes', size, view, method)
+
+    @staticmethod
+    def _observe(store, name, value, view, method):
+        for bound in HISTOGRAMS[name][1]:
+            if value <= bound:
+                le = str(bound)
+                break
+        else:
+            le = '+Inf'
+        store.increment(_key(f'{name}_bucket', view=view, method=method, le=le))
+        store.increment(_key(f'{name}_sum', view=view, method=method), value)
+        store.increment(_key(f'{name}_count', view=view, method=method))
+
+    def reset(self):
+        """
+        Closes the current store. Used by tests after changing the directory.
+        """
+        with self._lock:
+            if self._store is not None:
+                self._store.close()
+            self._store = self._pid = None
+
+
+registry = Registry()
+
+
+def _key(name, **labels):
+    return json.dumps([name, sorted(labels.items())])
+
+
+def _is_running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Exists, but belongs to another user
+        return True
+    return True
+
+
+def prune():
+    """
+    Removes the files of processes that are no longer running.
+    Returns the number of removed files.
+    """
+    removed = 0
+    for path in Path(OPTIONS['DIRECTORY']).glob('*.db'):
+        if path.stem.isdigit() and not _is_running(int(path.stem)):
+            path.unlink(missing_ok=True)
+            removed += 1
+    return removed
+
+
+def collect():
+    """
+    Returns the values of all running processes' files summed per key.
+    """
+    prune()
+    totals = {}
+    for path in sorted(Path(OPTIONS['DIRECTORY']).glob('*.db')):
+        for key, value in read_file(path).items():
+            totals[key] = totals.get(key, 0.0) + value
+    return totals
+
+
+def _format_labels(labels):
+    escaped = (
+        (name, str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n'))
+        for name, value in labels
+    )
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+
+def _format_value(value):
+    return str(int(value)) if value == int(value) else repr(value)
+
+
+def render_prometheus():
+    """
+    Returns all metrics in the Prometheus text exposition format.
+    Histogram buckets are stored per bucket and made cumulative here.
+    """
+    samples = {}
+    for key, value in collect().items():
+        name, labels = json.loads(key)
+        samples.setdefault(name, []).append((tuple(map(tuple, labels)), value))
+
+    lines = []
+    for name, help_text in COUNTERS.items():
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+        for labels, value in sorted(samples.get(name, [])):
+            lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+
+    for name, (help_text, bounds) in HISTOGRAMS.items():
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+        buckets = {}
+        for labels, value in samples.get(f'{name}_bucket', []):
+            le = dict(labels)['le']
+            series = tuple(label for label in labels if label[0] != 'le')
+            buckets.setdefault(series, {})[le] = value
+        sums = dict(samples.get(f'{name}_sum', []))
+        counts = dict(samples.get(f'{name}_count', []))
+
+        for series in sorted(counts):
+            cumulative = 0.0
+            for le in [str(bound) for bound in bounds] + ['+Inf']:
+                cumulative += buckets.get(series, {}).get(le, 0.0)
+                labels = _format_labels(series + (('le', le),))
+                lines.append(f'{name}_bucket{labels} {_format_value(cumulative)}')
+            lines.append(f'{name}_sum{_format_labels(series)} {_format_value(sums.get(series, 0.0))}')
+            lines.append(f'{name}_count{_format_labels(series)} {_format_value(counts[series])}')
+    return '\n'.join(lines) + '\n'
+
+
+def render_cache_stats(stats_by_cache):
+    """
+    Returns the statistics of the caches in `stats_by_cache` (cache name ->
+    `stats()` dict) in the Prometheus text exposition format, labelled with
+    the cache name and the pid of the current process.
+    """
+    pid = str(os.getpid())
+    lines = []
+    for stat, (metric_type, name, help_text) in CACHE_STATS.items():
+        samples = [(cache, stats[stat]) for cache, stats in stats_by_cache.items() if stat in stats]
+        if not samples:
+            continue
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} {metric_type}']
+        for cache, value in samples:
+            lines.append(f'{name}{_format_labels((("cache", cache), ("pid", pid)))} {_format_value(float(value))}')
+    return '\n'.join(lines) + '\n' if lines else ''
@@ -0,0 +1,330 @@
+"""
+Per-request instrumentation: SQL query count, database time, view time and
+render time, sent as `Server-Timing` header and logged for slow requests.
+"""
+import cProfile
+import json
+import logging
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from rest_framework import exceptions
+
+from auth_app.authentication import CachedTokenAuthentication
+from core import metrics, profiling, replicas
+
+logger = logging.getLogger('core.requests')
+
+OPTIONS = {
+    'SERVER_TIMING_HEADER': True,
+    'SLOW_REQUEST_MS': 500,
+    'SLOW_REQUEST_QUERIES': 50,
+    **getattr(settings, 'REQUEST_TIMING', {}),
+}
+
+
+# Timings of the request being handled. Context variables are copied into the
+# threads `sync_to_async` runs the async ORM in, so queries of async views are
+# attributed to their request as well.
+_current = ContextVar('request_timings', default=None)
+
+
+class RequestTimings:
+    """
+    Collects the measurements of one request. Every executed statement is
+    counted and timed by `record_query`.
+    """
+    __slots__ = ('start', 'view_start', 'view_end', 'render_end', 'queries', 'db_time', 'statements')
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.view_start = self.view_end = self.render_end = None
+        self.queries = 0
+        self.db_time = 0.0
+        # Set to a list to additionally record every statement (see ProfilingMiddleware)
+        self.statements = None
+
+    def rendered(self, response):
+        """
+        Post-render callback of template responses (including DRF responses).
+        Returns None, so the rendered content is kept.
+        """
+        self.render_end = time.perf_counter()
+
+    def as_dict(self):
+        """
+        Returns the measured durations in milliseconds and the query count.
+        """
+        end = time.perf_counter()
+        view_end = self.view_end or end
+        return {
+            'total_ms': round((end - self.start) * 1000, 2),
+            'db_ms': round(self.db_time * 1000, 2),
+            'queries': self.queries,
+            'view_ms': round((view_end - (self.view_start or self.start)) * 1000, 2),
+            'render_ms': round(((self.render_end or view_end) - view_end) * 1000, 2),
+        }
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Database execute wrapper adding the statement to the current request's timings.
+    Outside of a request (management commands, tests) it only passes through.
+    """
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - start
+        timings.db_time += duration
+        timings.queries += 1
+        if timings.statements is not None:
+            # Only the SQL template is kept: the bound parameters hold user
+            # data and credentials, e.g. the token key of the profiled request
+            timings.statements.append({
+                'sql': sql,
+                'many': many,
+                'ms': round(duration * 1000, 3),
+            })
+
+
+def install(connection):
+    """
+    Installs `record_query` on a connection, once.
+    """
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@receiver(connection_created)
+def install_on_connect(sender, connection, **kwargs):
+    install(connection)
+
+
+def server_timing(measurements):
+    """
+    Formats the measurements as `Server-Timing` header value.
+    """
+    return (
+        f'db;dur={measurements["db_ms"]};desc="{measurements["queries"]} queries", '
+        f'view;dur={measurements["view_ms"]}, '
+        f'render;dur={measurements["render_ms"]}, '
+        f'total;dur={measurements["total_ms"]}'
+    )
+
+
+class RequestTimingMiddleware:
+    """
+    Measures every request and adds a `Server-Timing` header, e.g.
+
+        Server-Timing: db;dur=1.8;desc="4 queries", view;dur=6.1, render;dur=0.9, total;dur=7.4
+
+    Requests exceeding `REQUEST_TIMING['SLOW_REQUEST_MS']` or
+    `REQUEST_TIMING['SLOW_REQUEST_QUERIES']` are logged as a JSON line to the
+    `core.requests` logger. Requests to class-based views are recorded in
+    `core.metrics.registry`.
+
+    For streaming responses the body is produced after the middleware returned,
+    so only the work done before the first chunk is measured.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        for connection in connections.all(initialized_only=True):
+            install(connection)
+        timings = request._timings = RequestTimings()
+        token = _current.set(timings)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, timings)
+
+    async def __acall__(self, request):
+        timings = request._timings = RequestTimings()
+        token = _current.set(timings)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, timings)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._timings.view_start = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        timings = request._timings
+        timings.view_end = time.perf_counter()
+        response.add_post_render_callback(timings.rendered)
+        return response
+
+    def finish(self, request, response, timings):
+        measurements = timings.as_dict()
+        if OPTIONS['SERVER_TIMING_HEADER']:
+            response.headers['Server-Timing'] = server_timing(measurements)
+
+        match = request.resolver_match
+        view_class = getattr(match.func, 'view_class', None) if match else None
+        if view_class is not None:
+            metrics.registry.observe_request(
+                view_class.__name__, request.method, response.status_code,
+                measurements['total_ms'] / 1000, measurements['queries'],
+                None if response.streaming else len(response.content),
+            )
+
+        if (measurements['total_ms'] >= OPTIONS['SLOW_REQUEST_MS']
+                or measurements['queries'] >= OPTIONS['SLOW_REQUEST_QUERIES']):
+            logger.warning(json.dumps({
+                'event': 'slow_request',
+                'method': request.method,
+                'path': request.path,
+                'route': match.route if match else None,
+                'status': response.status_code,
+                **measurements,
+            }))
+        return response
+
+
+class ProfilingMiddleware:
+    """
+    Runs a request under cProfile when a staff user asks for it with
+    `X-Profile: 1` or `?profile=1` and stores the result with
+    `core.profiling.save_artifact`. The artifact id is returned in the
+    `X-Profile-Id` header.
+
+    The token is resolved with `CachedTokenAuthentication` only if a profile
+    was requested, so other requests pass through unchanged. Requests of
+    non-staff users or with invalid tokens are handled as usual, without a
+    profile. Must be placed after `RequestTimingMiddleware`, whose timings
+    record the SQL statements.
+
+    For async views only the code running in the event loop is profiled; the
+    ORM calls they make in worker threads show up as SQL statements only.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not self.should_profile(request):
+            return self.get_response(request)
+        profiler = self.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.disable()
+        return self.finish(request, response, profiler)
+
+    async def __acall__(self, request):
+        if not profiling.is_profile_requested(request) or not await sync_to_async(self.should_profile)(request):
+            return await self.get_response(request)
+        profiler = self.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            profiler.disable()
+        return await sync_to_async(self.finish)(request, response, profiler)
+
+    @staticmethod
+    def should_profile(request):
+        """
+        Returns True if a profile was requested with a valid staff token.
+        Statements are recorded from here on, including the token lookup.
+        """
+        if not profiling.is_profile_requested(request):
+            return False
+        request._timings.statements = []
+        try:
+            result = CachedTokenAuthentication().authenticate(request)
+        except exceptions.AuthenticationFailed:
+            return False
+        return result is not None and result[0].is_staff
+
+    @staticmethod
+    def start():
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler
+
+    @staticmethod
+    def finish(request, response, profiler):
+        profile_id = profiling.save_artifact(request, response, profiler, request._timings)
+        response.headers['X-Profile-Id'] = profile_id
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Lets GET and HEAD requests to views with `read_from_replica = True` read
+    from the replica (see `core.replicas`). After a write request of an
+    authenticated user succeeds, that user's reads stick to the primary for
+    `READ_REPLICA['STICKY_SECONDS']`, so they always see their own changes.
+    Failed writes (4xx/5xx) change nothing and do not make reads sticky.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        token = replicas.enable_for(None)
+        try:
+            response = self.get_response(request)
+        finally:
+            replicas.reset(token)
+        self.track_write(request, response)
+        return response
+
+    async def __acall__(self, request):
+        token = replicas.enable_for(None)
+        try:
+            response = await self.get_response(request)
+        finally:
+            replicas.reset(token)
+        self.track_write(request, response)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'view_class', None)
+        if request.method in ('GET', 'HEAD') and getattr(view_class, 'read_from_replica', False):
+            replicas.enable_for(request)
+
+    @staticmethod
+    def track_write(request, response):
+        if request.method in ('GET', 'HEAD', 'OPTIONS') or response.status_code >= 400:
+            return
+        if not replicas.is_configured():
+            return
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            replicas.mark_sticky(response, user)
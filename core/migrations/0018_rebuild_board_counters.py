@@ -0,0 +1,41 @@
+from django.db import migrations
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def rebuild_counters(apps, schema_editor):
+    """
+    Fills the board counter columns from the existing rows, which were not
+    maintained before the counters became the source for board lists.
+    """
+    Board = apps.get_model('core', 'Board')
+    Task = apps.get_model('core', 'Task')
+    db_alias = schema_editor.connection.alias
+
+    def count_per_board(queryset):
+        counts = (
+            queryset.filter(board=OuterRef('pk'))
+            .order_by()
+            .values('board')
+            .annotate(total=Count('pk'))
+            .values('total')
+        )
+        return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+    Board.objects.using(db_alias).update(
+        member_count=count_per_board(Board.members.through.objects.using(db_alias)),
+        ticket_count=count_per_board(Task.objects.using(db_alias)),
+        tasks_to_do_count=count_per_board(Task.objects.using(db_alias).filter(status='to-do')),
+        tasks_high_prio_count=count_per_board(Task.objects.using(db_alias).filter(priority='high')),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_alter_task_assignees_alter_task_reviewers'),
+    ]
+
+    operations = [
+        migrations.RunPython(rebuild_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.4 on 2026-10-16 20:44
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_rebuild_board_counters'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['task', 'created_at'], name='core_comment_task_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['board', 'status'], name='core_task_board_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['board', 'priority'], name='core_task_board_priority_idx'),
+        ),
+        # LoginView and EmailCheckView look users up by email, which
+        # django.contrib.auth does not index.
+        migrations.RunSQL(
+            sql='CREATE INDEX auth_user_email_idx ON auth_user (email);',
+            reverse_sql='DROP INDEX auth_user_email_idx;',
+        ),
+    ]
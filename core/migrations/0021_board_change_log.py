@@ -0,0 +1,33 @@
+# Generated by Django 5.2.4 on 2026-10-16 20:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0020_board_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='board',
+            name='changes_pruned_through',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='BoardChange',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('entity', models.CharField(choices=[('board', 'board'), ('members', 'members'), ('task', 'task'), ('comment', 'comment')], max_length=20)),
+                ('entity_id', models.BigIntegerField()),
+                ('operation', models.CharField(choices=[('upsert', 'upsert'), ('delete', 'delete')], max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='changes', to='core.board')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['board', 'id'], name='core_change_board_seq_idx'), models.Index(fields=['board', 'entity', 'entity_id'], name='core_change_board_entity_idx')],
+            },
+        ),
+    ]
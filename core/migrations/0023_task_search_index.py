@@ -0,0 +1,85 @@
+from django.db import migrations
+
+# FTS5 index over task titles, descriptions and the concatenated comments of
+# each task, keyed by task id. Triggers keep it in sync with every write,
+# including bulk inserts and cascading deletes. SQLite only.
+CREATE_SQL = [
+    """
+    CREATE VIRTUAL TABLE core_task_search USING fts5(
+        title, description, comments, tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER core_task_search_insert AFTER INSERT ON core_task BEGIN
+        INSERT INTO core_task_search (rowid, title, description, comments)
+        VALUES (new.id, new.title, new.description, '');
+    END
+    """,
+    """
+    CREATE TRIGGER core_task_search_update AFTER UPDATE OF title, description ON core_task BEGIN
+        UPDATE core_task_search SET title = new.title, description = new.description WHERE rowid = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER core_task_search_delete AFTER DELETE ON core_task BEGIN
+        DELETE FROM core_task_search WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER core_comment_search_insert AFTER INSERT ON core_comment BEGIN
+        UPDATE core_task_search SET comments = (
+            SELECT coalesce(group_concat(content, ' '), '') FROM core_comment WHERE task_id = new.task_id
+        ) WHERE rowid = new.task_id;
+    END
+    """,
+    """
+    CREATE TRIGGER core_comment_search_update AFTER UPDATE OF content, task_id ON core_comment BEGIN
+        UPDATE core_task_search SET comments = (
+            SELECT coalesce(group_concat(content, ' '), '') FROM core_comment WHERE task_id = core_task_search.rowid
+        ) WHERE rowid IN (old.task_id, new.task_id);
+    END
+    """,
+    """
+    CREATE TRIGGER core_comment_search_delete AFTER DELETE ON core_comment BEGIN
+        UPDATE core_task_search SET comments = (
+            SELECT coalesce(group_concat(content, ' '), '') FROM core_comment WHERE task_id = old.task_id
+        ) WHERE rowid = old.task_id;
+    END
+    """,
+    """
+    INSERT INTO core_task_search (rowid, title, description, comments)
+    SELECT t.id, t.title, t.description,
+           coalesce((SELECT group_concat(c.content, ' ') FROM core_comment c WHERE c.task_id = t.id), '')
+    FROM core_task t
+    """,
+]
+
+DROP_SQL = [
+    'DROP TRIGGER IF EXISTS core_comment_search_delete',
+    'DROP TRIGGER IF EXISTS core_comment_search_update',
+    'DROP TRIGGER IF EXISTS core_comment_search_insert',
+    'DROP TRIGGER IF EXISTS core_task_search_delete',
+    'DROP TRIGGER IF EXISTS core_task_search_update',
+    'DROP TRIGGER IF EXISTS core_task_search_insert',
+    'DROP TABLE IF EXISTS core_task_search',
+]
+
+
+def run(statements):
+    def operation(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0022_replication_heartbeat'),
+    ]
+
+    operations = [
+        migrations.RunPython(run(CREATE_SQL), run(DROP_SQL)),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2026-10-16 22:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0023_task_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['board', 'due_date'], name='core_task_board_due_idx'),
+        ),
+    ]
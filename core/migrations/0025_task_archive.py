@@ -0,0 +1,62 @@
+# Generated by Django 5.2.4 on 2026-10-16 22:53
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def backfill_completed_at(apps, schema_editor):
+    """
+    Marks the existing done tasks as completed now, as the time they were
+    completed was not recorded before. They become archivable after the
+    configured number of days from now on.
+    """
+    Task = apps.get_model('core', 'Task')
+    Task.objects.using(schema_editor.connection.alias).filter(status='done').update(completed_at=timezone.now())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0024_task_board_due_date_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedTask',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=100)),
+                ('description', models.TextField()),
+                ('priority', models.CharField(choices=[('low', 'Low'), ('medium', 'Medium'), ('high', 'High')], max_length=20)),
+                ('status', models.CharField(choices=[('to-do', 'to-do'), ('in-progress', 'in-progress'), ('done', 'done'), ('review', 'review')], max_length=20)),
+                ('due_date', models.DateField(blank=True, null=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('assignee_ids', models.JSONField(default=list)),
+                ('reviewer_ids', models.JSONField(default=list)),
+                ('comments', models.JSONField(default=list)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='completed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_completed_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('status', 'done')), fields=['completed_at'], name='core_task_done_completed_idx'),
+        ),
+        migrations.AddField(
+            model_name='archivedtask',
+            name='board',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_tasks', to='core.board'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedtask',
+            index=models.Index(fields=['board', 'id'], name='core_archived_board_idx'),
+        ),
+    ]
@@ -1,6 +1,62 @@
 from django.db import models
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 from auth_app.models import User
 
+
+def _count_per_board(queryset):
+    """
+    Wraps a queryset grouped by board into a correlated COUNT subquery
+    that can be used as an annotation on Board querysets.
+    """
+    counts = (
+        queryset.filter(board=OuterRef('pk'))
+        .order_by()
+        .values('board')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+class BoardQuerySet(models.QuerySet):
+    """
+    Custom queryset for boards with helpers used by the API views.
+    """
+
+    def for_user(self, user):
+        """
+        Returns boards where the given user is either the owner or a member.
+        """
+        visible_ids = (
+            Board.objects.filter(Q(owner=user) | Q(members=user))
+            .values('id')
+        )
+        return self.filter(id__in=visible_ids)
+
+    def counter_expressions(self):
+        """
+        Returns the SQL expressions computing each denormalized counter column.
+        """
+        return {
+            'member_count': _count_per_board(Board.members.through.objects.all()),
+            'ticket_count': _count_per_board(Task.objects.all()),
+            'tasks_to_do_count': _count_per_board(Task.objects.filter(status='to-do')),
+            'tasks_high_prio_count': _count_per_board(Task.objects.filter(priority='high')),
+        }
+
+    def rebuild_counters(self, fields=None):
+        """
+        Recomputes the stored counter columns of all boards in the queryset
+        with a single bulk UPDATE and returns the number of updated boards.
+        The board versions are increased, as the listed counters may change.
+        """
+        expressions = self.counter_expressions()
+        if fields is not None:
+            expressions = {field: expressions[field] for field in fields}
+        return self.update(version=models.F('version') + 1, **expressions)
+
 # Represents a project board (e.g., for tasks, like in a Kanban board)
 class Board(models.Model):
     """
@@ -16,6 +72,13 @@ class Board(models.Model):
         ticket_count (int): Number of tasks (tickets) on the board.
         tasks_to_do_count (int): Number of tasks with status 'to-do'.
         task_high_priority_count (int): Number of tasks with high priority.
+        version (int): Increases on every change to the board, its members,
+                       tasks or comments. Used for ETags.
+        changes_pruned_through (int): Highest change log sequence number
+                                      removed by retention for this board.
+
+    The counters and the version are denormalized and maintained by
+    `core.counters`; `manage.py rebuild_board_counters` recomputes the counters.
     """
 
     id = models.AutoField(primary_key=True)
@@ -34,6 +97,10 @@ class Board(models.Model):
     ticket_count = models.PositiveIntegerField(default=0)
     tasks_to_do_count = models.PositiveIntegerField(default=0)
     tasks_high_prio_count = models.PositiveIntegerField(default=0)
+    version = models.PositiveBigIntegerField(default=0)
+    changes_pruned_through = models.PositiveBigIntegerField(default=0)
+
+    objects = BoardQuerySet.as_manager()
 
     def __str__(self):
         """
@@ -42,6 +109,25 @@ class Board(models.Model):
         """
         return self.title
 
+class TaskQuerySet(models.QuerySet):
+    """
+    Custom queryset for tasks with helpers used by the API views.
+    """
+
+    def for_listing(self):
+        """
+        Loads everything the task serializers need in a fixed number of queries:
+        the comment count is annotated and assignees/reviewers are prefetched
+        (ordered by id, like `.first()` on the unprefetched relation).
+        """
+        people = User.objects.order_by('id')
+        return self.annotate(
+            annotated_comments_count=Count('comments')
+        ).prefetch_related(
+            models.Prefetch('assignees', queryset=people, to_attr='prefetched_assignees'),
+            models.Prefetch('reviewers', queryset=people, to_attr='prefetched_reviewers'),
+        )
+
 # Represents a task or ticket inside a board
 class Task(models.Model):
     """
@@ -57,6 +143,11 @@ class Task(models.Model):
         due_date (date): Optional due date for the task.
         status (str): Current status of the task 
                       (to-do, in-progress, done, review).
+        completed_at (datetime): When the task was set to done, None otherwise.
+                                 Used by `archive_tasks` to find old done tasks.
+
+    Done tasks can be moved to `ArchivedTask` (see `core.archive`), so the
+    task table and all queries on it only contain live tasks.
     """
 
     PRIORITY_CHOICES = [
@@ -94,6 +185,20 @@ class Task(models.Model):
         choices=STATUS_CHOICES,
         default='to-do'
     )
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    objects = TaskQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Status and priority counters and filters are always scoped to one board
+            models.Index(fields=['board', 'status'], name='core_task_board_status_idx'),
+            models.Index(fields=['board', 'priority'], name='core_task_board_priority_idx'),
+            # Due date range filters and ordering of the board detail endpoint
+            models.Index(fields=['board', 'due_date'], name='core_task_board_due_idx'),
+            # Only done tasks are candidates for archival
+            models.Index(fields=['completed_at'], condition=Q(status='done'), name='core_task_done_completed_idx'),
+        ]
 
     def __str__(self):
         """
@@ -102,6 +207,20 @@ class Task(models.Model):
         """
         return f"{self.title}: {self.description[:50]}"
 
+    def sync_completed_at(self):
+        """
+        Sets `completed_at` when the task is done and clears it otherwise.
+        Called by `save()`; bulk writes have to call it themselves.
+        """
+        if self.status != 'done':
+            self.completed_at = None
+        elif self.completed_at is None:
+            self.completed_at = timezone.now()
+
+    def save(self, *args, **kwargs):
+        self.sync_completed_at()
+        super().save(*args, **kwargs)
+
 class Comment(models.Model):
     """
     Model representing a comment on a task.
@@ -128,8 +247,127 @@ class Comment(models.Model):
     content = models.CharField(max_length=255)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['task', 'created_at'], name='core_comment_task_created_idx'),
+        ]
+
     def __str__(self):
         """
         Returns a readable string representation of the comment.
         """
-        return f"{self.author}: {self.content[:50]}"
\ No newline at end of file
+        return f"{self.author}: {self.content[:50]}"
+
+class ArchivedTask(models.Model):
+    """
+    A done task moved out of the task table by `core.archive`, together
+    with its assignees, reviewers and comments. Restoring it recreates the
+    task with its original id.
+
+    Attributes:
+        id (int): ID of the archived task.
+        board (ForeignKey): The board the task belonged to.
+        title, description, priority, status, due_date, completed_at:
+            Copied from the task.
+        assignee_ids (list): IDs of the assigned users.
+        reviewer_ids (list): IDs of the reviewing users.
+        comments (list): The comments as {"id", "author_id", "content", "created_at"}.
+        archived_at (datetime): When the task was archived.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    board = models.ForeignKey(
+        'Board',
+        on_delete=models.CASCADE,
+        related_name='archived_tasks'
+    )
+    title = models.CharField(max_length=100)
+    description = models.TextField()
+    priority = models.CharField(max_length=20, choices=Task.PRIORITY_CHOICES)
+    status = models.CharField(max_length=20, choices=Task.STATUS_CHOICES)
+    due_date = models.DateField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    assignee_ids = models.JSONField(default=list)
+    reviewer_ids = models.JSONField(default=list)
+    comments = models.JSONField(default=list)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['board', 'id'], name='core_archived_board_idx'),
+        ]
+
+    def __str__(self):
+        """
+        Returns the title of the archived task.
+        """
+        return f"{self.title} (archived)"
+
+class BoardChange(models.Model):
+    """
+    Entry of the per-board change log used for delta synchronisation.
+
+    The primary key is the sequence number clients pass as `since`.
+    Entries are written in the same transaction as the change itself.
+
+    Attributes:
+        id (int): Sequence number of the change.
+        board (ForeignKey): The board that changed.
+        entity (str): Kind of the changed object (board, members, task, comment).
+        entity_id (int): ID of the changed object.
+        operation (str): 'upsert' for created/updated objects, 'delete' for tombstones.
+        created_at (datetime): Timestamp of the change, used for retention.
+    """
+
+    ENTITY_CHOICES = [
+        ('board', 'board'),
+        ('members', 'members'),
+        ('task', 'task'),
+        ('comment', 'comment'),
+    ]
+
+    OPERATION_CHOICES = [
+        ('upsert', 'upsert'),
+        ('delete', 'delete'),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    board = models.ForeignKey(
+        'Board',
+        on_delete=models.CASCADE,
+        related_name='changes'
+    )
+    entity = models.CharField(max_length=20, choices=ENTITY_CHOICES)
+    entity_id = models.BigIntegerField()
+    operation = models.CharField(max_length=10, choices=OPERATION_CHOICES)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['board', 'id'], name='core_change_board_seq_idx'),
+            models.Index(fields=['board', 'entity', 'entity_id'], name='core_change_board_entity_idx'),
+        ]
+
+    def __str__(self):
+        """
+        Returns a readable representation of the change.
+        """
+        return f"#{self.id} {self.operation} {self.entity} {self.entity_id}"
+
+
+class ReplicationHeartbeat(models.Model):
+    """
+    Single row written to the primary database by `sync_replica` right
+    before the replica is refreshed. Its age on the replica is the
+    replication lag (see `core.replicas.replica_lag`).
+
+    Attributes:
+        updated_at (datetime): Time of the last heartbeat on the primary.
+    """
+    updated_at = models.DateTimeField()
+
+    def __str__(self):
+        """
+        Returns the time of the heartbeat.
+        """
+        return self.updated_at.isoformat()
@@ -0,0 +1,86 @@
+"""
+On-demand profiling of single requests for staff users.
+
+A staff token sends `X-Profile: 1` (or `?profile=1`) and the request is run
+under cProfile by `ProfilingMiddleware`. The stats and the SQL statements
+executed are stored as a zip artifact in `PROFILING['DIRECTORY']`:
+
+    stats.prof     raw cProfile data, e.g. for `python -m pstats` or snakeviz
+    stats.txt      the top functions by cumulative time
+    queries.json   every SQL statement with its duration; the statements are
+                   recorded as templates, without their parameter values
+
+The artifact id is returned in the `X-Profile-Id` header and the artifact
+can be downloaded from `GET /api/profiles/<profile_id>/`.
+"""
+import io
+import json
+import marshal
+import pstats
+import re
+import uuid
+import zipfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+from django.conf import settings
+
+_settings = getattr(settings, 'PROFILING', {})
+OPTIONS = {
+    'DIRECTORY': Path(settings.BASE_DIR) / 'profiles',
+    'MAX_ARTIFACTS': 50,
+    'TOP_FUNCTIONS': 50,
+    **_settings,
+}
+
+PROFILE_ID = re.compile(r'^[0-9a-f]{32}$')
+
+
+def is_profile_requested(request):
+    """
+    Returns True if the client asked for a profile of this request.
+    """
+    return request.headers.get('X-Profile') == '1' or request.GET.get('profile') == '1'
+
+
+def artifact_path(profile_id):
+    """
+    Returns the path of a stored artifact, or None for ids that are malformed
+    or unknown.
+    """
+    if not PROFILE_ID.match(profile_id):
+        return None
+    path = Path(OPTIONS['DIRECTORY']) / f'{profile_id}.zip'
+    return path if path.is_file() else None
+
+
+def save_artifact(request, response, profiler, timings):
+    """
+    Writes the profile and the recorded statements of a request to a new zip
+    artifact, removes the oldest artifacts above `MAX_ARTIFACTS` and returns
+    the id of the new one.
+    """
+    profiler.create_stats()
+    text = io.StringIO()
+    pstats.Stats(profiler, stream=text).sort_stats('cumulative').print_stats(OPTIONS['TOP_FUNCTIONS'])
+    queries = {
+        'method': request.method,
+        'path': request.get_full_path(),
+        'status': response.status_code,
+        'created': datetime.now(timezone.utc).isoformat(),
+        **timings.as_dict(),
+        'statements': timings.statements,
+    }
+
+    directory = Path(OPTIONS['DIRECTORY'])
+    directory.mkdir(parents=True, exist_ok=True)
+    profile_id = uuid.uuid4().hex
+    with zipfile.ZipFile(directory / f'{profile_id}.zip', 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('stats.prof', marshal.dumps(profiler.stats))
+        archive.writestr('stats.txt', text.getvalue())
+        archive.writestr('queries.json', json.dumps(queries, indent=2, default=str))
+
+    artifacts = sorted(directory.glob('*.zip'), key=lambda path: path.stat().st_mtime)
+    for path in artifacts[:-OPTIONS['MAX_ARTIFACTS']]:
+        path.unlink(missing_ok=True)
+    return profile_id
@@ -0,0 +1,186 @@
+"""
+Read replica routing with read-your-writes stickiness.
+
+GET requests to views with `read_from_replica = True` read the models of the
+replicated apps from `READ_REPLICA['ALIAS']`; everything else, and every
+write, uses the primary (`default`) database. The views are marked by
+`ReplicaRoutingMiddleware`, which also makes a user's reads stick to the
+primary for `STICKY_SECONDS` after a successful write request of theirs.
+
+The replica is used only while its lag, the age of the `ReplicationHeartbeat`
+row on the replica, is at most `MAX_LAG_SECONDS`. The lag is checked at most
+every `LAG_CHECK_INTERVAL` seconds per process. A replica that is missing,
+unreadable or has no heartbeat counts as lagging, so reads fall back to the
+primary.
+
+Stickiness travels with the client instead of living in a server-side
+store: a successful write response carries a signed, timestamped token with
+the user id in the `STICKY_COOKIE` cookie and the `STICKY_HEADER` header.
+Clients that do not keep cookies can send the header value back. Every
+worker process and host verifies the token with the `SECRET_KEY`, so no
+shared state is needed.
+"""
+import threading
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core import signing
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.utils import timezone
+
+from core.models import ReplicationHeartbeat
+
+OPTIONS = {
+    'ALIAS': 'replica',
+    'APPS': ['core'],
+    'STICKY_SECONDS': 10,
+    'MAX_LAG_SECONDS': 5,
+    'LAG_CHECK_INTERVAL': 2,
+    'STICKY_COOKIE': 'db_sticky',
+    'STICKY_HEADER': 'X-DB-Sticky',
+    **getattr(settings, 'READ_REPLICA', {}),
+}
+
+# The request whose reads may go to the replica, set by ReplicaRoutingMiddleware
+_replica_request = ContextVar('replica_request', default=None)
+
+_signer = signing.TimestampSigner(salt='core.replicas.sticky')
+
+_lag_lock = threading.Lock()
+_lag = {'value': None, 'checked_at': None}
+
+
+def is_configured():
+    """
+    Returns True if a replica separate from the primary is configured.
+    In tests the replica mirrors the primary, so it is never used.
+    """
+    if OPTIONS['ALIAS'] not in settings.DATABASES:
+        return False
+    return connections[OPTIONS['ALIAS']].settings_dict['NAME'] != connections[DEFAULT_DB_ALIAS].settings_dict['NAME']
+
+
+def replica_lag(refresh=False):
+    """
+    Returns the replication lag in seconds, or None if the replica can not
+    be read. The value is cached for `LAG_CHECK_INTERVAL` seconds.
+    """
+    now = time.monotonic()
+    with _lag_lock:
+        checked_at = _lag['checked_at']
+        if not refresh and checked_at is not None and now - checked_at < OPTIONS['LAG_CHECK_INTERVAL']:
+            return _lag['value']
+
+    try:
+        heartbeat = ReplicationHeartbeat.objects.using(OPTIONS['ALIAS']).values_list('updated_at', flat=True).first()
+    except DatabaseError:
+        heartbeat = None
+    lag = max((timezone.now() - heartbeat).total_seconds(), 0.0) if heartbeat is not None else None
+
+    with _lag_lock:
+        _lag.update(value=lag, checked_at=now)
+    return lag
+
+
+def replica_usable():
+    """
+    Returns True if the replica is configured and not lagging too far behind.
+    """
+    if not is_configured():
+        return False
+    lag = replica_lag()
+    return lag is not None and lag <= OPTIONS['MAX_LAG_SECONDS']
+
+
+def mark_sticky(response, user):
+    """
+    Makes the user's reads go to the primary for `STICKY_SECONDS`, by
+    attaching a signed sticky token to the response.
+    """
+    value = _signer.sign(str(user.pk))
+    response.set_cookie(
+        OPTIONS['STICKY_COOKIE'], value, max_age=OPTIONS['STICKY_SECONDS'], httponly=True, samesite='Lax',
+    )
+    response.headers[OPTIONS['STICKY_HEADER']] = value
+
+
+def is_sticky(request, user):
+    """
+    Returns True if the request carries a sticky token of the user that is
+    at most `STICKY_SECONDS` old.
+    """
+    value = request.COOKIES.get(OPTIONS['STICKY_COOKIE']) or request.headers.get(OPTIONS['STICKY_HEADER'])
+    if not value:
+        return False
+    try:
+        return _signer.unsign(value, max_age=OPTIONS['STICKY_SECONDS']) == str(user.pk)
+    except signing.BadSignature:
+        return False
+
+
+def read_alias(request):
+    """
+    Returns the database the given request reads from. The decision is made
+    once the user is authenticated and then kept for the whole request.
+    """
+    alias = getattr(request, '_read_alias', None)
+    if alias is not None:
+        return alias
+
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        return DEFAULT_DB_ALIAS
+    alias = DEFAULT_DB_ALIAS if is_sticky(request, user) or not replica_usable() else OPTIONS['ALIAS']
+    request._read_alias = alias
+    return alias
+
+
+def enable_for(request):
+    """
+    Lets reads of the current request go to the replica. Returns a token
+    for `reset`.
+    """
+    return _replica_request.set(request)
+
+
+def reset(token):
+    _replica_request.reset(token)
+
+
+class ReadReplicaRouter:
+    """
+    Sends reads of the replicated apps to the replica while a request
+    marked by `ReplicaRoutingMiddleware` is handled. All writes and all
+    migrations go to the primary; the replica is a copy of it.
+    """
+
+    def db_for_read(self, model, **hints):
+        request = _replica_request.get()
+        if request is None or model._meta.app_label not in OPTIONS['APPS']:
+            return None
+        return read_alias(request)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != OPTIONS['ALIAS']
+
+
+def render_prometheus():
+    """
+    Returns the replication lag as Prometheus gauge, or an empty string
+    if no replica is configured. An unreadable replica reports NaN.
+    """
+    if not is_configured():
+        return ''
+    lag = replica_lag()
+    return '\n'.join([
+        '# HELP kanban_replica_lag_seconds Age of the newest heartbeat on the read replica.',
+        '# TYPE kanban_replica_lag_seconds gauge',
+        f'kanban_replica_lag_seconds {"NaN" if lag is None else round(lag, 3)}',
+    ]) + '\n'
@@ -0,0 +1,166 @@
+"""
+Full-text search over task titles, descriptions and comments.
+
+On SQLite the `core_task_search` FTS5 table (see migration 0023) holds one
+row per task, kept in sync by triggers on `core_task` and `core_comment`.
+Results are ranked with bm25, weighting title matches above description
+and comment matches, and come with highlighted snippets. Other databases
+fall back to `naive_search`, an unranked `icontains` filter.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.utils.html import escape
+
+from core.models import Board, Comment, Task
+
+SEARCH_TABLE = 'core_task_search'
+MAX_RESULTS = 100
+
+# bm25 weights of the title, description and comments columns
+RANK_WEIGHTS = (10.0, 4.0, 1.0)
+SNIPPET_TOKENS = 12
+
+# Control characters mark matches in snippets; they are replaced by <mark>
+# tags after the text has been HTML escaped.
+_MATCH_START, _MATCH_END = '\x02', '\x03'
+_TERM = re.compile(r'\w+', re.UNICODE)
+
+
+def is_available():
+    """
+    Returns True if the FTS5 index can be used.
+    """
+    return connection.vendor == 'sqlite'
+
+
+def match_expression(query):
+    """
+    Turns user input into an FTS5 query: every word must match, the last
+    one as a prefix, so results appear while the user is typing. Operators
+    and quotes in the input are ignored. Returns None for empty input.
+    """
+    terms = _TERM.findall(query)
+    if not terms:
+        return None
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += '*'
+    return ' '.join(quoted)
+
+
+def _highlight(snippet):
+    return escape(snippet).replace(_MATCH_START, '<mark>').replace(_MATCH_END, '</mark>')
+
+
+def _visible_boards_sql():
+    members = Board.members.through._meta.db_table
+    return (
+        f'SELECT id FROM {Board._meta.db_table} WHERE owner_id = %s '
+        f'UNION SELECT board_id FROM {members} WHERE user_id = %s'
+    )
+
+
+def search_tasks(user, query, board_id=None, limit=MAX_RESULTS):
+    """
+    Returns the tasks of boards the user owns or is a member of that match
+    the query, best match first.
+
+    Each result is a dict with the task's id, board, title, status and
+    priority, its `rank` (lower is better) and `highlights` for title,
+    description and comments, HTML escaped with matches wrapped in <mark>.
+    """
+    if not is_available():
+        return naive_search(user, query, board_id, limit)
+    expression = match_expression(query)
+    if expression is None:
+        return []
+
+    snippets = ', '.join(
+        f"snippet({SEARCH_TABLE}, {column}, '{_MATCH_START}', '{_MATCH_END}', '…', {SNIPPET_TOKENS})"
+        for column in range(3)
+    )
+    weights = ', '.join(str(weight) for weight in RANK_WEIGHTS)
+    sql = (
+        f'SELECT t.id, t.board_id, t.title, t.status, t.priority, {snippets}, '
+        f'bm25({SEARCH_TABLE}, {weights}) AS rank '
+        f'FROM {SEARCH_TABLE} JOIN {Task._meta.db_table} t ON t.id = {SEARCH_TABLE}.rowid '
+        f'WHERE {SEARCH_TABLE} MATCH %s AND t.board_id IN ({_visible_boards_sql()})'
+    )
+    params = [expression, user.id, user.id]
+    if board_id is not None:
+        sql += ' AND t.board_id = %s'
+        params.append(board_id)
+    sql += ' ORDER BY rank LIMIT %s'
+    params.append(limit)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+    return [
+        {
+            'id': task_id,
+            'board': task_board_id,
+            'title': title,
+            'status': task_status,
+            'priority': priority,
+            'rank': round(rank, 4),
+            'highlights': {
+                'title': _highlight(title_snippet),
+                'description': _highlight(description_snippet),
+                'comments': _highlight(comments_snippet),
+            },
+        }
+        for (task_id, task_board_id, title, task_status, priority,
+             title_snippet, description_snippet, comments_snippet, rank) in rows
+    ]
+
+
+def naive_search(user, query, board_id=None, limit=MAX_RESULTS):
+    """
+    Unranked search with `icontains` on every column, requiring every word
+    to appear in the title, description or a comment. Used without FTS5
+    and as the baseline of `benchmark_search`. Highlights are not computed.
+    """
+    terms = _TERM.findall(query)
+    if not terms:
+        return []
+
+    tasks = Task.objects.filter(board__in=Board.objects.for_user(user))
+    if board_id is not None:
+        tasks = tasks.filter(board_id=board_id)
+    for term in terms:
+        commented = Comment.objects.filter(content__icontains=term).values('task_id')
+        tasks = tasks.filter(Q(title__icontains=term) | Q(description__icontains=term) | Q(id__in=commented))
+    rows = tasks.order_by('id').values_list('id', 'board_id', 'title', 'status', 'priority')[:limit]
+    return [
+        {
+            'id': task_id,
+            'board': task_board_id,
+            'title': title,
+            'status': task_status,
+            'priority': priority,
+            'rank': None,
+            'highlights': None,
+        }
+        for task_id, task_board_id, title, task_status, priority in rows
+    ]
+
+
+def rebuild():
+    """
+    Refills the search index from the task and comment tables and merges
+    its segments. Returns the number of indexed tasks.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {SEARCH_TABLE} (rowid, title, description, comments) '
+            f'SELECT t.id, t.title, t.description, '
+            f"coalesce((SELECT group_concat(c.content, ' ') FROM {Comment._meta.db_table} c "
+            f'WHERE c.task_id = t.id), \'\') '
+            f'FROM {Task._meta.db_table} t'
+        )
+        indexed = cursor.rowcount
+        cursor.execute(f"INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}) VALUES ('optimize')")
+    return indexed
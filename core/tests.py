@@ -1,3 +1,1520 @@
-from django.test import TestCase
+import asyncio
+import json
+import os
+import re
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+from contextlib import nullcontext
+from datetime import date, timedelta
+from io import BytesIO, StringIO
+from pathlib import Path
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, connections, reset_queries, router
+from django.http import QueryDict
+from django.test import AsyncClient, AsyncRequestFactory, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, APITestCase, APITransactionTestCase
+
+from auth_app.authentication import token_cache
+from core import archive, events, metrics, replicas, search, writes
+from core.benchmarking import seed_dataset
+from core.api import detail_cache
+from core.api.async_views import BoardEventsView
+from core.api.views import BoardListView, CommentView, MyTasksAssignedView
+from core.api.filters import filter_tasks
+from core.api.fast_serializers import (
+    aserialize_board_detail, aserialize_tasks, serialize_board_detail, serialize_tasks,
+)
+from core.api.serializers import (
+    BoardDetailSerializer, TaskAssignedToMeSerializer, TaskSerializer
+)
+from core.api.permissions import has_board_access
+from core.middleware import ReplicaRoutingMiddleware
+from core.models import ArchivedTask, Board, BoardChange, Comment, ReplicationHeartbeat, Task
+from core.replicas import replica_lag
+from core.writes import write_transaction
+
+
+class AuthenticatedClientMixin:
+    """
+    Creates `self.user` with the token `self.token`, authenticates the test
+    client with it and starts every test with empty caches.
+    """
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        token_cache.clear()
+        self.user = User.objects.create_user(username='owner@test.de', email='owner@test.de', password='pw')
+        self.token = self.authenticate(self.user)
+
+    def authenticate(self, user):
+        """
+        Sends the following requests of the test client with a token of `user`.
+        """
+        token, _ = Token.objects.get_or_create(user=user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        return token
+
+
+class AuthenticatedAPITestCase(AuthenticatedClientMixin, APITestCase):
+    pass
+
+
+class BoardListQueryCountTests(AuthenticatedAPITestCase):
+    """
+    Regression tests making sure the board list does not issue
+    additional queries per board.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.member = User.objects.create_user(username='member@test.de', email='member@test.de', password='pw')
+
+    def create_boards(self, amount):
+        for index in range(amount):
+            board = Board.objects.create(title=f'Board {index}', owner=self.user)
+            board.members.set([self.user, self.member])
+            Task.objects.create(board=board, title='a', description='', status='to-do', priority='high')
+            Task.objects.create(board=board, title='b', description='', status='done', priority='low')
+        Board.objects.rebuild_counters()
+
+    def count_list_queries(self):
+        token_cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/boards/')
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries), response.json()
+
+    def test_query_count_does_not_grow_with_boards(self):
+        self.create_boards(2)
+        few_queries, _ = self.count_list_queries()
+
+        self.create_boards(20)
+        many_queries, data = self.count_list_queries()
+
+        self.assertEqual(len(data), 22)
+        self.assertEqual(few_queries, many_queries)
+
+    def test_counters_match_board_contents(self):
+        self.create_boards(1)
+        _, data = self.count_list_queries()
+
+        self.assertEqual(data[0]['member_count'], 2)
+        self.assertEqual(data[0]['ticket_count'], 2)
+        self.assertEqual(data[0]['tasks_to_do_count'], 1)
+        self.assertEqual(data[0]['tasks_high_prio_count'], 1)
+        self.assertEqual(data[0]['owner_id'], self.user.id)
+
+
+class BoardCounterTests(AuthenticatedAPITestCase):
+    """
+    Tests that the stored board counters follow task and member writes.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.member = User.objects.create_user(username='member@test.de', email='member@test.de', password='pw')
+        response = self.client.post('/api/boards/', {'title': 'Board', 'members': [self.user.id]}, format='json')
+        self.board = Board.objects.get(id=response.json()['id'])
+
+    def assert_counters(self, members, tickets, to_do, high_prio):
+        self.board.refresh_from_db()
+        self.assertEqual(
+            (self.board.member_count, self.board.ticket_count,
+             self.board.tasks_to_do_count, self.board.tasks_high_prio_count),
+            (members, tickets, to_do, high_prio)
+        )
+
+    def create_task(self, **extra):
+        data = {'board': self.board.id, 'title': 'Task', 'description': '',
+                'status': 'to-do', 'priority': 'high', 'assignee_id': self.user.id}
+        data.update(extra)
+        return self.client.post('/api/tasks/', data, format='json').json()
+
+    def test_task_lifecycle_updates_counters(self):
+        task = self.create_task()
+        self.create_task(status='done', priority='low')
+        self.assert_counters(1, 2, 1, 1)
+
+        self.client.patch(f'/api/tasks/{task["id"]}/', {'status': 'review', 'assignee_id': self.user.id}, format='json')
+        self.assert_counters(1, 2, 0, 1)
+
+        self.client.delete(f'/api/tasks/{task["id"]}/')
+        self.assert_counters(1, 1, 0, 0)
+
+    def test_delete_uses_the_committed_state(self):
+        task = self.create_task()
+        stale = Task.objects.get(id=task['id'])
+        self.client.patch(f'/api/tasks/{task["id"]}/', {'status': 'done', 'priority': 'low',
+                                                        'assignee_id': self.user.id}, format='json')
+        self.assert_counters(1, 1, 0, 0)
+
+        # The task was loaded before a concurrent update was committed
+        with mock.patch('core.api.views.get_object_or_404', return_value=stale):
+            response = self.client.delete(f'/api/tasks/{task["id"]}/')
+        self.assertEqual(response.status_code, 204)
+        self.assert_counters(1, 0, 0, 0)
+
+    def test_member_changes_update_counter(self):
+        self.client.patch(f'/api/boards/{self.board.id}/', {'members': [self.user.id, self.member.id]}, format='json')
+        self.assert_counters(2, 0, 0, 0)
+
+    def test_rebuild_command_repairs_drift(self):
+        self.create_task()
+        Board.objects.filter(id=self.board.id).update(ticket_count=42, member_count=0)
+
+        call_command('rebuild_board_counters', board_ids=[self.board.id], stdout=StringIO())
+        self.assert_counters(1, 1, 1, 1)
+
+
+class AdminWriteTests(AuthenticatedAPITestCase):
+    """
+    Tests that admin writes keep the board counters, the version and the
+    change log in step with the API writes.
+    """
+
+    def setUp(self):
+        super().setUp()
+        User.objects.filter(id=self.user.id).update(is_staff=True, is_superuser=True)
+        self.client.force_login(self.user)
+        response = self.client.post('/api/boards/', {'title': 'Board', 'members': [self.user.id]}, format='json')
+        self.board = Board.objects.get(id=response.json()['id'])
+        response = self.client.post('/api/tasks/', {'board': self.board.id, 'title': 'Task', 'description': '',
+                                                    'status': 'to-do', 'priority': 'high',
+                                                    'assignee_id': self.user.id}, format='json')
+        self.task = Task.objects.get(id=response.json()['id'])
+
+    def board_state(self):
+        self.board.refresh_from_db()
+        return (self.board.ticket_count, self.board.tasks_to_do_count, self.board.tasks_high_prio_count)
+
+    def test_task_change_and_delete_update_counters(self):
+        version = Board.objects.get(id=self.board.id).version
+        response = self.client.post(f'/admin/core/task/{self.task.id}/change/', {
+            'board': self.board.id, 'title': 'Task', 'description': 'Edited', 'priority': 'low',
+            'status': 'done', 'due_date': '', 'assignees': [self.user.id], 'reviewers': [self.user.id],
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self.board_state(), (1, 0, 0))
+        self.assertGreater(self.board.version, version)
+        self.assertIsNotNone(Task.objects.get(id=self.task.id).completed_at)
+        self.assertTrue(BoardChange.objects.filter(board=self.board, entity='task', entity_id=self.task.id).exists())
+
+        response = self.client.post(f'/admin/core/task/{self.task.id}/delete/', {'post': 'yes'})
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self.board_state(), (0, 0, 0))
+        self.assertTrue(BoardChange.objects.filter(entity_id=self.task.id, operation='delete').exists())
+
+    def test_board_change_keeps_counters_and_bumps_version(self):
+        version = Board.objects.get(id=self.board.id).version
+        response = self.client.post(f'/admin/core/board/{self.board.id}/change/', {
+            'title': 'Renamed', 'owner': self.user.id, 'members': [self.user.id],
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self.board_state(), (1, 1, 1))
+        self.assertEqual(self.board.title, 'Renamed')
+        self.assertGreater(self.board.version, version)
+
+
+class BoardDetailQueryCountTests(AuthenticatedAPITestCase):
+    """
+    Regression tests making sure the board detail does not issue
+    additional queries per task.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.reviewer = User.objects.create_user(username='reviewer@test.de', email='reviewer@test.de', first_name='Rev')
+        self.board = Board.objects.create(title='Board', owner=self.user)
+        self.board.members.set([self.user, self.reviewer])
+
+    def add_tasks(self, amount):
+        for index in range(amount):
+            task = Task.objects.create(board=self.board, title=f'T{index}', description='', status='to-do', priority='low')
+            task.assignees.set([self.reviewer, self.user])
+            task.reviewers.set([self.reviewer])
+            Comment.objects.create(task=task, author=self.user, content='hi')
+
+    def get_detail(self):
+        # Tasks are added through the ORM here, which does not bump the board version
+        cache.clear()
+        token_cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(f'/api/boards/{self.board.id}/')
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries), response.json()
+
+    def test_query_count_does_not_grow_with_tasks(self):
+        self.add_tasks(2)
+        few_queries, _ = self.get_detail()
+
+        self.add_tasks(15)
+        many_queries, data = self.get_detail()
+
+        self.assertEqual(len(data['tasks']), 17)
+        self.assertEqual(few_queries, many_queries)
+
+    def test_task_payload_shape(self):
+        self.add_tasks(1)
+        _, data = self.get_detail()
+        task = data['tasks'][0]
+
+        self.assertEqual(task['assignee']['id'], self.user.id)
+        self.assertEqual(task['reviewer'], {'id': self.reviewer.id, 'email': 'reviewer@test.de', 'fullname': 'Rev'})
+        self.assertEqual(task['comments_count'], 1)
+        self.assertEqual(len(data['members']), 2)
+
+
+class KeysetPaginationTests(AuthenticatedAPITestCase):
+    """
+    Tests for the opt-in cursor pagination of the list endpoints.
+    """
+
+    def setUp(self):
+        super().setUp()
+        for index in range(5):
+            Board.objects.create(title=f'Board {index}', owner=self.user)
+
+    def test_without_parameters_returns_plain_list(self):
+        response = self.client.get('/api/boards/')
+        self.assertEqual(len(response.json()), 5)
+
+    def test_cursor_walks_all_rows_in_id_order(self):
+        seen = []
+        url = '/api/boards/?limit=2'
+        while url:
+            data = self.client.get(url).json()
+            self.assertLessEqual(len(data['results']), 2)
+            seen.extend(board['id'] for board in data['results'])
+            url = data['next']
+
+        self.assertEqual(seen, sorted(Board.objects.values_list('id', flat=True)))
+
+    def test_invalid_cursor_is_rejected(self):
+        task = Task.objects.create(board=Board.objects.first(), title='T', description='', priority='low')
+        for path in ['/api/boards/', '/api/tasks/assigned-to-me/', f'/api/tasks/{task.id}/comments/']:
+            response = self.client.get(f'{path}?cursor=broken')
+            self.assertEqual(response.status_code, 404, path)
+            self.assertEqual(response.json(), {'error': 'Invalid cursor'}, path)
+
+
+class StreamingResponseTests(AuthenticatedAPITestCase):
+    """
+    Tests that streamed responses contain the same document as the regular ones.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.board = Board.objects.create(title='Board', owner=self.user)
+        self.board.members.set([self.user])
+        for index in range(7):
+            task = Task.objects.create(board=self.board, title=f'T{index}', description='', status='to-do', priority='low')
+            task.assignees.set([self.user])
+            Comment.objects.create(task=task, author=self.user, content='hi')
+
+    def assert_stream_matches(self, url):
+        regular = self.client.get(url)
+        streamed = self.client.get(url, {'stream': 'true'})
+
+        self.assertTrue(streamed.streaming)
+        self.assertEqual(json.loads(b''.join(streamed.streaming_content)), regular.json())
+
+    def test_board_detail_stream(self):
+        self.assert_stream_matches(f'/api/boards/{self.board.id}/')
+
+    def test_assigned_tasks_stream(self):
+        self.assert_stream_matches('/api/tasks/assigned-to-me/')
+
+
+class TaskBulkCreateTests(AuthenticatedAPITestCase):
+    """
+    Tests for the bulk task creation endpoint.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.outsider = User.objects.create_user(username='out@test.de', email='out@test.de', password='pw')
+        self.board = Board.objects.create(title='Board', owner=self.user)
+
+    def test_creates_valid_items_and_reports_invalid_ones(self):
+        tasks = [
+            {'title': 'A', 'status': 'to-do', 'priority': 'high', 'assignee_id': self.user.id},
+            {'title': 'B', 'priority': 'urgent'},
+            {'title': 'C', 'priority': 'low', 'reviewers': [self.outsider.id]},
+            {'title': 'D', 'priority': 'low', 'reviewers': [self.user.id]},
+        ]
+        response = self.client.post('/api/tasks/bulk/', {'board': self.board.id, 'tasks': tasks}, format='json')
+
+        self.assertEqual(response.status_code, 207)
+        results = response.json()
+        self.assertEqual([result['status'] for result in results], [201, 400, 400, 201])
+        self.assertEqual(results[0]['task']['assignee']['id'], self.user.id)
+        self.assertEqual(results[3]['task']['reviewer']['id'], self.user.id)
+        self.assertEqual(results[2]['errors'], {'reviewers': [f'Users {[self.outsider.id]} are not members of this board.']})
+
+        self.board.refresh_from_db()
+        self.assertEqual((self.board.ticket_count, self.board.tasks_to_do_count, self.board.tasks_high_prio_count), (2, 2, 1))
+
+    def test_body_must_be_an_object(self):
+        response = self.client.post('/api/tasks/bulk/', [{'title': 'A', 'priority': 'low'}], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('error', response.json())
+
+    def test_non_members_are_rejected(self):
+        self.authenticate(self.outsider)
+        response = self.client.post('/api/tasks/bulk/', {'board': self.board.id, 'tasks': [{'title': 'A', 'priority': 'low'}]}, format='json')
+        self.assertEqual(response.status_code, 403)
+
+
+class TaskBatchUpdateTests(AuthenticatedAPITestCase):
+    """
+    Tests for the batch task update endpoint.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.other = User.objects.create_user(username='other@test.de', email='other@test.de', password='pw')
+        self.board = Board.objects.create(title='Board', owner=self.user)
+        self.foreign_board = Board.objects.create(title='Foreign', owner=self.other)
+        self.tasks = [
+            Task.objects.create(board=self.board, title=f'T{index}', description='', status='to-do', priority='low')
+            for index in range(3)
+        ]
+        self.tasks[0].reviewers.set([self.user])
+        self.foreign_task = Task.objects.create(board=self.foreign_board, title='F', description='', priority='low')
+        Board.objects.rebuild_counters()
+
+    def test_updates_valid_items_and_reports_errors(self):
+        payload = {'tasks': [
+            {'id': self.tasks[0].id, 'status': 'done'},
+            {'id': self.tasks[1].id, 'priority': 'high', 'assignees': [self.other.id]},
+            {'id': self.tasks[2].id, 'status': 'unknown'},
+            {'id': self.foreign_task.id, 'status': 'done'},
+            {'id': 999999, 'status': 'done'},
+        ]}
+        response = self.client.patch('/api/tasks/batch/', payload, format='json')
+
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual([result['status'] for result in response.json()], [200, 200, 400, 403, 404])
+
+        self.tasks[0].refresh_from_db()
+        self.assertEqual(self.tasks[0].status, 'done')
+        self.assertEqual(list(self.tasks[0].reviewers.all()), [self.user])
+        self.assertEqual(list(self.tasks[1].assignees.all()), [self.other])
+
+        self.board.refresh_from_db()
+        self.assertEqual((self.board.ticket_count, self.board.tasks_to_do_count, self.board.tasks_high_prio_count), (3, 2, 1))
+
+    def test_body_must_be_an_object(self):
+        response = self.client.patch('/api/tasks/batch/', [{'id': self.tasks[0].id, 'status': 'done'}], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('error', response.json())
+
+    def test_malformed_relation_values_are_rejected_per_item(self):
+        payload = {'tasks': [
+            {'id': self.tasks[0].id, 'assignees': 5},
+            {'id': self.tasks[1].id, 'reviewers': 'abc'},
+            {'id': self.tasks[2].id, 'assignee_id': self.other.id, 'priority': 'high'},
+        ]}
+        response = self.client.patch('/api/tasks/batch/', payload, format='json')
+
+        self.assertEqual(response.status_code, 207)
+        results = response.json()
+        self.assertEqual([result['status'] for result in results], [400, 400, 200])
+        self.assertIn('assignees', results[0]['errors'])
+        self.assertIn('reviewers', results[1]['errors'])
+        self.assertEqual(list(self.tasks[0].reviewers.all()), [self.user])
+        self.assertEqual(list(self.tasks[2].assignees.all()), [self.other])
+
+
+@skipUnless(connection.vendor == 'sqlite', 'Query plans are checked against SQLite.')
+class QueryPlanTests(TestCase):
+    """
+    Makes sure the hot queries are answered from an index
+    instead of a full table scan.
+    """
+
+    def assert_no_full_scan(self, queryset):
+        plan = queryset.explain()
+        full_scans = [line for line in plan.splitlines() if re.search(r'\bSCAN \w+$', line.strip())]
+        self.assertFalse(full_scans, f'Full table scan in query plan:\n{plan}')
+
+    def test_task_counters_by_board(self):
+        self.assert_no_full_scan(Task.objects.filter(board_id=1, status='to-do').values('id'))
+        self.assert_no_full_scan(Task.objects.filter(board_id=1, priority='high').values('id'))
+
+    def test_task_filters_within_board(self):
+        params = QueryDict('status=to-do,review&due_after=2026-01-01&due_before=2026-03-31')
+        self.assert_no_full_scan(filter_tasks(Task.objects.filter(board_id=1), params).values('id'))
+        self.assert_no_full_scan(filter_tasks(Task.objects.filter(board_id=1), QueryDict('ordering=due_date')))
+
+    def test_comments_by_task_ordered_by_date(self):
+        self.assert_no_full_scan(Comment.objects.filter(task_id=1).order_by('created_at'))
+
+    def test_user_by_email(self):
+        self.assert_no_full_scan(User.objects.filter(email='someone@test.de'))
+
+
+class BoardAccessTests(AuthenticatedAPITestCase):
+    """
+    Tests for the shared board membership check.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.owner = self.user
+        self.member = User.objects.create_user(username='member@test.de', email='member@test.de', password='pw')
+        self.outsider = User.objects.create_user(username='out@test.de', email='out@test.de', password='pw')
+        self.board = Board.objects.create(title='Board', owner=self.owner)
+        self.board.members.set([self.member])
+        self.task = Task.objects.create(board=self.board, title='T', description='', priority='low')
+
+    def make_request(self, user):
+        request = APIRequestFactory().get('/')
+        request.user = user
+        return request
+
+    def test_owner_and_members_have_access(self):
+        self.assertTrue(has_board_access(self.make_request(self.owner), self.board.id))
+        self.assertTrue(has_board_access(self.make_request(self.member), self.board.id))
+        self.assertFalse(has_board_access(self.make_request(self.outsider), self.board.id))
+
+    def test_result_is_cached_per_request(self):
+        request = self.make_request(self.member)
+        with self.assertNumQueries(1):
+            for _ in range(3):
+                self.assertTrue(has_board_access(request, self.board.id))
+
+    def test_outsider_cannot_read_comments(self):
+        self.authenticate(self.outsider)
+        response = self.client.get(f'/api/tasks/{self.task.id}/comments/')
+        self.assertEqual(response.status_code, 403)
+
+
+class ConditionalGetTests(AuthenticatedAPITestCase):
+    """
+    Tests for the version based ETags of the board endpoints.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.outsider = User.objects.create_user(username='out@test.de', email='out@test.de', password='pw')
+        self.board = Board.objects.create(title='Board', owner=self.user)
+        self.task = Task.objects.create(board=self.board, title='T', description='', priority='low')
+        self.url = f'/api/boards/{self.board.id}/'
+
+    def test_unchanged_board_returns_not_modified(self):
+        etag = self.client.get(self.url)['ETag']
+
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_etag_follows_the_rendered_variant(self):
+        full = self.client.get(self.url)['ETag']
+        self.assertEqual(self.client.get(self.url, {'stream': 'false'})['ETag'], full)
+        self.assertNotEqual(self.client.get(self.url, {'stream': 'true'})['ETag'], full)
+
+    def test_comment_changes_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        self.client.post(f'/api/tasks/{self.task.id}/comments/', {'content': 'hi'}, format='json')
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_board_list_etag(self):
+        etag = self.client.get('/api/boards/')['ETag']
+        self.assertEqual(self.client.get('/api/boards/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.client.patch(self.url, {'title': 'Renamed'}, format='json')
+        self.assertEqual(self.client.get('/api/boards/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_outsider_does_not_get_not_modified(self):
+        etag = self.client.get(self.url)['ETag']
+        self.authenticate(self.outsider)
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 403)
+
+
+class BoardDetailCacheTests(AuthenticatedAPITestCase):
+    """
+    Tests for the versioned cache of serialized board details.
+    """
+
+    def setUp(self):
+        super().setUp()
+        detail_cache.reset_stats()
+        self.board = Board.objects.create(title='Board', owner=self.user)
+        self.url = f'/api/boards/{self.board.id}/'
+
+    def test_second_read_is_served_from_cache(self):
+        self.assertEqual(self.client.get(self.url)['X-Cache'], 'MISS')
+        response = self.client.get(self.url)
+
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(response.json()['title'], 'Board')
+        self.assertEqual(detail_cache.stats()['hits'], 1)
+
+    def test_task_write_invalidates_cache(self):
+        self.client.get(self.url)
+        self.client.post('/api/tasks/', {'board': self.board.id, 'title': 'New', 'description': '',
+                                         'status': 'to-do', 'priority': 'low'}, format='json')
+
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(len(response.json()['tasks']), 1)
+
+
+class AsyncReadEndpointTests(AuthenticatedAPITestCase):
+    """
+    Tests that the native async endpoints return the same data as the sync ones.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.board = Board.objects.create(title='Board', owner=self.user)
+        self.task = Task.objects.create(board=self.board, title='T', description='', priority='low')
+        self.task.assignees.set([self.user])
+        Comment.objects.create(task=self.task, author=self.user, content='hi')
+
+    async def test_async_endpoints_match_sync_endpoints(self):
+        async_client = AsyncClient()
+        headers = {'Authorization': f'Token {self.token.key}'}
+        for path in ['boards/', f'boards/{self.board.id}/', 'tasks/assigned-to-me/',
+                     'tasks/reviewing/', f'tasks/{self.task.id}/comments/']:
+            expected = (await sync_to_async(self.client.get)(f'/api/{path}')).json()
+            response = await async_client.get(f'/api/async/{path}', headers=headers)
+            self.assertEqual(response.status_code, 200, path)
+            self.assertEqual(response.json(), expected, path)
+
+    async def test_missing_token_is_rejected(self):
+        response = await AsyncClient().get('/api/async/boards/')
+        self.assertEqual(response.status_code, 401)
+
+    async def test_async_board_list_pagination_and_etag(self):
+        await Board.objects.acreate(title='Second', owner=self.user)
+        async_client = AsyncClient()
+        headers = {'Authorization': f'Token {self.token.key}'}
+
+        expected = (await sync_to_async(self.client.get)('/api/boards/?limit=1')).json()
+        response = await async_client.get('/api/async/boards/?limit=1', headers=headers)
+        page = response.json()
+        self.assertEqual(page['results'], expected['results'])
+        self.assertIsNone(page['previous'])
+        second = await async_client.get(page['next'].replace('http://testserver', ''), headers=headers)
+        self.assertEqual([board['title'] for board in second.json()['results']], ['Second'])
+        self.assertIsNone(second.json()['next'])
+
+        response = await async_client.get('/api/async/boards/', headers=headers)
+        etag = response['ETag']
+        cached = await async_client.get('/api/async/boards/', headers={**headers, 'If-None-Match': etag})
+        self.assertEqual(cached.status_code, 304)
+        await Board.objects.filter(title='Second').aupdate(version=5)
+        changed = await async_client.get('/api/async/boards/', headers={**headers, 'If-None-Match': etag})
+        self.assertEqual(changed.status_code, 200)
+
+        invalid = await async_client.get('/api/async/boards/?cursor=invalid', headers=headers)
+        self.assertEqual(invalid.status_code, 404)
+
+    async def test_async_task_and_comment_lists_paginate_and_stream(self):
+        second = await Task.objects.acreate(board=self.board, title='T2', description='', priority='high')
+        await second.assignees.aset([self.user])
+        await second.reviewers.aset([self.user])
+        await Comment.objects.acreate(task=self.task, author=self.user, content='again')
+        async_client = AsyncClient()
+        headers = {'Authorization': f'Token {self.token.key}'}
+
+        for path in ['tasks/assigned-to-me/', 'tasks/reviewing/', f'tasks/{self.task.id}/comments/']:
+            expected = (await sync_to_async(self.client.get)(f'/api/{path}?limit=1')).json()
+            page = (await async_client.get(f'/api/async/{path}?limit=1', headers=headers)).json()
+            self.assertEqual(page['results'], expected['results'], path)
+            self.assertEqual(page['next'] is None, expected['next'] is None, path)
+            if page['next']:
+                following = await async_client.get(page['next'].replace('http://testserver', ''), headers=headers)
+                expected = (await sync_to_async(self.client.get)(expected['next'])).json()
+                self.assertEqual(following.json()['results'], expected['results'], path)
+
+            invalid = await async_client.get(f'/api/async/{path}?cursor=invalid', headers=headers)
+            self.assertEqual(invalid.status_code, 404, path)
+            self.assertEqual(invalid.json(), {'error': 'Invalid cursor'}, path)
+
+        for path in ['tasks/assigned-to-me/', 'tasks/reviewing/']:
+            expected = (await sync_to_async(self.client.get)(f'/api/{path}')).json()
+            response = await async_client.get(f'/api/async/{path}?stream=true', headers=headers)
+            content = b''.join([chunk async for chunk in response.streaming_content])
+            self.assertEqual(json.loads(content), expected, path)
+
+            combined = await async_client.get(f'/api/async/{path}?limit=1&ordering=title', headers=headers)
+            self.assertEqual(combined.status_code, 400, path)
+
+
+class BoardEventsTests(AuthenticatedAPITestCase):
+    """
+    Tests for the board change events and their SSE stream.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.board = Board.objects.create(title='Board', owner=self.user)
+        self.task = Task.objects.create(board=self.board, title='T', description='', priority='low')
+
+    def test_comment_publishes_event_after_commit(self):
+        with mock.patch.object(events.broker, 'publish') as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(f'/api/tasks/{self.task.id}/comments/', {'content': 'hi'}, format='json')
+
+        board_id, event = publish.call_args.args
+        self.assertEqual(board_id, self.board.id)
+        self.assertEqual(event['type'], 'comment_created')
+        self.assertEqual(event['data']['comment']['content'], 'hi')
+
+    async def test_stream_delivers_published_events(self):
+        request = AsyncRequestFactory().get(
+            f'/api/boards/{self.board.id}/events/', headers={'Authorization': f'Token {self.token.key}'}
+        )
+        response = await BoardEventsView.as_view()(request, board_id=self.board.id)
+        frames = []
+
+        async def consume():
+            async for frame in response:
+                frames.append(frame)
+
+        async def wait_for_frames(count):
+            while len(frames) < count:
+                await asyncio.sleep(0.01)
+
+        # Cancelling the consumer mirrors what the ASGI handler does on disconnect
+        consumer = asyncio.ensure_future(consume())
+        try:
+            await asyncio.wait_for(wait_for_frames(1), timeout=5)
+            self.assertEqual(frames[0], b'retry: 3000\n\n')
+
+            await sync_to_async(events.broker.publish)(
+                self.board.id, {'type': 'task_deleted', 'board': self.board.id, 'data': {'id': 5}}
+            )
+            await asyncio.wait_for(wait_for_frames(2), timeout=5)
+            self.assertIn(b'event: task_deleted\n', frames[1])
+            self.assertIn(b'data: {"id":5}', frames[1])
+        finally:
+            consumer.cancel()
+            await asyncio.gather(consumer, return_exceptions=True)
+        self.assertEqual(events.broker.subscriber_count(self.board.id), 0)
+
+
+class BoardChangesTests(AuthenticatedAPITestCase):
+    """
+    Tests for the change log and the delta sync endpoint.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.board = Board.objects.create(title='Board', owner=self.user)
+        self.url = f'/api/boards/{self.board.id}/changes/'
+
+    def create_task(self, title):
+        response = self.client.post('/api/tasks/', {
+            'board': self.board.id, 'title': title, 'description': '',
+            'status': 'to-do', 'priority': 'low', 'assignees': [self.user.id], 'reviewers': [],
+        }, format='json')
+        return response.data['id']
+
+    def test_changes_are_coalesced_per_object(self):
+        first = self.create_task('A')
+        second = self.create_task('B')
+        since = self.client.get(self.url).data['latest']
+
+        self.client.patch(f'/api/tasks/{first}/', {'title': 'A1'}, format='json')
+        self.client.patch(f'/api/tasks/{first}/', {'title': 'A2'}, format='json')
+        self.client.delete(f'/api/tasks/{second}/')
+
+        data = self.client.get(self.url, {'since': since}).data
+        self.assertFalse(data['resync'])
+        self.assertEqual([(c['id'], c['op']) for c in data['changes']], [(first, 'upsert'), (second, 'delete')])
+        self.assertEqual(data['changes'][0]['data']['title'], 'A2')
+        self.assertNotIn('data', data['changes'][1])
+        self.assertEqual(data['latest'], data['changes'][-1]['seq'])
+
+        self.assertEqual(self.client.get(self.url, {'since': data['latest']}).data['changes'], [])
+
+    def test_comments_of_deleted_task_become_tombstones(self):
+        task_id = self.create_task('A')
+        comment_id = self.client.post(f'/api/tasks/{task_id}/comments/', {'content': 'hi'}, format='json').data['id']
+        self.assertEqual(self.client.get(self.url).data['changes'][-1]['data']['task'], task_id)
+
+        self.client.delete(f'/api/tasks/{task_id}/')
+        changes = self.client.get(self.url).data['changes']
+        self.assertIn({'seq': changes[0]['seq'], 'entity': 'comment', 'id': comment_id, 'op': 'delete'}, changes)
+
+    def test_compaction_forces_resync_for_old_cursors(self):
+        task_id = self.create_task('A')
+        self.client.patch(f'/api/tasks/{task_id}/', {'title': 'A1'}, format='json')
+        self.assertEqual(self.board.changes.count(), 2)
+
+        out = StringIO()
+        call_command('compact_board_changes', stdout=out)
+        self.assertIn('Removed 1 superseded and 0 expired', out.getvalue())
+
+        call_command('compact_board_changes', '--days', '-1', stdout=StringIO())
+        self.assertFalse(self.board.changes.exists())
+        self.board.refresh_from_db()
+        self.assertGreater(self.board.changes_pruned_through, 0)
+
+        self.assertTrue(self.client.get(self.url, {'since': 0}).data['resync'])
+        current = self.client.get(self.url, {'since': self.board.changes_pruned_through}).data
+        self.assertFalse(current['resync'])
+        self.assertEqual(current['latest'], self.board.changes_pruned_through)
+
+    def test_invalid_since_and_foreign_board(self):
+        self.assertEqual(self.client.get(self.url, {'since': 'x'}).status_code, 400)
+        other = User.objects.create_user(username='other@test.de', email='other@test.de', password='pw')
+        board = Board.objects.create(title='Other', owner=other)
+        self.assertEqual(self.client.get(f'/api/boards/{board.id}/changes/').status_code, 403)
+
+
+class SeedAndBenchmarkCommandTests(TestCase):
+    """
+    Tests for the synthetic data generator and the endpoint benchmark runner.
+    """
+
+    def test_seed_data_creates_requested_volumes(self):
+        call_command('seed_data', '--users', '6', '--boards', '3', '--members', '4',
+                     '--tasks', '5', '--comments', '2', stdout=StringIO())
+
+        boards = Board.objects.filter(title__startswith='Seed board')
+        self.assertEqual(boards.count(), 3)
+        self.assertEqual(Task.objects.filter(board__in=boards).count(), 15)
+        self.assertEqual(Comment.objects.filter(task__board__in=boards).count(), 30)
+        for board in boards:
+            self.assertEqual(board.members.count(), 4)
+            self.assertIn(board.owner_id, board.members.values_list('id', flat=True))
+            self.assertEqual(board.ticket_count, 5)
+
+        call_command('seed_data', '--clear', stdout=StringIO())
+        self.assertFalse(Board.objects.filter(title__startswith='Seed board').exists())
+
+    def test_benchmark_reports_every_route(self):
+        out = StringIO()
+        call_command('benchmark_endpoints', '--requests', '2', '--users', '3', '--boards', '1',
+                     '--tasks', '3', '--only', 'boards', 'tasks', 'comments', 'email', 'async', stdout=out)
+        report = json.loads(out.getvalue())
+
+        self.assertEqual(report['uncovered'], [])
+        self.assertIn('boards.detail', report['endpoints'])
+        for name, result in report['endpoints'].items():
+            self.assertEqual(result['errors'], 0, name)
+            self.assertLessEqual(result['p50_ms'], result['p99_ms'])
+        self.assertFalse(Board.objects.exists())
+
+
+class RequestTimingMiddlewareTests(AuthenticatedAPITestCase):
+    """
+    Tests for the Server-Timing instrumentation and the slow request log.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.board = Board.objects.create(title='Board', owner=self.user)
+
+    def timing(self, response):
+        return dict(re.findall(r'(\w+);dur=([\d.]+)', response['Server-Timing'])), response['Server-Timing']
+
+    def test_server_timing_counts_queries(self):
+        reset_queries()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f'/api/boards/{self.board.id}/')
+
+        durations, header = self.timing(response)
+        self.assertIn(f'desc="{len(queries)} queries"', header)
+        self.assertEqual(set(durations), {'db', 'view', 'render', 'total'})
+        self.assertGreaterEqual(float(durations['total']), float(durations['view']))
+
+    async def test_async_views_are_measured(self):
+        response = await AsyncClient().get(
+            f'/api/async/boards/{self.board.id}/', headers={'Authorization': f'Token {self.token.key}'}
+        )
+        self.assertRegex(response['Server-Timing'], r'desc="[1-9]\d* queries"')
+
+    def test_slow_requests_are_logged(self):
+        with mock.patch.dict('core.middleware.OPTIONS', SLOW_REQUEST_QUERIES=1):
+            with self.assertLogs('core.requests', level='WARNING') as logs:
+                self.client.get('/api/boards/')
+
+        entry = json.loads(logs.records[0].getMessage())
+        self.assertEqual(entry['event'], 'slow_request')
+        self.assertEqual(entry['route'], 'api/boards/')
+        self.assertGreaterEqual(entry['queries'], 1)
+
+
+class ProfilingMiddlewareTests(APITestCase):
+    """
+    Tests for the on-demand profiling of staff requests.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        patcher = mock.patch.dict('core.profiling.OPTIONS', DIRECTORY=self.directory.name, MAX_ARTIFACTS=2)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.staff = User.objects.create_user(username='staff@test.de', email='staff@test.de', password='pw', is_staff=True)
+        self.user = User.objects.create_user(username='user@test.de', email='user@test.de', password='pw')
+        self.staff_token = Token.objects.create(user=self.staff)
+        self.user_token = Token.objects.create(user=self.user)
+        self.board = Board.objects.create(title='Board', owner=self.staff)
+        token_cache.clear()
+
+    def test_staff_request_is_profiled_and_downloadable(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.staff_token.key}')
+        response = self.client.get(f'/api/boards/{self.board.id}/', HTTP_X_PROFILE='1')
+        self.assertEqual(response.status_code, 200)
+
+        download = self.client.get(f'/api/profiles/{response["X-Profile-Id"]}/')
+        self.assertEqual(download.status_code, 200)
+        with zipfile.ZipFile(BytesIO(b''.join(download.streaming_content))) as archive:
+            self.assertEqual(set(archive.namelist()), {'stats.prof', 'stats.txt', 'queries.json'})
+            raw = archive.read('queries.json').decode()
+        queries = json.loads(raw)
+        self.assertEqual(queries['queries'], len(queries['statements']))
+        self.assertTrue(any('core_board' in entry['sql'] for entry in queries['statements']))
+        self.assertTrue(any('authtoken_token' in entry['sql'] for entry in queries['statements']))
+        self.assertNotIn(self.staff_token.key, raw)
+        self.assertTrue(all('params' not in entry for entry in queries['statements']))
+
+    def test_other_requests_are_not_profiled(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.user_token.key}')
+        response = self.client.get('/api/boards/?profile=1')
+        self.assertNotIn('X-Profile-Id', response)
+
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.staff_token.key}')
+        self.assertNotIn('X-Profile-Id', self.client.get('/api/boards/'))
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+    def test_only_staff_can_download_and_old_artifacts_are_removed(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.staff_token.key}')
+        ids = [self.client.get('/api/boards/?profile=1')['X-Profile-Id'] for _ in range(3)]
+        self.assertEqual(len(os.listdir(self.directory.name)), 2)
+        self.assertEqual(self.client.get('/api/profiles/../settings/').status_code, 404)
+
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.user_token.key}')
+        self.assertEqual(self.client.get(f'/api/profiles/{ids[-1]}/').status_code, 403)
+
+
+class MetricsTests(AuthenticatedAPITestCase):
+    """
+    Tests for the multi-process metrics registry and the Prometheus endpoint.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        patcher = mock.patch.dict('core.metrics.OPTIONS', DIRECTORY=self.directory.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        metrics.registry.reset()
+        self.addCleanup(metrics.registry.reset)
+
+        self.staff = User.objects.create_user(username='staff@test.de', email='staff@test.de', password='pw', is_staff=True)
+        self.authenticate(self.staff)
+
+    def test_files_of_all_processes_are_summed(self):
+        pids = (os.getpid(), os.getppid())
+        stores = [metrics.MmapStore(os.path.join(self.directory.name, f'{pid}.db')) for pid in pids]
+        for store in stores:
+            self.addCleanup(store.close)
+            store.increment('a', 2)
+        stores[1].increment('b', 0.5)
+        for index in range(2000):
+            stores[0].increment(f'grow-{index}')
+
+        totals = metrics.collect()
+        self.assertEqual(totals['a'], 4)
+        self.assertEqual(totals['b'], 0.5)
+        self.assertEqual(totals['grow-1999'], 1)
+
+        reopened = metrics.MmapStore(stores[0].path)
+        self.addCleanup(reopened.close)
+        reopened.increment('a')
+        self.assertEqual(metrics.read_file(stores[0].path)['a'], 3)
+
+    def test_files_of_stopped_processes_are_pruned(self):
+        process = subprocess.Popen([sys.executable, '-c', 'pass'])
+        process.wait()
+        stopped = metrics.MmapStore(os.path.join(self.directory.name, f'{process.pid}.db'))
+        stopped.increment('a', 5)
+        stopped.close()
+        running = metrics.MmapStore(os.path.join(self.directory.name, f'{os.getpid()}.db'))
+        self.addCleanup(running.close)
+        running.increment('a')
+
+        self.assertEqual(metrics.collect(), {'a': 1})
+        self.assertFalse(os.path.exists(stopped.path))
+
+    def test_requests_are_exposed_per_view(self):
+        self.client.get('/api/boards/')
+        self.client.get('/api/boards/')
+        self.client.get('/api/boards/999/')
+
+        body = self.client.get('/api/metrics/').content.decode()
+        self.assertIn('kanban_requests_total{method="GET",status="200",view="BoardListView"} 2', body)
+        self.assertIn('kanban_requests_total{method="GET",status="404",view="BoardDetailsView"} 1', body)
+        self.assertIn('kanban_request_duration_seconds_bucket{method="GET",view="BoardListView",le="+Inf"} 2', body)
+        self.assertIn('kanban_request_queries_count{method="GET",view="BoardListView"} 2', body)
+        self.assertIn('# TYPE kanban_response_size_bytes histogram', body)
+
+    def test_token_cache_stats_are_exposed(self):
+        self.client.get('/api/boards/')
+        body = self.client.get('/api/metrics/').content.decode()
+        labels = f'{{cache="token",pid="{os.getpid()}"}}'
+        self.assertIn('# TYPE kanban_cache_hits_total counter', body)
+        self.assertIn(f'kanban_cache_hits_total{labels} 1', body)
+        self.assertIn(f'kanban_cache_misses_total{labels} 1', body)
+        self.assertIn(f'kanban_cache_entries{labels} 1', body)
+
+    def test_board_detail_cache_stats_are_exposed(self):
+        cache.clear()
+        detail_cache.reset_stats()
+        board = Board.objects.create(title='Board', owner=self.staff)
+        self.client.get(f'/api/boards/{board.id}/')
+        self.client.get(f'/api/boards/{board.id}/')
+        self.assertEqual(detail_cache.stats(), {'hits': 1, 'misses': 1, 'invalidations': 0, 'hit_rate': 0.5})
+
+        body = self.client.get('/api/metrics/').content.decode()
+        labels = f'{{cache="board_detail",pid="{os.getpid()}"}}'
+        self.assertIn(f'kanban_cache_hits_total{labels} 1', body)
+        self.assertIn(f'kanban_cache_misses_total{labels} 1', body)
+        self.assertIn(f'kanban_cache_hit_ratio{labels} 0.5', body)
+
+    def test_only_staff_can_read_metrics(self):
+        user = User.objects.create_user(username='user@test.de', email='user@test.de', password='pw')
+        self.authenticate(user)
+        self.assertEqual(self.client.get('/api/metrics/').status_code, 403)
+
+
+class FastTaskSerializerParityTests(APITestCase):
+    """
+    Makes sure the fast task serialization renders byte-identical JSON
+    to the DRF task serializers.
+    """
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner@test.de', email='owner@test.de', first_name='Öwner')
+        self.second = User.objects.create_user(username='second@test.de', email='second@test.de', first_name=' Padded ')
+        self.board = Board.objects.create(title='Board', owner=self.owner)
+        self.board.members.set([self.owner, self.second])
+
+        empty = Task.objects.create(board=self.board, title='Empty', description='', status='to-do', priority='low')
+        full = Task.objects.create(board=self.board, title='Full "quoted"', description='Line\nbreak ✓',
+                                   status='review', priority='high', due_date=date(2026, 2, 28))
+        full.assignees.set([self.second, self.owner])
+        full.reviewers.set([self.second, self.owner])
+        single = Task.objects.create(board=self.board, title='Single', description='d', status='done', priority='medium')
+        single.reviewers.set([self.second])
+        for task, amount in ((full, 3), (single, 1)):
+            for index in range(amount):
+                Comment.objects.create(task=task, author=self.owner, content=f'c{index}')
+        self.tasks = Task.objects.filter(board=self.board).order_by('id')
+
+    def assert_same_json(self, fast, drf):
+        renderer = JSONRenderer()
+        self.assertEqual(renderer.render(fast), renderer.render(drf))
+
+    def test_list_serializers(self):
+        for serializer_class in (TaskSerializer, TaskAssignedToMeSerializer):
+            drf = serializer_class(self.tasks.for_listing(), many=True).data
+            self.assert_same_json(serialize_tasks(self.tasks), drf)
+
+    def test_user_filtered_lists_and_board_detail(self):
+        for relation in ('assignees', 'reviewers'):
+            tasks = Task.objects.filter(**{relation: self.owner}).distinct()
+            drf = TaskAssignedToMeSerializer(tasks.for_listing(), many=True).data
+            self.assert_same_json(serialize_tasks(tasks), drf)
+
+        board = Board.objects.get(id=self.board.id)
+        self.assert_same_json(serialize_board_detail(board), BoardDetailSerializer(board).data)
+
+    async def test_async_variants_match(self):
+        expected = await sync_to_async(serialize_tasks)(self.tasks)
+        self.assert_same_json(await aserialize_tasks(self.tasks), expected)
+        board = await Board.objects.aget(id=self.board.id)
+        expected = await sync_to_async(lambda: serialize_board_detail(Board.objects.get(id=self.board.id)))()
+        self.assert_same_json(await aserialize_board_detail(board), expected)
+
+    def test_query_count_does_not_grow_with_tasks(self):
+        with CaptureQueriesContext(connection) as queries:
+            serialize_tasks(self.tasks)
+        for index in range(10):
+            Task.objects.create(board=self.board, title=f'T{index}', description='', priority='low').assignees.set([self.owner])
+        with CaptureQueriesContext(connection) as more_queries:
+            data = serialize_tasks(self.tasks)
+        self.assertEqual(len(data), 13)
+        self.assertEqual(len(queries), len(more_queries))
+        self.assertEqual(serialize_tasks(Task.objects.none()), [])
+
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command('benchmark_serializers', sizes=[5], repeat=1, stdout=out)
+        self.assertRegex(out.getvalue(), r'\n\s+5\s+fast\s')
+        self.assertEqual(Task.objects.count(), 3)
+
+
+class SQLiteProfileTests(TestCase):
+    """
+    Tests for the SQLite connection settings and the single writer.
+    """
+
+    def test_pragmas_are_applied(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], 20000)
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone()[0], 1)  # NORMAL
+
+    def test_write_transactions_are_serialized(self):
+        entered, release, order = threading.Event(), threading.Event(), []
+
+        def first():
+            with write_transaction(serialize=True):
+                order.append('first')
+                entered.set()
+                release.wait(5)
+
+        def second():
+            entered.wait(5)
+            with write_transaction(serialize=True):
+                order.append('second')
+
+        with mock.patch('core.writes.transaction.atomic', return_value=nullcontext()):
+            threads = [threading.Thread(target=first), threading.Thread(target=second)]
+            for thread in threads:
+                thread.start()
+            entered.wait(5)
+            time.sleep(0.05)
+            self.assertEqual(order, ['first'])
+            release.set()
+            for thread in threads:
+                thread.join(5)
+        self.assertEqual(order, ['first', 'second'])
+
+    def test_lock_is_held_until_the_outermost_write_transaction_ends(self):
+        def try_lock():
+            acquired = writes._writer.acquire(blocking=False)
+            if acquired:
+                writes._writer.release()
+            results.append(acquired)
+
+        results = []
+        with write_transaction(serialize=True):
+            with write_transaction(serialize=True):
+                pass
+            thread = threading.Thread(target=try_lock)
+            thread.start()
+            thread.join(5)
+        try_lock()
+        self.assertEqual(results, [False, True])
+
+
+class ReadReplicaRoutingTests(AuthenticatedAPITestCase):
+    """
+    Tests for the read replica router, the stickiness after writes and the
+    lag based fallback. The test database has no separate replica, so the
+    replica is simulated by patching `is_configured` and `replica_lag`.
+    """
+
+    def setUp(self):
+        super().setUp()
+        for target, value in (('is_configured', True), ('replica_lag', 0.5)):
+            patcher = mock.patch(f'core.replicas.{target}', return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def read_alias(self, model=Board, method='get', view=BoardListView):
+        request = getattr(APIRequestFactory(), method)('/')
+        request.user = self.user
+        middleware = ReplicaRoutingMiddleware(lambda request: None)
+        token = replicas.enable_for(None)
+        try:
+            middleware.process_view(request, view.as_view(), (), {})
+            return router.db_for_read(model)
+        finally:
+            replicas.reset(token)
+
+    def test_list_reads_go_to_the_replica(self):
+        self.assertEqual(self.read_alias(), 'replica')
+        self.assertEqual(self.read_alias(view=MyTasksAssignedView), 'replica')
+        self.assertEqual(self.read_alias(model=User), 'default')
+        self.assertEqual(self.read_alias(view=CommentView), 'default')
+        self.assertEqual(self.read_alias(method='post'), 'default')
+        self.assertEqual(router.db_for_write(Board), 'default')
+
+    def test_sticky_token_is_bound_to_the_user(self):
+        other = User.objects.create_user(username='other@test.de', email='other@test.de', password='pw')
+        response = self.client.post('/api/boards/', {'title': 'New'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        sticky = response.headers['X-DB-Sticky']
+
+        request = APIRequestFactory().get('/', HTTP_X_DB_STICKY=sticky)
+        self.assertTrue(replicas.is_sticky(request, self.user))
+        self.assertFalse(replicas.is_sticky(request, other))
+        forged = APIRequestFactory().get('/', HTTP_X_DB_STICKY=f'{other.pk}:{sticky.split(":", 1)[1]}')
+        self.assertFalse(replicas.is_sticky(forged, other))
+        with mock.patch.dict('core.replicas.OPTIONS', STICKY_SECONDS=-1):
+            self.assertFalse(replicas.is_sticky(request, self.user))
+
+    def test_failed_writes_do_not_make_reads_sticky(self):
+        response = self.client.post('/api/boards/', {}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertNotIn('X-DB-Sticky', response.headers)
+        self.assertNotIn('db_sticky', response.cookies)
+
+    def test_lagging_replica_falls_back_to_the_primary(self):
+        with mock.patch('core.replicas.replica_lag', return_value=60.0):
+            self.assertEqual(self.read_alias(), 'default')
+        with mock.patch('core.replicas.replica_lag', return_value=None):
+            self.assertEqual(self.read_alias(), 'default')
+
+    def test_lag_is_the_age_of_the_heartbeat(self):
+        ReplicationHeartbeat.objects.create(updated_at=timezone.now() - timedelta(seconds=30))
+        # Read the heartbeat from the primary, which stands in for the replica here
+        with mock.patch.dict('core.replicas.OPTIONS', ALIAS='default'):
+            lag = replica_lag(refresh=True)
+        self.assertAlmostEqual(lag, 30, delta=5)
+
+
+class ReadReplicaStickinessTests(AuthenticatedClientMixin, APITransactionTestCase):
+    """
+    Tests for the routing and the stickiness against a real replica: the
+    `replica` alias is pointed at a copy of the test database made by
+    `sync_replica`, so reads served by the replica miss later writes.
+    """
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        super().setUp()
+        Board.objects.create(title='Synced', owner=self.user)
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        replica = connections[replicas.OPTIONS['ALIAS']]
+        name = replica.settings_dict['NAME']
+        replica.close()
+        replica.settings_dict['NAME'] = f'file:{Path(directory.name) / "replica.sqlite3"}?mode=ro'
+        self.addCleanup(replica.settings_dict.__setitem__, 'NAME', name)
+        self.addCleanup(replica.close)
+        self.addCleanup(replicas._lag.update, value=None, checked_at=None)
+
+        call_command('sync_replica', stdout=StringIO())
+        self.assertTrue(replicas.is_configured())
+        self.assertIsNotNone(replica_lag(refresh=True))
+        # Written after the sync, so only the primary has it
+        Board.objects.create(title='Unsynced', owner=self.user)
+
+    def board_titles(self, **headers):
+        response = self.client.get('/api/boards/', **headers)
+        self.assertEqual(response.status_code, 200)
+        return sorted(board['title'] for board in response.json())
+
+    def test_reads_go_to_the_replica_until_a_write_succeeds(self):
+        self.assertEqual(self.board_titles(), ['Synced'])
+
+        response = self.client.post('/api/boards/', {}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.board_titles(), ['Synced'])
+
+        response = self.client.post('/api/boards/', {'title': 'Mine'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertIn('db_sticky', response.cookies)
+        self.assertEqual(self.board_titles(), ['Mine', 'Synced', 'Unsynced'])
+
+        # Another worker sees the same token: stickiness needs no shared state
+        self.client.cookies.clear()
+        self.assertEqual(self.board_titles(), ['Synced'])
+        sticky = response.headers['X-DB-Sticky']
+        self.assertEqual(self.board_titles(HTTP_X_DB_STICKY=sticky), ['Mine', 'Synced', 'Unsynced'])
+
+
+class SyncReplicaCommandTests(TransactionTestCase):
+    """
+    Tests for the replica sync. The SQLite backup needs the primary outside
+    of a transaction, so this does not run inside TestCase's transaction.
+    """
+
+    def test_sync_replica_copies_the_primary(self):
+        with tempfile.TemporaryDirectory() as directory:
+            target = Path(directory) / 'replica.sqlite3'
+            with mock.patch('core.management.commands.sync_replica.Command.replica_path', return_value=target):
+                call_command('sync_replica', stdout=StringIO())
+
+            copy = sqlite3.connect(f'file:{target}?mode=ro', uri=True)
+            try:
+                self.assertEqual(copy.execute('PRAGMA journal_mode').fetchone()[0], 'delete')
+                self.assertEqual(copy.execute('SELECT COUNT(*) FROM core_replicationheartbeat').fetchone()[0], 1)
+            finally:
+                copy.close()
+
+
+class TaskSearchTests(AuthenticatedAPITestCase):
+    """
+    Tests for the FTS5 task search: index maintenance by triggers, ranking,
+    highlighting and access control.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.board = Board.objects.create(title='Board', owner=self.user)
+        self.title_match = Task.objects.create(
+            board=self.board, title='Fix login bug', description='Users cannot sign in', status='to-do', priority='high'
+        )
+        self.description_match = Task.objects.create(
+            board=self.board, title='Session cleanup', description='Related to the login form',
+            status='to-do', priority='low'
+        )
+
+    def search(self, query, **params):
+        response = self.client.get('/api/tasks/search/', {'q': query, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.json()['results']
+
+    def test_results_are_ranked_and_highlighted(self):
+        results = self.search('login')
+        self.assertEqual([result['id'] for result in results], [self.title_match.id, self.description_match.id])
+        self.assertEqual(results[0]['highlights']['title'], 'Fix <mark>login</mark> bug')
+
+    def test_last_word_matches_as_prefix(self):
+        self.assertEqual([result['id'] for result in self.search('fix log')], [self.title_match.id])
+        self.assertEqual(self.search('fix "log OR'), [])
+
+    def test_index_follows_task_and_comment_writes(self):
+        Comment.objects.create(task=self.description_match, author=self.user, content='Needs <b>refactoring</b>')
+        results = self.search('refactoring')
+        self.assertEqual([result['id'] for result in results], [self.description_match.id])
+        self.assertEqual(results[0]['highlights']['comments'], 'Needs &lt;b&gt;<mark>refactoring</mark>&lt;/b&gt;')
+
+        self.description_match.comments.all().delete()
+        self.assertEqual(self.search('refactoring'), [])
+
+        Task.objects.filter(id=self.title_match.id).update(title='Fix logout bug')
+        self.assertEqual([result['id'] for result in self.search('logout')], [self.title_match.id])
+        self.title_match.delete()
+        self.assertEqual(self.search('logout'), [])
+
+    def test_only_accessible_boards_are_searched(self):
+        stranger = User.objects.create_user(username='stranger@test.de', email='stranger@test.de', password='pw')
+        other = Board.objects.create(title='Other', owner=stranger)
+        Task.objects.create(board=other, title='Secret login', description='', status='to-do', priority='low')
+        self.assertEqual(len(self.search('login')), 2)
+
+        other.members.add(self.user)
+        self.assertEqual(len(self.search('login')), 3)
+        self.assertEqual(len(self.search('login', board=self.board.id)), 2)
+
+    def test_invalid_parameters_are_rejected(self):
+        self.assertEqual(self.client.get('/api/tasks/search/').status_code, 400)
+        self.assertEqual(self.client.get('/api/tasks/search/', {'q': 'login', 'limit': 0}).status_code, 400)
+        self.assertEqual(self.client.get('/api/tasks/search/', {'q': 'login', 'board': 'x'}).status_code, 400)
+
+    def test_rebuild_restores_the_index(self):
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM core_task_search')
+        self.assertEqual(self.search('login'), [])
+
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertEqual(len(self.search('login')), 2)
+
+    def test_naive_search_matches_the_same_tasks(self):
+        Comment.objects.create(task=self.title_match, author=self.user, content='Reproduced on staging')
+        for query in ('login', 'staging bug', 'cleanup'):
+            fts = {result['id'] for result in self.search(query)}
+            naive = {result['id'] for result in search.naive_search(self.user, query)}
+            self.assertEqual(fts, naive, query)
+
+
+class TaskFilterTests(AuthenticatedAPITestCase):
+    """
+    Tests for the task filter and ordering parameters of the board detail
+    and my-task endpoints.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.other = User.objects.create_user(username='other@test.de', email='other@test.de', password='pw')
+        self.board = Board.objects.create(title='Board', owner=self.user)
+        self.board.members.set([self.user, self.other])
+
+        def task(title, status, priority, due_date, assignee):
+            task = Task.objects.create(board=self.board, title=title, description='', status=status,
+                                       priority=priority, due_date=due_date)
+            task.assignees.set([assignee])
+            task.reviewers.set([self.user])
+            return task
+
+        self.late = task('Late', 'to-do', 'low', date(2026, 3, 1), self.user)
+        self.early = task('Early', 'review', 'high', date(2026, 1, 15), self.user)
+        self.undated = task('Undated', 'to-do', 'medium', None, self.user)
+        self.done = task('Done', 'done', 'high', date(2026, 2, 1), self.other)
+
+    def titles(self, path, **params):
+        response = self.client.get(path, params)
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(b''.join(response.streaming_content) if response.streaming else response.content)
+        return [task['title'] for task in (data['tasks'] if 'tasks' in data else data)]
+
+    def test_board_detail_filters(self):
+        path = f'/api/boards/{self.board.id}/'
+        self.assertEqual(self.titles(path, status='to-do,review'), ['Late', 'Early', 'Undated'])
+        self.assertEqual(self.titles(path, priority='high', status='done'), ['Done'])
+        self.assertEqual(self.titles(path, due_after='2026-01-20', due_before='2026-02-28'), ['Done'])
+        self.assertEqual(self.titles(path, assignee=self.other.id), ['Done'])
+        self.assertEqual(self.titles(path, reviewer=self.other.id), [])
+        self.assertEqual(set(self.titles(path)), {'Late', 'Early', 'Undated', 'Done'})
+        self.assertEqual(self.titles(f'/api/async/boards/{self.board.id}/', status='done'), ['Done'])
+        self.assertEqual(self.titles(path, status='done', stream='true'), ['Done'])
+
+    def test_ordering(self):
+        path = f'/api/boards/{self.board.id}/'
+        self.assertEqual(self.titles(path, ordering='due_date'), ['Early', 'Done', 'Late', 'Undated'])
+        self.assertEqual(self.titles(path, ordering='-due_date'), ['Late', 'Done', 'Early', 'Undated'])
+        self.assertEqual(self.titles(path, ordering='-priority'), ['Early', 'Done', 'Undated', 'Late'])
+        self.assertEqual(self.titles(path, ordering='priority', stream='true'), ['Late', 'Undated', 'Early', 'Done'])
+
+    def test_my_task_lists(self):
+        self.assertEqual(self.titles('/api/tasks/assigned-to-me/', status='to-do', ordering='-priority'),
+                         ['Undated', 'Late'])
+        self.assertEqual(self.titles('/api/tasks/reviewing/', priority='high'), ['Early', 'Done'])
+        self.assertEqual(self.titles('/api/async/tasks/assigned-to-me/', due_before='2026-02-01'), ['Early'])
+        response = self.client.get('/api/tasks/assigned-to-me/', {'status': 'to-do', 'limit': 1})
+        self.assertEqual([task['title'] for task in response.json()['results']], ['Late'])
+
+    def test_filtered_etag_differs(self):
+        path = f'/api/boards/{self.board.id}/'
+        full = self.client.get(path)['ETag']
+        filtered = self.client.get(path, {'status': 'done'})['ETag']
+        self.assertNotEqual(full, filtered)
+        self.assertEqual(self.client.get(path, {'status': 'done'}, HTTP_IF_NONE_MATCH=filtered).status_code, 304)
+
+    def test_invalid_parameters_are_rejected(self):
+        path = f'/api/boards/{self.board.id}/'
+        for params in ({'status': 'open'}, {'due_after': '1.1.2026'}, {'assignee': 'me'}, {'ordering': 'title'}):
+            self.assertEqual(self.client.get(path, params).status_code, 400, params)
+            self.assertEqual(self.client.get('/api/tasks/reviewing/', params).status_code, 400, params)
+            self.assertEqual(self.client.get('/api/async/tasks/reviewing/', params).status_code, 400, params)
+        response = self.client.get('/api/tasks/reviewing/', {'ordering': 'due_date', 'limit': 10})
+        self.assertEqual(response.status_code, 400)
+
+
+class TaskArchiveTests(AuthenticatedAPITestCase):
+    """
+    Tests for moving old done tasks into the archive and restoring them.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.board = Board.objects.create(title='Board', owner=self.user)
+        self.board.members.add(self.user)
+
+        self.old = Task.objects.create(board=self.board, title='Old release notes', description='',
+                                       status='done', priority='high', due_date=date(2026, 1, 1))
+        self.old.assignees.add(self.user)
+        self.old.reviewers.add(self.user)
+        self.comment = Comment.objects.create(task=self.old, author=self.user, content='Shipped')
+        Task.objects.filter(id=self.old.id).update(completed_at=timezone.now() - timedelta(days=60))
+        self.recent = Task.objects.create(board=self.board, title='Recent', description='', status='done', priority='low')
+        self.open = Task.objects.create(board=self.board, title='Open', description='', status='to-do', priority='low')
+        Board.objects.filter(id=self.board.id).rebuild_counters()
+
+    def test_completed_at_follows_the_status(self):
+        self.assertIsNotNone(self.recent.completed_at)
+        self.assertIsNone(self.open.completed_at)
+
+        response = self.client.patch('/api/tasks/batch/', {'tasks': [
+            {'id': self.open.id, 'status': 'done'}, {'id': self.recent.id, 'status': 'review'},
+        ]}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.open.refresh_from_db()
+        self.recent.refresh_from_db()
+        self.assertIsNotNone(self.open.completed_at)
+        self.assertIsNone(self.recent.completed_at)
+
+    def test_archive_moves_old_done_tasks_out_of_the_hot_tables(self):
+        call_command('archive_tasks', '--days', '30', stdout=StringIO())
+
+        self.assertEqual(set(Task.objects.values_list('title', flat=True)), {'Recent', 'Open'})
+        self.assertFalse(Comment.objects.exists())
+        self.assertFalse(Task.assignees.through.objects.filter(task_id=self.old.id).exists())
+        archived = ArchivedTask.objects.get(id=self.old.id)
+        self.assertEqual((archived.assignee_ids, archived.reviewer_ids), ([self.user.id], [self.user.id]))
+        self.assertEqual(archived.comments[0]['content'], 'Shipped')
+
+        self.board.refresh_from_db()
+        self.assertEqual((self.board.ticket_count, self.board.tasks_high_prio_count), (2, 0))
+        titles = [task['title'] for task in self.client.get(f'/api/boards/{self.board.id}/').json()['tasks']]
+        self.assertEqual(sorted(titles), ['Open', 'Recent'])
+        self.assertEqual(search.search_tasks(self.user, 'release'), [])
+        changes = self.client.get(f'/api/boards/{self.board.id}/changes/').json()['changes']
+        self.assertIn({'seq': changes[-1]['seq'], 'entity': 'task', 'id': self.old.id, 'op': 'delete'}, changes)
+
+    def test_list_and_restore(self):
+        archive.archive_old_tasks()
+        response = self.client.get(f'/api/boards/{self.board.id}/archive/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([task['title'] for task in response.json()], ['Old release notes'])
+        response = self.client.get(f'/api/boards/{self.board.id}/archive/', {'cursor': 'invalid'})
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json(), {'error': 'Invalid cursor'})
+
+        response = self.client.post(f'/api/boards/{self.board.id}/archive/{self.old.id}/restore/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['id'], self.old.id)
+        self.assertEqual(response.json()['comments_count'], 1)
+        self.assertFalse(ArchivedTask.objects.exists())
+
+        restored = Task.objects.get(id=self.old.id)
+        self.assertEqual(list(restored.assignees.all()), [self.user])
+        comment = restored.comments.get()
+        self.assertEqual((comment.id, comment.created_at), (self.comment.id, self.comment.created_at))
+        self.assertGreater(restored.completed_at, timezone.now() - timedelta(minutes=1))
+        self.assertEqual([result['id'] for result in search.search_tasks(self.user, 'release')], [self.old.id])
+        self.board.refresh_from_db()
+        self.assertEqual(self.board.ticket_count, 3)
+
+        response = self.client.post(f'/api/boards/{self.board.id}/archive/{self.old.id}/restore/')
+        self.assertEqual(response.status_code, 404)
+
+    def test_archive_requires_board_access(self):
+        archive.archive_old_tasks()
+        stranger = User.objects.create_user(username='stranger@test.de', email='stranger@test.de', password='pw')
+        self.authenticate(stranger)
+        self.assertEqual(self.client.get(f'/api/boards/{self.board.id}/archive/').status_code, 403)
+        response = self.client.post(f'/api/boards/{self.board.id}/archive/{self.old.id}/restore/')
+        self.assertEqual(response.status_code, 403)
+
+    def test_seeded_done_tasks_are_archivable(self):
+        seed_dataset('seeded', users=3, boards=2, members=2, tasks=40, comments=0)
+        seeded = Task.objects.filter(board__title__startswith='Seeded')
+        self.assertFalse(seeded.filter(status='done', completed_at__isnull=True).exists())
+        self.assertFalse(seeded.exclude(status='done').filter(completed_at__isnull=False).exists())
+
+        candidates = archive.archivable().filter(board__title__startswith='Seeded').count()
+        self.assertGreater(candidates, 0)
+        self.assertEqual(archive.archive_old_tasks(), candidates + 1)  # and the old task of setUp
+
+    def test_archive_candidates_use_the_partial_index(self):
+        plan = archive.archivable().order_by('completed_at').values('id').explain()
+        self.assertIn('core_task_done_completed_idx', plan)
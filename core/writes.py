@@ -0,0 +1,49 @@
+"""
+Optional in-process single writer for SQLite.
+
+SQLite allows one writer per database at a time. When several threads of a
+worker start write transactions concurrently, all but one wait on the
+database lock and may fail with "database is locked" once `timeout` runs
+out. With `SERIALIZE_WRITES` enabled, `write_transaction` lets the threads
+of a process queue on a lock in Python instead, so only one of them holds
+the database write lock at a time. Readers do not take the lock and,
+with WAL enabled, never wait for the writer.
+
+The lock only covers transactions that `write_transaction` itself starts.
+Code running in the server processes must therefore not wrap writes in a
+plain `transaction.atomic()`: its transaction would outlive the lock and
+keep the database locked after the next thread has been let in.
+"""
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import transaction
+
+SERIALIZE_WRITES = getattr(settings, 'SERIALIZE_WRITES', False)
+
+# Re-entrant, so nested write transactions of the same thread do not deadlock
+_writer = threading.RLock()
+
+
+@contextmanager
+def write_transaction(using=None, serialize=None):
+    """
+    Like `transaction.atomic()`, but waits for the process-wide writer lock
+    first if `serialize` (default: the `SERIALIZE_WRITES` setting) is true.
+
+    Nested `write_transaction` blocks of the same thread become savepoints
+    and re-enter the lock, so it is released only when the outermost block
+    has committed or rolled back. Inside a plain `transaction.atomic()` block
+    the transaction ends after the lock is released; see the module docstring.
+    """
+    if serialize is None:
+        serialize = SERIALIZE_WRITES
+    if not serialize:
+        with transaction.atomic(using=using):
+            yield
+        return
+
+    with _writer:
+        with transaction.atomic(using=using):
+            yield
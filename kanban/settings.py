@@ -36,6 +36,9 @@ CORS_ALLOWED_ORIGINS = [
 
 CORS_ALLOW_ALL_ORIGINS = True  # Nur für Entwicklung!
 
+# Lets browser clients read the read-your-writes token (see core/replicas.py)
+CORS_EXPOSE_HEADERS = ['X-DB-Sticky']
+
 
 # Application definition
 
@@ -55,6 +58,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.RequestTimingMiddleware',
+    'core.middleware.ProfilingMiddleware',
+    'core.middleware.ReplicaRoutingMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -91,13 +97,81 @@ WSGI_APPLICATION = 'kanban.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# SQLite tuned for concurrent workers: WAL lets readers run while one writer
+# commits, writers wait up to `timeout` seconds for the lock instead of failing
+# with "database is locked", and IMMEDIATE transactions take the write lock up
+# front, so a transaction never fails halfway when upgrading a read lock.
+SQLITE_READ_PRAGMAS = [
+    'PRAGMA mmap_size=268435456',  # 256 MB
+    'PRAGMA cache_size=-64000',  # 64 MB
+    'PRAGMA temp_store=MEMORY',
+]
+SQLITE_PRAGMAS = [
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA busy_timeout=20000',
+    'PRAGMA synchronous=NORMAL',  # durable with WAL, only the last commits may be lost on power loss
+    *SQLITE_READ_PRAGMAS,
+]
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            'timeout': 20,
+            'transaction_mode': 'IMMEDIATE',
+            'init_command': ';'.join(SQLITE_PRAGMAS),
+        },
+    },
+    # Read-only copy of the primary, refreshed by `python manage.py sync_replica`
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': f'file:{BASE_DIR / "db.replica.sqlite3"}?mode=ro',
+        'OPTIONS': {
+            'timeout': 20,
+            'init_command': ';'.join(SQLITE_READ_PRAGMAS),
+        },
+        'TEST': {
+            'MIRROR': 'default',
+        },
+    },
+}
+
+DATABASE_ROUTERS = ['core.replicas.ReadReplicaRouter']
+
+# Read replica routing (see core/replicas.py). Reads fall back to the primary
+# while the replica lags more than MAX_LAG_SECONDS behind.
+READ_REPLICA = {
+    'ALIAS': 'replica',
+    'APPS': ['core'],
+    'STICKY_SECONDS': 10,
+    'MAX_LAG_SECONDS': 5,
+    'LAG_CHECK_INTERVAL': 2,
+}
+
+# Funnel the write transactions of the API views through one writer per
+# process (see core/writes.py)
+SERIALIZE_WRITES = True
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# LocMemCache evicts the least recently used entries once MAX_ENTRIES is reached.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'kanban',
+        'OPTIONS': {
+            'MAX_ENTRIES': 1000,
+        },
     }
 }
 
+# Serialized board details, keyed by board id and version (see core/api/detail_cache.py)
+BOARD_DETAIL_CACHE_ALIAS = 'default'
+BOARD_DETAIL_CACHE_TIMEOUT = 600  # seconds
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -143,9 +217,74 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'auth_app.authentication.CachedTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ]
 }
+
+
+# In-process cache for token authentication (see auth_app/authentication.py)
+TOKEN_CACHE = {
+    'MAX_SIZE': 10000,
+    # Other workers accept revoked tokens for up to TTL seconds
+    'TTL': 30,  # seconds
+}
+
+# Board change events (see core/events.py). The in-process broker only reaches
+# subscribers in the same worker; point this to a shared broker for several workers.
+BOARD_EVENTS_BROKER = 'core.events.InProcessBroker'
+BOARD_EVENTS_HEARTBEAT = 15  # seconds
+
+# Board change log used by the delta sync endpoint (see core/changelog.py).
+# Clients further behind than the retention period or the batch limit must resync.
+BOARD_CHANGES_RETENTION_DAYS = 7
+BOARD_CHANGES_MAX_BATCH = 1000
+
+# Cold storage of done tasks (see core/archive.py). `manage.py archive_tasks`
+# moves tasks done for longer than AFTER_DAYS, BATCH_SIZE tasks per transaction.
+TASK_ARCHIVE = {
+    'AFTER_DAYS': 30,
+    'BATCH_SIZE': 500,
+}
+
+# Per-request instrumentation (see core/middleware.py). Requests above either
+# threshold are logged as JSON to the `core.requests` logger.
+REQUEST_TIMING = {
+    'SERVER_TIMING_HEADER': True,
+    'SLOW_REQUEST_MS': 500,
+    'SLOW_REQUEST_QUERIES': 50,
+}
+
+# On-demand profiles of staff requests (see core/profiling.py)
+PROFILING = {
+    'DIRECTORY': BASE_DIR / 'profiles',
+    'MAX_ARTIFACTS': 50,
+    'TOP_FUNCTIONS': 50,
+}
+
+# Request metrics, one memory-mapped file per worker process (see core/metrics.py)
+METRICS = {
+    'DIRECTORY': BASE_DIR / 'metrics',
+}
+
+# Keeps the metrics of test runs out of METRICS['DIRECTORY']
+TEST_RUNNER = 'kanban.test_runner.TestRunner'
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'core.requests': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+    },
+}
@@ -0,0 +1,25 @@
+import tempfile
+
+from django.test.runner import DiscoverRunner
+
+from core import metrics
+
+
+class TestRunner(DiscoverRunner):
+    """
+    Test runner that lets the request metrics of the test run write to a
+    temporary directory instead of `METRICS['DIRECTORY']` in the project.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._metrics_directory = tempfile.TemporaryDirectory(prefix='kanban-metrics-')
+        self._metrics_options = dict(metrics.OPTIONS)
+        metrics.OPTIONS['DIRECTORY'] = self._metrics_directory.name
+        metrics.registry.reset()
+
+    def teardown_test_environment(self, **kwargs):
+        metrics.registry.reset()
+        metrics.OPTIONS.update(self._metrics_options)
+        self._metrics_directory.cleanup()
+        super().teardown_test_environment(**kwargs)